@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Encoding Benchmark
+Compares size and encode/decode time of the /api/data formats on a synthetic game state
+"""
+
+import argparse
+import json
+import tempfile
+import time
+
+import binary_encoding
+from binary_encoding import packb_pure, unpackb_pure
+
+
+def build_state(bodies, stations, modules):
+    """Drive a JournalMonitor with synthetic events and return the resulting /api/data payload"""
+    from ed_data import EDData
+    from journal_monitor import JournalMonitor
+    
+    ed_data = EDData()
+    monitor = JournalMonitor(ed_data, tempfile.gettempdir())
+    timestamp = '2025-01-01T00:00:00Z'
+    monitor.process_event({'timestamp': timestamp, 'event': 'LoadGame', 'Commander': 'Bench',
+                           'Ship': 'Anaconda', 'Credits': 123456789})
+    monitor.process_event({'timestamp': timestamp, 'event': 'FSDJump', 'StarSystem': 'Shinrarta Dezhra',
+                           'SystemAddress': 3932277478106, 'StarPos': [55.71875, 17.59375, 27.15625]})
+    for i in range(bodies):
+        monitor.process_event({'timestamp': timestamp, 'event': 'Scan', 'BodyName': f'Shinrarta Dezhra {i}',
+                               'BodyID': i, 'PlanetClass': 'High metal content body', 'Landable': i % 3 == 0,
+                               'DistanceFromArrivalLS': 1234.5678 + i, 'TerraformState': '',
+                               'Atmosphere': 'thin sulfur dioxide atmosphere', 'SurfaceGravity': 9.81 + i / 7,
+                               'SurfaceTemperature': 312.25 + i, 'MassEM': 0.5 + i / 13})
+    for i in range(stations):
+        monitor.process_event({'timestamp': timestamp, 'event': 'Docked', 'StationName': f'Station {i}',
+                               'StationType': 'Coriolis', 'MarketID': 3700000000 + i,
+                               'StarSystem': 'Shinrarta Dezhra', 'DistFromStarLS': 400.25 + i})
+    monitor.process_event({'timestamp': timestamp, 'event': 'Loadout', 'Ship': 'Anaconda', 'ShipID': 1,
+                           'HullHealth': 1.0, 'FuelCapacity': {'Main': 32.0, 'Reserve': 1.07},
+                           'Modules': [{'Slot': f'Slot{i:02d}', 'Item': f'int_module_size{i % 8}_class5',
+                                        'On': True, 'Priority': i % 5, 'Health': 1.0,
+                                        'Value': 1000000 + i}
+                                       for i in range(modules)]})
+    return ed_data.get_all()
+
+
+def measure(fn, arg, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(arg)
+    return (time.perf_counter() - started) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara JSON e MessagePack para /api/data')
+    parser.add_argument('--bodies', type=int, default=80, help='corpos escaneados no estado')
+    parser.add_argument('--stations', type=int, default=10, help='estações no estado')
+    parser.add_argument('--modules', type=int, default=40, help='módulos da nave')
+    parser.add_argument('--repeat', type=int, default=200, help='repetições por medição')
+    args = parser.parse_args()
+    
+    state = build_state(args.bodies, args.stations, args.modules)
+    
+    formats = [
+        ('JSON indent=2', binary_encoding.encode_json, json.loads),
+        ('JSON compacto', lambda obj: json.dumps(obj, separators=(',', ':')).encode(), json.loads),
+        ('MessagePack (stdlib)', packb_pure, unpackb_pure),
+    ]
+    if binary_encoding.msgpack is not None:
+        formats.append(('MessagePack (msgpack)', binary_encoding.packb, binary_encoding.unpackb))
+    else:
+        print("Pacote msgpack não instalado: apenas o codificador stdlib será medido\n")
+    
+    print(f"Estado: {args.bodies} corpos, {args.stations} estações, {args.modules} módulos\n")
+    print(f"{'formato':<24}{'bytes':>10}{'encode ms':>12}{'decode ms':>12}")
+    for name, encode, decode in formats:
+        encode_ms, body = measure(encode, state, args.repeat)
+        decode_ms, decoded = measure(decode, body, args.repeat)
+        assert decoded == json.loads(json.dumps(state)), name
+        print(f"{name:<24}{len(body):>10}{encode_ms:>12.3f}{decode_ms:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
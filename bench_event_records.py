@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Event Records Benchmark
+Measures retained memory per event for parsed dicts versus event_records slots
+"""
+
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from event_records import make_record
+
+
+def synthetic_lines(count, seed=1):
+    """Journal lines with the field mix of real Scan/FSDJump/Docked/Loadout/Touchdown events"""
+    rng = random.Random(seed)
+    systems = [f'Synuefe {chr(65 + i % 26)}{i}-{i % 7} d{i % 13}' for i in range(40)]
+    lines = []
+    for i in range(count):
+        timestamp = f'2025-01-{1 + i // 86400 % 28:02d}T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z'
+        system = rng.choice(systems)
+        kind = rng.random()
+        if kind < 0.5:
+            event = {'timestamp': timestamp, 'event': 'Scan', 'ScanType': 'Detailed',
+                     'BodyName': f'{system} {i % 12} a', 'BodyID': i % 40,
+                     'Parents': [{'Planet': 3}, {'Star': 0}], 'StarSystem': system,
+                     'SystemAddress': 2000000000 + systems.index(system),
+                     'DistanceFromArrivalLS': rng.uniform(10, 5000), 'TidalLock': False,
+                     'TerraformState': '', 'PlanetClass': 'Rocky body',
+                     'Atmosphere': '', 'AtmosphereType': 'None', 'Volcanism': '',
+                     'MassEM': rng.random(), 'Radius': rng.uniform(1e5, 1e7),
+                     'SurfaceGravity': rng.uniform(0.5, 20), 'SurfaceTemperature': rng.uniform(50, 900),
+                     'SurfacePressure': 0.0, 'Landable': True,
+                     'Materials': [{'Name': name, 'Percent': rng.uniform(0, 30)}
+                                   for name in ('iron', 'sulphur', 'nickel', 'carbon', 'chromium')],
+                     'Composition': {'Ice': 0.0, 'Rock': 0.9, 'Metal': 0.1},
+                     'SemiMajorAxis': rng.uniform(1e8, 1e11), 'Eccentricity': rng.random() / 10,
+                     'OrbitalInclination': rng.uniform(-5, 5), 'Periapsis': rng.uniform(0, 360),
+                     'OrbitalPeriod': rng.uniform(1e5, 1e8), 'AscendingNode': rng.uniform(-180, 180),
+                     'MeanAnomaly': rng.uniform(0, 360), 'RotationPeriod': rng.uniform(1e4, 1e7),
+                     'AxialTilt': rng.uniform(-1, 1), 'WasDiscovered': True, 'WasMapped': False}
+        elif kind < 0.7:
+            event = {'timestamp': timestamp, 'event': 'FSDJump', 'Taxi': False, 'Multicrew': False,
+                     'StarSystem': system, 'SystemAddress': 2000000000 + systems.index(system),
+                     'StarPos': [rng.uniform(-1000, 1000) for _ in range(3)],
+                     'SystemAllegiance': '', 'SystemEconomy': '$economy_None;',
+                     'SystemEconomy_Localised': 'None', 'SystemSecondEconomy': '$economy_None;',
+                     'SystemSecondEconomy_Localised': 'None', 'SystemGovernment': '$government_None;',
+                     'SystemGovernment_Localised': 'None', 'SystemSecurity': '$GAlAXY_MAP_INFO_state_anarchy;',
+                     'SystemSecurity_Localised': 'Anarchy', 'Population': 0, 'Body': system,
+                     'BodyID': 0, 'BodyType': 'Star', 'JumpDist': rng.uniform(5, 60),
+                     'FuelUsed': rng.uniform(0.5, 8), 'FuelLevel': rng.uniform(10, 32)}
+        elif kind < 0.8:
+            event = {'timestamp': timestamp, 'event': 'Docked', 'StationName': f'{system} Port',
+                     'StationType': 'Coriolis', 'Taxi': False, 'Multicrew': False, 'StarSystem': system,
+                     'SystemAddress': 2000000000 + systems.index(system), 'MarketID': 3220000000 + i % 50,
+                     'StationFaction': {'Name': 'Independents', 'FactionState': 'Boom'},
+                     'StationGovernment': '$government_Democracy;',
+                     'StationGovernment_Localised': 'Democracy',
+                     'StationServices': ['dock', 'autodock', 'commodities', 'contacts', 'exploration',
+                                         'missions', 'outfitting', 'crewlounge', 'rearm', 'refuel',
+                                         'repair', 'shipyard', 'tuning', 'engineer'],
+                     'StationEconomy': '$economy_HighTech;', 'StationEconomy_Localised': 'High Tech',
+                     'DistFromStarLS': rng.uniform(10, 5000),
+                     'LandingPads': {'Small': 4, 'Medium': 8, 'Large': 4}}
+        elif kind < 0.9:
+            event = {'timestamp': timestamp, 'event': 'Touchdown', 'PlayerControlled': True,
+                     'Taxi': False, 'Multicrew': False, 'StarSystem': system,
+                     'SystemAddress': 2000000000 + systems.index(system),
+                     'Body': f'{system} {i % 12} a', 'BodyID': i % 40, 'OnStation': False,
+                     'OnPlanet': True, 'Latitude': rng.uniform(-90, 90), 'Longitude': rng.uniform(-180, 180),
+                     'NearestDestination': '$SAA_Unknown_Signal:#type=$SAA_SignalType_Geological;:#index=3;',
+                     'NearestDestination_Localised': 'Surface signal: Geological (3)'}
+        else:
+            event = {'timestamp': timestamp, 'event': 'Loadout', 'Ship': 'krait_mkii', 'ShipID': 7,
+                     'ShipName': 'Explorer', 'ShipIdent': 'EX-01', 'HullValue': 42000000,
+                     'ModulesValue': 60000000, 'HullHealth': 1.0, 'UnladenMass': 480.5,
+                     'CargoCapacity': 16, 'MaxJumpRange': 38.4,
+                     'FuelCapacity': {'Main': 32.0, 'Reserve': 0.63}, 'Rebuy': 5100000,
+                     'Modules': [{'Slot': f'Slot{n:02d}_Size{n % 6}', 'Item': f'int_module_size{n % 6}_class5',
+                                  'On': True, 'Priority': n % 4, 'Health': 1.0, 'Value': 100000 * n,
+                                  'Engineering': {'Engineer': 'Felicity Farseer', 'BlueprintName': 'FSD_LongRange',
+                                                  'Level': 5, 'Quality': 1.0,
+                                                  'Modifiers': [{'Label': 'Mass', 'Value': 10.0,
+                                                                 'OriginalValue': 8.0, 'LessIsGood': 1}]}}
+                                 for n in range(20)]}
+        lines.append(json.dumps(event))
+    return lines
+
+
+def retained(build):
+    """Bytes still allocated after build() returns its result (which is kept alive)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memória por evento: dict do json.loads x registros __slots__')
+    parser.add_argument('--events', type=int, default=20000, help='eventos sintéticos')
+    args = parser.parse_args()
+    
+    lines = synthetic_lines(args.events)
+    dict_bytes, dicts = retained(lambda: [json.loads(line) for line in lines])
+    record_bytes, records = retained(lambda: [make_record(json.loads(line)) for line in lines])
+    
+    print(f"{args.events} eventos")
+    print(f"{'tipo':<12}{'qtd':>8}{'dict B/evento':>16}{'registro B/evento':>20}")
+    for event_type in ('Scan', 'FSDJump', 'Docked', 'Touchdown', 'Loadout'):
+        picked = [i for i, event in enumerate(dicts) if event['event'] == event_type]
+        if not picked:
+            continue
+        sample = [lines[i] for i in picked]
+        type_dict_bytes, kept = retained(lambda: [json.loads(line) for line in sample])
+        del kept
+        type_record_bytes, kept = retained(lambda: [make_record(json.loads(line)) for line in sample])
+        del kept
+        print(f"{event_type:<12}{len(picked):>8}{type_dict_bytes / len(picked):>16.0f}"
+              f"{type_record_bytes / len(picked):>20.0f}")
+    print(f"{'total':<12}{args.events:>8}{dict_bytes / args.events:>16.0f}"
+          f"{record_bytes / args.events:>20.0f}")
+    print(f"\nRedução: {100 * (1 - record_bytes / dict_bytes):.0f}%")
+    assert len(records) == len(dicts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Binary Encoding
+MessagePack encoder/decoder in pure Python, with the optional msgpack package as accelerator
+"""
+
+import json
+import struct
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack')
+
+_pack_float = struct.Struct('>Bd').pack
+_unpack_float = struct.Struct('>d').unpack_from
+
+
+def _pack(obj, out):
+    if obj is None:
+        out.append(b'\xc0')
+    elif obj is True:
+        out.append(b'\xc3')
+    elif obj is False:
+        out.append(b'\xc2')
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(bytes((obj,)))
+        elif -32 <= obj < 0:
+            out.append(bytes((obj & 0xff,)))
+        elif 0 <= obj <= 0xff:
+            out.append(b'\xcc' + bytes((obj,)))
+        elif 0 <= obj <= 0xffff:
+            out.append(struct.pack('>BH', 0xcd, obj))
+        elif 0 <= obj <= 0xffffffff:
+            out.append(struct.pack('>BI', 0xce, obj))
+        elif 0 <= obj <= 0xffffffffffffffff:
+            out.append(struct.pack('>BQ', 0xcf, obj))
+        elif -0x80 <= obj:
+            out.append(struct.pack('>Bb', 0xd0, obj))
+        elif -0x8000 <= obj:
+            out.append(struct.pack('>Bh', 0xd1, obj))
+        elif -0x80000000 <= obj:
+            out.append(struct.pack('>Bi', 0xd2, obj))
+        elif -0x8000000000000000 <= obj:
+            out.append(struct.pack('>Bq', 0xd3, obj))
+        else:
+            raise OverflowError('inteiro fora do intervalo do MessagePack')
+    elif isinstance(obj, float):
+        out.append(_pack_float(0xcb, obj))
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        n = len(data)
+        if n < 32:
+            out.append(bytes((0xa0 | n,)))
+        elif n <= 0xff:
+            out.append(bytes((0xd9, n)))
+        elif n <= 0xffff:
+            out.append(struct.pack('>BH', 0xda, n))
+        else:
+            out.append(struct.pack('>BI', 0xdb, n))
+        out.append(data)
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(bytes((0x90 | n,)))
+        elif n <= 0xffff:
+            out.append(struct.pack('>BH', 0xdc, n))
+        else:
+            out.append(struct.pack('>BI', 0xdd, n))
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            out.append(bytes((0x80 | n,)))
+        elif n <= 0xffff:
+            out.append(struct.pack('>BH', 0xde, n))
+        else:
+            out.append(struct.pack('>BI', 0xdf, n))
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        n = len(data)
+        if n <= 0xff:
+            out.append(bytes((0xc4, n)))
+        elif n <= 0xffff:
+            out.append(struct.pack('>BH', 0xc5, n))
+        else:
+            out.append(struct.pack('>BI', 0xc6, n))
+        out.append(data)
+    else:
+        # Mesmo comportamento de json.dumps(default=str)
+        _pack(str(obj), out)
+
+
+def packb_pure(obj):
+    """Encode obj as MessagePack using only the standard library"""
+    out = []
+    _pack(obj, out)
+    return b''.join(out)
+
+
+def _unpack(data, pos):
+    b = data[pos]
+    pos += 1
+    if b <= 0x7f:
+        return b, pos
+    if b >= 0xe0:
+        return b - 0x100, pos
+    if 0xa0 <= b <= 0xbf:
+        end = pos + (b & 0x1f)
+        return str(data[pos:end], 'utf-8'), end
+    if 0x90 <= b <= 0x9f:
+        return _unpack_array(data, pos, b & 0x0f)
+    if 0x80 <= b <= 0x8f:
+        return _unpack_map(data, pos, b & 0x0f)
+    if b == 0xc0:
+        return None, pos
+    if b == 0xc2:
+        return False, pos
+    if b == 0xc3:
+        return True, pos
+    if b == 0xcb:
+        return _unpack_float(data, pos)[0], pos + 8
+    if b == 0xca:
+        return struct.unpack_from('>f', data, pos)[0], pos + 4
+    if 0xcc <= b <= 0xd3:
+        fmt = '>BHIQbhiq'[b - 0xcb]
+        size = struct.calcsize('>' + fmt)
+        return struct.unpack_from('>' + fmt, data, pos)[0], pos + size
+    if b in (0xd9, 0xda, 0xdb, 0xc4, 0xc5, 0xc6):
+        fmt = {0xd9: '>B', 0xda: '>H', 0xdb: '>I', 0xc4: '>B', 0xc5: '>H', 0xc6: '>I'}[b]
+        n = struct.unpack_from(fmt, data, pos)[0]
+        pos += struct.calcsize(fmt)
+        raw = data[pos:pos + n]
+        return (str(raw, 'utf-8') if b >= 0xd9 else bytes(raw)), pos + n
+    if b in (0xdc, 0xdd):
+        fmt = '>H' if b == 0xdc else '>I'
+        n = struct.unpack_from(fmt, data, pos)[0]
+        return _unpack_array(data, pos + struct.calcsize(fmt), n)
+    if b in (0xde, 0xdf):
+        fmt = '>H' if b == 0xde else '>I'
+        n = struct.unpack_from(fmt, data, pos)[0]
+        return _unpack_map(data, pos + struct.calcsize(fmt), n)
+    raise ValueError(f'tipo MessagePack não suportado: 0x{b:02x}')
+
+
+def _unpack_array(data, pos, n):
+    items = []
+    for _ in range(n):
+        item, pos = _unpack(data, pos)
+        items.append(item)
+    return items, pos
+
+
+def _unpack_map(data, pos, n):
+    result = {}
+    for _ in range(n):
+        key, pos = _unpack(data, pos)
+        result[key], pos = _unpack(data, pos)
+    return result, pos
+
+
+def unpackb_pure(data):
+    """Decode one MessagePack object using only the standard library"""
+    obj, _ = _unpack(memoryview(data), 0)
+    return obj
+
+
+if msgpack is not None:
+    def packb(obj):
+        """Encode obj as MessagePack (accelerated by the msgpack package)"""
+        return msgpack.packb(obj, use_bin_type=True, default=str)
+    
+    def unpackb(data):
+        """Decode one MessagePack object (accelerated by the msgpack package)"""
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+else:
+    packb = packb_pure
+    unpackb = unpackb_pure
+
+
+def encode_json(obj):
+    """The /api/data JSON body"""
+    return json.dumps(obj, indent=2, default=str).encode()
+
+
+# Formatos servidos por /api/data: nome -> (content type, codificador)
+ENCODINGS = {
+    'json': ('application/json', encode_json),
+    'msgpack': ('application/msgpack', packb),
+}
+
+
+def negotiate(accept, requested=None):
+    """Pick 'json' or 'msgpack' from ?format= or the Accept header"""
+    if requested in ENCODINGS:
+        return requested
+    if accept and any(media in accept for media in MSGPACK_TYPES):
+        return 'msgpack'
+    return 'json'
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Server Configuration
+Tunable settings read from environment variables
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+def _env_int(name, default):
+    """Read an integer setting from the environment"""
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        print(f"Valor inválido para {name}, usando {default}")
+        return default
+
+
+def _env_float(name, default):
+    """Read a float setting from the environment"""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        print(f"Valor inválido para {name}, usando {default}")
+        return default
+
+
+def _env_bool(name, default=False):
+    """Read a boolean (1/0, true/false, yes/no) setting from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# Diretório de dados persistentes do servidor (caches em disco)
+CACHE_DIR = Path(os.getenv('ED_CACHE_DIR') or Path.home() / '.ed_journal_server')
+
+# Número máximo de sistemas mantidos em memória no cache LRU de corpos/estações
+SYSTEM_CACHE_SIZE = max(1, _env_int('ED_SYSTEM_CACHE_SIZE', 200))
+
+# Capacidade do buffer circular de eventos recentes (/api/events/recent)
+RECENT_EVENTS_SIZE = max(1, _env_int('ED_RECENT_EVENTS_SIZE', 200))
+
+# Janela (bytes) mapeada por vez na leitura dos journals via mmap
+READ_WINDOW_SIZE = max(1 << 16, _env_int('ED_READ_WINDOW_SIZE', 4 << 20))
+
+# Processa todos os journals antigos do diretório antes de acompanhar o atual
+BACKFILL = _env_bool('ED_BACKFILL')
+
+# Pontos mantidos por métrica nas séries temporais (/api/series)
+SERIES_CAPACITY = max(16, _env_int('ED_SERIES_CAPACITY', 10000))
+
+# Perfilamento: tempos por evento/rota e /debug/profile (também via --profile)
+PROFILE = _env_bool('ED_PROFILE')
+
+# Plugins: diretório de módulos, threads do pool, fila por plugin e tempo máximo por chamada
+PLUGINS_DIR = Path(os.getenv('ED_PLUGINS_DIR') or CACHE_DIR / 'plugins')
+PLUGIN_WORKERS = max(1, _env_int('ED_PLUGIN_WORKERS', 4))
+PLUGIN_QUEUE_SIZE = max(1, _env_int('ED_PLUGIN_QUEUE_SIZE', 1000))
+PLUGIN_TIMEOUT = _env_float('ED_PLUGIN_TIMEOUT', 5.0)
+
+# Feed NDJSON por socket Unix (também via --unix-socket) e buffer máximo por cliente
+UNIX_SOCKET = os.getenv('ED_UNIX_SOCKET') or None
+UNIX_SOCKET_BUFFER = max(1 << 12, _env_int('ED_UNIX_SOCKET_BUFFER', 1 << 20))
+
+# Ingestão em processo separado com estado publicado em memória compartilhada
+INGEST_PROCESS = _env_bool('ED_INGEST_PROCESS')
+INGEST_SHM_SIZE = max(1 << 20, _env_int('ED_INGEST_SHM_SIZE', 16 << 20))
+
+# Linhas recentes lembradas para descartar eventos reprocessados (janela deslizante)
+DEDUP_WINDOW = max(16, _env_int('ED_DEDUP_WINDOW', 4096))
+
+# Limites de entradas por coleção do EDData (excedentes são descartados com aviso)
+MAX_BODIES = max(1, _env_int('ED_MAX_BODIES', 1000))
+MAX_STATIONS = max(1, _env_int('ED_MAX_STATIONS', 500))
+MAX_MODULES = max(1, _env_int('ED_MAX_MODULES', 200))
+MAX_CARGO = max(1, _env_int('ED_MAX_CARGO', 1000))
+
+# Sistemas visitados guardados no índice espacial de /api/nearby (os mais antigos são descartados)
+MAX_VISITED = max(10, _env_int('ED_MAX_VISITED', 100000))
+
+# Rastreamento de alocações com tracemalloc para /debug/memory (0 = desligado, N = quadros por pilha)
+TRACEMALLOC = max(0, _env_int('ED_TRACEMALLOC', 0))
+
+# Preferências lembradas entre execuções (ex.: diretório de journals detectado)
+SETTINGS_FILE = CACHE_DIR / 'settings.json'
+
+
+def load_settings():
+    """Settings persisted by save_settings(), or {} if none"""
+    try:
+        with open(SETTINGS_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_settings(**values):
+    """Merge values into the persisted settings"""
+    settings = load_settings()
+    settings.update(values)
+    try:
+        SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = SETTINGS_FILE.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f)
+        os.replace(tmp_path, SETTINGS_FILE)
+    except OSError as e:
+        print(f"Erro ao salvar preferências: {e}")
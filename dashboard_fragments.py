@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Dashboard Fragments
+Server-rendered HTML per dashboard section, cached by the version of the state it shows
+"""
+
+import re
+import threading
+from html import escape
+
+
+# Seções e as chaves do EDData de que cada uma depende, na ordem da página
+SECTIONS = {
+    'status': ('status', 'waiting_for_files'),
+    'vehicle': ('vehicle_state',),
+    'coordinates': ('planetary_coordinates',),
+    'info': ('commander', 'ship', 'system', 'station', 'credits'),
+    'stations': ('system_stations',),
+    'bodies': ('system_bodies',),
+    'modules': ('modules',),
+}
+
+_PT_BR = str.maketrans(',.', '.,')
+
+
+def _number(value, decimals=0):
+    """Number with pt-BR separators, as toLocaleString('pt-BR') shows it"""
+    return f"{value:,.{decimals}f}".translate(_PT_BR)
+
+
+def _item(css_class, value_class, label, value):
+    return (f'<div class="{css_class}"><div class="info-label">{label}</div>'
+            f'<div class="{value_class}">{escape(str(value))}</div></div>')
+
+
+def _flag(label, active):
+    state = 'status-active' if active else 'status-inactive'
+    return (f'<div class="vehicle-item"><div class="info-label">{label}</div>'
+            f'<div class="vehicle-value {state}">{"✅ Sim" if active else "❌ Não"}</div></div>')
+
+
+def _coordinate(value, axis):
+    if value is None:
+        return 'N/A'
+    if axis == 'lat':
+        direction = 'N' if value >= 0 else 'S'
+    else:
+        direction = 'E' if value >= 0 else 'W'
+    return f"{abs(value):.4f}° {direction}"
+
+
+def vehicle_status(state):
+    """Short description of the current vehicle state"""
+    if state.get('in_srv'):
+        return '🚙 No SRV'
+    if state.get('in_fighter'):
+        return '✈️ No Fighter'
+    if state.get('docked'):
+        return '🔒 Acoplado na Estação'
+    if state.get('landed'):
+        return '🛬 Pousado'
+    if state.get('supercruise'):
+        return '⚡ Em Supercruise'
+    if state.get('in_flight'):
+        return '🚀 Em Voo'
+    return '❓ Desconhecido'
+
+
+def render_status(data):
+    waiting = data.get('waiting_for_files')
+    html = f'<div class="{"status-box waiting-status" if waiting else "status-box"}">'
+    html += '<div class="info-label"><span class="status-indicator"></span> Status do Sistema</div>'
+    html += f'<div class="info-value">{escape(str(data.get("status")))}</div></div>'
+    if waiting:
+        html += ('<div class="warning">⏳ Aguardando arquivos do Elite Dangerous...<br>'
+                 '<small>O servidor está ativo. Inicie o jogo para começar o monitoramento.</small></div>')
+    return html
+
+
+def render_vehicle(data):
+    state = data.get('vehicle_state') or {}
+    html = '<div class="vehicle-status-box"><h2><span class="vehicle-icon">🎮</span>Estado do Veículo</h2>'
+    html += '<div class="info-grid">'
+    html += _item('vehicle-item', 'vehicle-value', 'Situação Atual', vehicle_status(state))
+    html += _flag('Acoplado', state.get('docked'))
+    html += _flag('Pousado', state.get('landed'))
+    html += _flag('Em Voo', state.get('in_flight'))
+    return html + '</div></div>'
+
+
+def render_coordinates(data):
+    coords = data.get('planetary_coordinates') or {}
+    if not coords.get('on_surface') or coords.get('latitude') is None:
+        return ''
+    html = '<div class="coordinates-box"><h2><span class="planet-icon">🌍</span>Coordenadas Planetárias</h2>'
+    html += '<div class="info-grid">'
+    if coords.get('body_name'):
+        html += _item('coord-item', 'coord-value', 'Corpo Celeste', coords['body_name'])
+    html += _item('coord-item', 'coord-value', 'Latitude', _coordinate(coords.get('latitude'), 'lat'))
+    html += _item('coord-item', 'coord-value', 'Longitude', _coordinate(coords.get('longitude'), 'lon'))
+    if coords.get('altitude') is not None:
+        html += _item('coord-item', 'coord-value', 'Altitude', f"{coords['altitude']:.0f} m")
+    html += ('<div class="coord-item"><div class="info-label">Status</div>'
+             '<div class="coord-value" style="color: #ffaa00;">🪐 Próximo a um Planeta</div></div>')
+    return html + '</div></div>'
+
+
+def render_info(data):
+    html = '<div class="info-grid">'
+    html += _item('info-item', 'info-value', 'Comandante', data.get('commander'))
+    html += _item('info-item', 'info-value', 'Nave', data.get('ship'))
+    html += _item('info-item', 'info-value', 'Sistema', data.get('system'))
+    html += _item('info-item', 'info-value', 'Estação', data.get('station') or 'No espaço')
+    html += _item('info-item', 'info-value', 'Créditos', f"{_number(data.get('credits') or 0)} CR")
+    return html + '</div>'
+
+
+def render_stations(data):
+    stations = data.get('system_stations') or []
+    if not stations:
+        return ''
+    html = '<div class="stations-box">'
+    html += f'<h2><span class="station-icon">🏢</span>Estações do Sistema ({len(stations)})</h2>'
+    html += '<div class="station-list">'
+    for station in stations:
+        html += f'<div class="station-card"><div class="station-name">{escape(str(station.get("name")))}</div>'
+        html += f'<div class="station-detail">Tipo: {escape(str(station.get("type") or "Desconhecido"))}</div>'
+        if station.get('distance'):
+            html += f'<div class="station-detail">Distância: {_number(station["distance"], 1)} LS</div>'
+        html += '</div>'
+    return html + '</div></div>'
+
+
+def render_bodies(data):
+    bodies = data.get('system_bodies') or []
+    if not bodies:
+        return ''
+    html = '<div class="bodies-box">'
+    html += f'<h2><span class="planet-icon">🪐</span>Corpos Celestes Escaneados ({len(bodies)})</h2>'
+    html += '<div class="body-list">'
+    for body in bodies:
+        html += f'<div class="body-card"><div class="body-name">{escape(str(body.get("name")))}</div>'
+        html += f'<div class="body-detail">Tipo: {escape(str(body.get("type") or "Desconhecido"))}</div>'
+        if body.get('is_landable'):
+            html += '<div class="body-detail landable">✅ Aterrissável</div>'
+        if body.get('distance'):
+            html += f'<div class="body-detail">Distância: {_number(body["distance"], 1)} LS</div>'
+        if body.get('atmosphere'):
+            html += f'<div class="body-detail">Atmosfera: {escape(str(body["atmosphere"]))}</div>'
+        if body.get('terraform_state'):
+            html += f'<div class="body-detail">🌱 {escape(str(body["terraform_state"]))}</div>'
+        html += '</div>'
+    return html + '</div></div>'
+
+
+def render_modules(data):
+    modules = data.get('modules') or []
+    if not modules:
+        return ('<div class="modules-box"><h2><span class="station-icon">⚙️</span>Módulos da Nave</h2>'
+                '<p>Nenhuma informação de módulos carregada.</p></div>')
+    html = '<div class="modules-box">'
+    html += f'<h2><span class="station-icon">⚙️</span>Módulos da Nave ({len(modules)})</h2>'
+    html += ('<table class="module-table"><thead><tr><th>Slot</th><th>Módulo</th>'
+             '<th class="hlth">Integridade</th><th class="prio">Prioridade</th></tr></thead><tbody>')
+    for module in modules:
+        health = module.get('health')
+        if health is None:
+            health_text, color = '--', '#ff3333'
+        else:
+            percent = health * 100
+            health_text = f"{percent:.0f}"
+            color = '#00ff00' if percent >= 80 else '#ffaa00' if percent >= 50 else '#ff3333'
+        slot = module.get('slot')
+        slot = re.sub(r'([A-Z])', r' \1', slot.replace('Slot', '', 1)).strip() if slot else '-'
+        item = ' '.join((module.get('item') or '-').split('_')[-2:])
+        priority = module.get('priority')
+        html += (f'<tr><td class="module-slot">{escape(slot)}</td>'
+                 f'<td class="module-item">{escape(item)}</td>'
+                 f'<td class="hlth" style="color: {color}">{health_text}%</td>'
+                 f'<td class="prio">{priority if priority is not None else "-"}</td></tr>')
+    return html + '</tbody></table></div>'
+
+
+RENDERERS = {
+    'status': render_status,
+    'vehicle': render_vehicle,
+    'coordinates': render_coordinates,
+    'info': render_info,
+    'stations': render_stations,
+    'bodies': render_bodies,
+    'modules': render_modules,
+}
+
+
+class FragmentCache:
+    """Rendered HTML per section, re-rendered only when one of its keys changed
+    
+    With EDData the version of a section is the version of the last change to
+    any of its keys. A state without per-key versions (the ingest process view)
+    versions every section by the whole snapshot.
+    """
+    
+    def __init__(self, ed_data):
+        self.ed_data = ed_data
+        self.lock = threading.Lock()
+        self.cache = {}  # seção -> (versão, html)
+        self.renders = 0
+    
+    def versions(self):
+        """({section: version}, current state version)"""
+        if hasattr(self.ed_data, 'get_key_versions'):
+            keys, current = self.ed_data.get_key_versions()
+            return {name: max(keys.get(key, 0) for key in section_keys)
+                    for name, section_keys in SECTIONS.items()}, current
+        _, current = self.ed_data.get_encoded('json')
+        return dict.fromkeys(SECTIONS, current), current
+    
+    def _read(self, keys):
+        """Current values of the given keys"""
+        if hasattr(self.ed_data, 'get_changes'):
+            values, _ = self.ed_data.get_changes(dict.fromkeys(keys))
+            return {key: value for key, _, value in values}
+        return self.ed_data.get_all()
+    
+    def get(self, names=None, since=-1):
+        """(current version, {section: (version, html)}) for sections changed after `since`"""
+        versions, current = self.versions()
+        names = [name for name in (names or SECTIONS) if versions[name] > since]
+        
+        with self.lock:
+            stale = [name for name in names
+                     if self.cache.get(name, (-1,))[0] != versions[name]]
+            if stale:
+                data = self._read({key for name in stale for key in SECTIONS[name]})
+                for name in stale:
+                    self.cache[name] = (versions[name], RENDERERS[name](data))
+                self.renders += len(stale)
+            return current, {name: self.cache[name] for name in names}
@@ -570,7 +570,11 @@ gap: 15px;
             background-size: 1000px 100%;
             animation: shimmer 2s infinite;
         }
-		
+        
+        .waiting .live-section {
+            display: none;
+        }
+        
         .dashboard-footer {
             position: fixed;
             bottom: 0;
@@ -586,23 +590,32 @@ gap: 15px;
         }
     </style>
 </head>
-	<body>
-	    <div class="container">
-	        <h1>🚀 Elite Dangerous Dashboard</h1>
-	        <div class="main-layout">
-	            <div id="left-content" class="left-column loading"></div>
-	            <div id="right-content" class="right-column">
-	                <div id="modules-box"></div>
-	            </div>
-	        </div>
-	    </div>
-	    <div id="debug" class="debug-info" style="display: none;"></div>
-	    <div class="watermark">By Cmdr. Katzzero</div>
+<body>
+    <div class="container">
+        <h1>🚀 Elite Dangerous Dashboard</h1>
+        <div class="main-layout">
+            <div id="left-content" class="left-column loading">
+                <div id="section-status"></div>
+                <div id="section-vehicle" class="live-section"></div>
+                <div id="section-coordinates" class="live-section"></div>
+                <div id="section-info" class="live-section"></div>
+                <div id="section-stations" class="live-section"></div>
+                <div id="section-bodies" class="live-section"></div>
+                <div id="section-meta"></div>
+            </div>
+            <div id="right-content" class="right-column">
+                <div id="modules-box"></div>
+            </div>
+        </div>
+    </div>
+    <div id="debug" class="debug-info" style="display: none;"></div>
+    <div class="watermark">By Cmdr. Katzzero</div>
     
     <script>
+        // Busca, parsing e comparação rodam no Web Worker (/dashboard-worker.js);
+        // esta thread só recebe as seções alteradas e atualiza o container de cada uma
         let updateCount = 0;
-        let lastData = null;
-
+        
         function formatCoordinate(value, type) {
             if (value === null || value === undefined) return 'N/A';
             const direction = type === 'lat' 
@@ -610,7 +623,7 @@ gap: 15px;
                 : (value >= 0 ? 'E' : 'W');
             return `${Math.abs(value).toFixed(4)}° ${direction}`;
         }
-
+        
         function getVehicleStatus(vehicleState) {
             if (vehicleState.in_srv) return '🚙 No SRV';
             if (vehicleState.in_fighter) return '✈️ No Fighter';
@@ -620,260 +633,372 @@ gap: 15px;
             if (vehicleState.in_flight) return '🚀 Em Voo';
             return '❓ Desconhecido';
         }
-
+        
         function updateDebug(message) {
             const debugDiv = document.getElementById('debug');
             const now = new Date().toLocaleTimeString('pt-BR');
             debugDiv.innerHTML = `${now}: ${message}`;
             console.log(`[${now}] ${message}`);
         }
-
-	        function renderModulesTable(modules) {
-	            const modulesContainer = document.getElementById('modules-box');
-	            
-	            if (!modules || modules.length === 0) {
-	                modulesContainer.innerHTML = '<div class="modules-box"><h2><span class="station-icon">⚙️</span>Módulos da Nave</h2><p>Nenhuma informação de módulos carregada.</p></div>';
-	                return;
-	            }
-	            
-	            let html = '<div class="modules-box">';
-	            html += '<h2><span class="station-icon">⚙️</span>Módulos da Nave (' + modules.length + ')</h2>';
-	            html += '<table class="module-table"><thead><tr>';
-	            html += '<th>Slot</th><th>Módulo</th><th class="hlth">Integridade</th><th class="prio">Prioridade</th></tr></thead><tbody>';
-	            
-	            modules.forEach(m => {
-	                const health = m.health != null ? (m.health * 100).toFixed(0) : '--';
-	                const healthColor = health >= 80 ? '#00ff00' : health >= 50 ? '#ffaa00' : '#ff3333';
-	                
-	                html += `<tr>
-	                  <td class="module-slot">${m.slot ? m.slot.replace('Slot', '').replace(/([A-Z])/g, ' $1').trim() : '-'}</td>
-	                  <td class="module-item">${(m.item || '-').split('_').slice(-2).join(' ')}</td>
-	                  <td class="hlth" style="color: ${healthColor}">${health}%</td>
-	                  <td class="prio">${m.priority != null ? m.priority : '-'}</td>
-	                </tr>`;
-	            });
-	            
-	            html += '</tbody></table></div>';
-	            modulesContainer.innerHTML = html;
-	        }
-
-        function updateDashboard() {
-            updateCount++;
-            const timestamp = new Date().getTime();
-            fetch(`/api/data?_=${timestamp}`, {
-                cache: 'no-cache',
-                headers: {
-                    'Cache-Control': 'no-cache, no-store, must-revalidate',
-                    'Pragma': 'no-cache'
+        
+        function flag(label, active) {
+            return `<div class="vehicle-item">
+                <div class="info-label">${label}</div>
+                <div class="vehicle-value ${active ? 'status-active' : 'status-inactive'}">${active ? '✅ Sim' : '❌ Não'}</div>
+            </div>`;
+        }
+        
+        function item(cssClass, valueClass, label, value) {
+            return `<div class="${cssClass}"><div class="info-label">${label}</div><div class="${valueClass}">${value}</div></div>`;
+        }
+        
+        // Uma função por seção: recebe apenas o recorte dos dados daquela seção
+        const renderers = {
+            status(section) {
+                let html = `<div class="${section.waiting_for_files ? 'status-box waiting-status' : 'status-box'}">`;
+                html += `<div class="info-label"><span class="status-indicator"></span> Status do Sistema</div>`;
+                html += `<div class="info-value">${section.status}</div>`;
+                html += `</div>`;
+                if (section.waiting_for_files) {
+                    html += `<div class="warning">`;
+                    html += `⏳ Aguardando arquivos do Elite Dangerous...<br>`;
+                    html += `<small>O servidor está ativo. Inicie o jogo para começar o monitoramento.</small>`;
+                    html += `</div>`;
                 }
-            })
-                .then(response => {
-                    if (!response.ok) {
-                        if (response.status === 404) {
-                            console.warn('API endpoint not found (404). Server might be initializing.');
-                            return {};
-                        }
-                        throw new Error(`HTTP error! status: ${response.status}`);
+                // As demais seções ficam ocultas enquanto não há journals
+                document.getElementById('left-content').classList.toggle('waiting', !!section.waiting_for_files);
+                return html;
+            },
+            
+            vehicle(vehicleState) {
+                vehicleState = vehicleState || {};
+                let html = `<div class="vehicle-status-box">`;
+                html += `<h2><span class="vehicle-icon">🎮</span>Estado do Veículo</h2>`;
+                html += `<div class="info-grid">`;
+                html += item('vehicle-item', 'vehicle-value', 'Situação Atual', getVehicleStatus(vehicleState));
+                html += flag('Acoplado', vehicleState.docked);
+                html += flag('Pousado', vehicleState.landed);
+                html += flag('Em Voo', vehicleState.in_flight);
+                html += `</div></div>`;
+                return html;
+            },
+            
+            coordinates(coords) {
+                coords = coords || {};
+                if (!coords.on_surface || coords.latitude === null) return '';
+                let html = `<div class="coordinates-box">`;
+                html += `<h2><span class="planet-icon">🌍</span>Coordenadas Planetárias</h2>`;
+                html += `<div class="info-grid">`;
+                if (coords.body_name) {
+                    html += item('coord-item', 'coord-value', 'Corpo Celeste', coords.body_name);
+                }
+                html += item('coord-item', 'coord-value', 'Latitude', formatCoordinate(coords.latitude, 'lat'));
+                html += item('coord-item', 'coord-value', 'Longitude', formatCoordinate(coords.longitude, 'lon'));
+                if (coords.altitude !== null && coords.altitude !== undefined) {
+                    html += item('coord-item', 'coord-value', 'Altitude', `${coords.altitude.toFixed(0)} m`);
+                }
+                html += '<div class="coord-item">';
+                html += '<div class="info-label">Status</div>';
+                html += '<div class="coord-value" style="color: #ffaa00;">🪐 Próximo a um Planeta</div>';
+                html += '</div>';
+                html += `</div></div>`;
+                return html;
+            },
+            
+            info(section) {
+                let html = `<div class="info-grid">`;
+                html += item('info-item', 'info-value', 'Comandante', section.commander);
+                html += item('info-item', 'info-value', 'Nave', section.ship);
+                html += item('info-item', 'info-value', 'Sistema', section.system);
+                html += item('info-item', 'info-value', 'Estação', section.station || 'No espaço');
+                html += item('info-item', 'info-value', 'Créditos', `${(section.credits || 0).toLocaleString()} CR`);
+                html += `</div>`;
+                return html;
+            },
+            
+            stations(stations) {
+                stations = stations || [];
+                if (stations.length === 0) return '';
+                let html = `<div class="stations-box">`;
+                html += `<h2><span class="station-icon">🏢</span>Estações do Sistema (${stations.length})</h2>`;
+                html += `<div class="station-list">`;
+                stations.forEach(station => {
+                    html += `<div class="station-card">`;
+                    html += `<div class="station-name">${station.name}</div>`;
+                    html += `<div class="station-detail">Tipo: ${station.type || 'Desconhecido'}</div>`;
+                    if (station.distance) {
+                        html += `<div class="station-detail">Distância: ${station.distance.toLocaleString()} LS</div>`;
                     }
-                    return response.json();
-                })
-                .then(data => {
-                    if (Object.keys(data).length === 0) return;
-                                        // [PERFORMANCE FIX #1] Compare data with lastData before rendering
-                                                            if (lastData && JSON.stringify(lastData) === JSON.stringify(data)) {
-                                                                                    console.log('[CACHE] Dados idênticos, ignorando atualização');
-                                                                                                            return; // Skip rendering if no changes
-                                                                                                                                }
-
-                    lastData = data;
-	                    updateDebug(`Update #${updateCount} - CMDR: ${data.commander}, Ship: ${data.ship}, System: ${data.system}`);
-	                    let html = '';
-	                    const statusClass = data.waiting_for_files ? 'status-box waiting-status' : 'status-box';
-	                    html += `<div class="${statusClass}">`;
-	                    html += `<div class="info-label"><span class="status-indicator"></span> Status do Sistema</div>`;
-	                    html += `<div class="info-value">${data.status}</div>`;
-	                    html += `</div>`;
-	
-	                    if (data.waiting_for_files) {
-	                        html += `<div class="warning">`;
-	                        html += `⏳ Aguardando arquivos do Elite Dangerous...<br>`;
-	                        html += `<small>O servidor está ativo. Inicie o jogo para começar o monitoramento.</small>`;
-	                        html += `</div>`;
-	                    } else {
-	                        const vehicleState = data.vehicle_state || {};
-	                        html += `<div class="vehicle-status-box">`;
-	                        html += `<h2><span class="vehicle-icon">🎮</span>Estado do Veículo</h2>`;
-	                        html += `<div class="info-grid">`;
-	
-	                        html += `<div class="vehicle-item">`;
-	                        html += `<div class="info-label">Situação Atual</div>`;
-	                        html += `<div class="vehicle-value">${getVehicleStatus(vehicleState)}</div>`;
-	                        html += `</div>`;
-	
-	                        html += `<div class="vehicle-item">`;
-	                        html += `<div class="info-label">Acoplado</div>`;
-	                        html += `<div class="vehicle-value ${vehicleState.docked ? 'status-active' : 'status-inactive'}">`;
-	                        html += vehicleState.docked ? '✅ Sim' : '❌ Não';
-	                        html += `</div></div>`;
-	
-	                        html += `<div class="vehicle-item">`;
-	                        html += `<div class="info-label">Pousado</div>`;
-	                        html += `<div class="vehicle-value ${vehicleState.landed ? 'status-active' : 'status-inactive'}">`;
-	                        html += vehicleState.landed ? '✅ Sim' : '❌ Não';
-	                        html += `</div></div>`;
-	
-	                        html += `<div class="vehicle-item">`;
-	                        html += `<div class="info-label">Em Voo</div>`;
-	                        html += `<div class="vehicle-value ${vehicleState.in_flight ? 'status-active' : 'status-inactive'}">`;
-	                        html += vehicleState.in_flight ? '✅ Sim' : '❌ Não';
-	                        html += `</div></div>`;
-	
-	                        html += `</div></div>`;
-	
-	                        const coords = data.planetary_coordinates || {};
-	                        if (coords.on_surface && coords.latitude !== null) {
-	                            html += `<div class="coordinates-box">`;
-	                            html += `<h2><span class="planet-icon">🌍</span>Coordenadas Planetárias</h2>`;
-	                            html += `<div class="info-grid">`;
-	
-	                            if (coords.body_name) {
-	                                html += `<div class="coord-item">`;
-	                                html += `<div class="info-label">Corpo Celeste</div>`;
-	                                html += `<div class="coord-value">${coords.body_name}</div>`;
-	                                html += `</div>`;
-	                            }
-	                            html += `<div class="coord-item">`;
-	                            html += `<div class="info-label">Latitude</div>`;
-	                            html += `<div class="coord-value">${formatCoordinate(coords.latitude, 'lat')}</div>`;
-	                            html += `</div>`;
-	
-	                            html += `<div class="coord-item">`;
-	                            html += `<div class="info-label">Longitude</div>`;
-	                            html += `<div class="coord-value">${formatCoordinate(coords.longitude, 'lon')}</div>`;
-	                            html += `</div>`;
-	
-	                            if (coords.altitude !== null && coords.altitude !== undefined) {
-	                                html += `<div class="coord-item">`;
-	                                html += `<div class="info-label">Altitude</div>`;
-	                                html += `<div class="coord-value">${coords.altitude.toFixed(0)} m</div>`;
-	                                html += `</div>`;
-	                            }
-	                            
-	                html += '<div class="coord-item">';
-	                html += '<div class="info-label">Status</div>';
-	                html += '<div class="coord-value" style="color: #ffaa00;">🪐 Próximo a um Planeta</div>';
-	                html += '</div>';
-	                            html += `</div></div>`;
-	                        }
-	
-	                        html += `<div class="info-grid">`;
-	                        html += `<div class="info-item">`;
-	                        html += `<div class="info-label">Comandante</div>`;
-	                        html += `<div class="info-value">${data.commander}</div>`;
-	                        html += `</div>`;
-	
-	                        html += `<div class="info-item">`;
-	                        html += `<div class="info-label">Nave</div>`;
-	                        html += `<div class="info-value">${data.ship}</div>`;
-	                        html += `</div>`;
-	
-	                        html += `<div class="info-item">`;
-	                        html += `<div class="info-label">Sistema</div>`;
-	                        html += `<div class="info-value">${data.system}</div>`;
-	                        html += `</div>`;
-	
-	                        html += `<div class="info-item">`;
-	                        html += `<div class="info-label">Estação</div>`;
-	                        html += `<div class="info-value">${data.station || 'No espaço'}</div>`;
-	                        html += `</div>`;
-	
-	                        html += `<div class="info-item">`;
-	                        html += `<div class="info-label">Créditos</div>`;
-	                        html += `<div class="info-value">${data.credits.toLocaleString()} CR</div>`;
-	                        html += `</div>`;
-	                        html += `</div>`;
-	
-	                        const stations = data.system_stations || [];
-	                        if (stations.length > 0) {
-	                            html += `<div class="stations-box">`;
-	                            html += `<h2><span class="station-icon">🏢</span>Estações do Sistema (${stations.length})</h2>`;
-	                            html += `<div class="station-list">`;
-	
-	                            stations.forEach(station => {
-	                                html += `<div class="station-card">`;
-	                                html += `<div class="station-name">${station.name}</div>`;
-	                                html += `<div class="station-detail">Tipo: ${station.type || 'Desconhecido'}</div>`;
-	                                if (station.distance) {
-	                                    html += `<div class="station-detail">Distância: ${station.distance.toLocaleString()} LS</div>`;
-	                                }
-	                                html += `</div>`;
-	                            });
-	
-	                            html += `</div></div>`;
-	                        }
-	
-	                        const bodies = data.system_bodies || [];
-	                        if (bodies.length > 0) {
-	                            html += `<div class="bodies-box">`;
-	                            html += `<h2><span class="planet-icon">🪐</span>Corpos Celestes Escaneados (${bodies.length})</h2>`;
-	                            html += `<div class="body-list">`;
-	
-	                            bodies.forEach(body => {
-	                                html += `<div class="body-card">`;
-	                                html += `<div class="body-name">${body.name}</div>`;
-	                                html += `<div class="body-detail">Tipo: ${body.type || 'Desconhecido'}</div>`;
-	
-	                                if (body.is_landable) {
-	                                    html += `<div class="body-detail landable">✅ Aterrissável</div>`;
-	                                }
-	
-	                                if (body.distance) {
-	                                    html += `<div class="body-detail">Distância: ${body.distance.toLocaleString()} LS</div>`;
-	                                }
-	
-	                                if (body.atmosphere) {
-	                                    html += `<div class="body-detail">Atmosfera: ${body.atmosphere}</div>`;
-	                                }
-	
-	                                if (body.terraform_state) {
-	                                    html += `<div class="body-detail">🌱 ${body.terraform_state}</div>`;
-	                                }
-	
-	                                html += `</div>`;
-	                            });
-	
-	                            html += `</div></div>`;
-	                        }
-	                    }
-	
-	                    if (data.last_update) {
-	                        const updateTime = new Date(data.last_update).toLocaleString('pt-BR');
-	                        html += `<div class="last-update">Última atualização: ${updateTime} | Refresh #${updateCount}</div>`;
-	                    }
-	
-	                    document.getElementById('left-content').innerHTML = html;
-	                    document.getElementById('left-content').classList.remove('loading');
-	                    renderModulesTable(data.modules);
-	                })
-                .catch(error => {
-                    console.error('Error fetching data:', error);
-                    updateDebug(`ERRO: ${error.message}`);
-                    document.getElementById('content').innerHTML = 
-                        `<div class="warning">Erro ao conectar com o servidor<br><small>${error.message}</small></div>`;
-                    document.getElementById('content').classList.remove('loading');
+                    html += `</div>`;
+                });
+                html += `</div></div>`;
+                return html;
+            },
+            
+            bodies(bodies) {
+                bodies = bodies || [];
+                if (bodies.length === 0) return '';
+                let html = `<div class="bodies-box">`;
+                html += `<h2><span class="planet-icon">🪐</span>Corpos Celestes Escaneados (${bodies.length})</h2>`;
+                html += `<div class="body-list">`;
+                bodies.forEach(body => {
+                    html += `<div class="body-card">`;
+                    html += `<div class="body-name">${body.name}</div>`;
+                    html += `<div class="body-detail">Tipo: ${body.type || 'Desconhecido'}</div>`;
+                    if (body.is_landable) {
+                        html += `<div class="body-detail landable">✅ Aterrissável</div>`;
+                    }
+                    if (body.distance) {
+                        html += `<div class="body-detail">Distância: ${body.distance.toLocaleString()} LS</div>`;
+                    }
+                    if (body.atmosphere) {
+                        html += `<div class="body-detail">Atmosfera: ${body.atmosphere}</div>`;
+                    }
+                    if (body.terraform_state) {
+                        html += `<div class="body-detail">🌱 ${body.terraform_state}</div>`;
+                    }
+                    html += `</div>`;
                 });
+                html += `</div></div>`;
+                return html;
+            },
+            
+            meta(section) {
+                if (!section.last_update) return '';
+                const updateTime = new Date(section.last_update).toLocaleString('pt-BR');
+                return `<div class="last-update">Última atualização: ${updateTime} | Refresh #${updateCount}</div>`;
+            },
+            
+            modules(modules) {
+                if (!modules || modules.length === 0) {
+                    return '<div class="modules-box"><h2><span class="station-icon">⚙️</span>Módulos da Nave</h2><p>Nenhuma informação de módulos carregada.</p></div>';
+                }
+                let html = '<div class="modules-box">';
+                html += '<h2><span class="station-icon">⚙️</span>Módulos da Nave (' + modules.length + ')</h2>';
+                html += '<table class="module-table"><thead><tr>';
+                html += '<th>Slot</th><th>Módulo</th><th class="hlth">Integridade</th><th class="prio">Prioridade</th></tr></thead><tbody>';
+                modules.forEach(m => {
+                    const health = m.health != null ? (m.health * 100).toFixed(0) : '--';
+                    const healthColor = health >= 80 ? '#00ff00' : health >= 50 ? '#ffaa00' : '#ff3333';
+                    html += `<tr>
+                      <td class="module-slot">${m.slot ? m.slot.replace('Slot', '').replace(/([A-Z])/g, ' $1').trim() : '-'}</td>
+                      <td class="module-item">${(m.item || '-').split('_').slice(-2).join(' ')}</td>
+                      <td class="hlth" style="color: ${healthColor}">${health}%</td>
+                      <td class="prio">${m.priority != null ? m.priority : '-'}</td>
+                    </tr>`;
+                });
+                html += '</tbody></table></div>';
+                return html;
+            }
+        };
+        
+        const containers = {
+            status: 'section-status',
+            vehicle: 'section-vehicle',
+            coordinates: 'section-coordinates',
+            info: 'section-info',
+            stations: 'section-stations',
+            bodies: 'section-bodies',
+            meta: 'section-meta',
+            modules: 'modules-box'
+        };
+        
+        const worker = new Worker('/dashboard-worker.js');
+        
+        worker.onmessage = (message) => {
+            const payload = message.data;
+            if (payload.type === 'error') {
+                updateDebug(`ERRO: ${payload.message}`);
+                document.getElementById('section-status').innerHTML =
+                    `<div class="warning">Erro ao conectar com o servidor<br><small>${payload.message}</small></div>`;
+                document.getElementById('left-content').classList.remove('loading');
+                return;
+            }
+            
+            updateCount++;
+            const sections = payload.sections;
+            // Reescreve só os containers das seções que mudaram
+            Object.keys(sections).forEach(name => {
+                document.getElementById(containers[name]).innerHTML = renderers[name](sections[name]);
+            });
+            document.getElementById('left-content').classList.remove('loading');
+            if (sections.info) {
+                updateDebug(`Update #${updateCount} (${Object.keys(sections).join(', ')}) - CMDR: ${sections.info.commander}, Ship: ${sections.info.ship}, System: ${sections.info.system}`);
+            } else {
+                updateDebug(`Update #${updateCount} (${Object.keys(sections).join(', ')})`);
+            }
+        };
+        
+        // Aba oculta: o worker para de consultar o servidor até voltar a ficar visível
+        function syncVisibility() {
+            worker.postMessage({type: document.hidden ? 'pause' : 'resume'});
         }
-
+        document.addEventListener('visibilitychange', syncVisibility);
+        syncVisibility();
+        
         document.addEventListener('keydown', (e) => {
             if (e.key === 'd' || e.key === 'D') {
                 const debugDiv = document.getElementById('debug');
                 debugDiv.style.display = debugDiv.style.display === 'none' ? 'block' : 'none';
             }
         });
-
-        updateDashboard();
-        setInterval(updateDashboard, 500);
     </script>
 </body>
 </html>
     """
+
+
+def get_dashboard_worker_js():
+    """Web Worker that polls /api/data and posts only the dashboard sections that changed"""
+    return """
+// Elite Dangerous Dashboard - Web Worker
+// Busca /api/data, faz o parsing e compara cada seção com a última enviada;
+// a página recebe somente as seções alteradas
+
+const POLL_INTERVAL = 500;
+
+// Recorte de /api/data usado por cada seção do dashboard
+const SECTIONS = {
+    status: data => ({status: data.status, waiting_for_files: data.waiting_for_files}),
+    vehicle: data => data.vehicle_state,
+    coordinates: data => data.planetary_coordinates,
+    info: data => ({commander: data.commander, ship: data.ship, system: data.system,
+                    station: data.station, credits: data.credits}),
+    stations: data => data.system_stations,
+    bodies: data => data.system_bodies,
+    meta: data => ({last_update: data.last_update}),
+    modules: data => data.modules
+};
+
+let lastSections = {};
+let etag = null;
+let paused = true;
+let timer = null;
+let inFlight = false;
+
+function schedule(delay) {
+    clearTimeout(timer);
+    timer = paused ? null : setTimeout(poll, delay);
+}
+
+function diff(data) {
+    const changed = {};
+    let any = false;
+    for (const name in SECTIONS) {
+        const value = SECTIONS[name](data);
+        const serialized = JSON.stringify(value === undefined ? null : value);
+        if (serialized !== lastSections[name]) {
+            lastSections[name] = serialized;
+            changed[name] = value;
+            any = true;
+        }
+    }
+    return any ? changed : null;
+}
+
+async function poll() {
+    if (inFlight) return;
+    inFlight = true;
+    try {
+        // ETag = versão do estado: sem mudanças o servidor responde 304 sem corpo
+        const headers = etag ? {'If-None-Match': etag} : {};
+        const response = await fetch('/api/data', {cache: 'no-store', headers: headers});
+        if (response.status === 304) return;
+        if (!response.ok) {
+            if (response.status === 404) {
+                console.warn('API endpoint not found (404). Server might be initializing.');
+                return;
+            }
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const data = await response.json();
+        etag = response.headers.get('ETag');
+        const changed = diff(data);
+        if (changed) {
+            self.postMessage({type: 'sections', sections: changed});
+        }
+    } catch (error) {
+        // Após um erro a próxima resposta é reenviada por completo
+        lastSections = {};
+        etag = null;
+        self.postMessage({type: 'error', message: error.message});
+    } finally {
+        inFlight = false;
+        schedule(POLL_INTERVAL);
+    }
+}
+
+self.onmessage = (message) => {
+    if (message.data.type === 'pause') {
+        paused = true;
+        schedule();
+    } else if (message.data.type === 'resume' && paused) {
+        paused = false;
+        if (!inFlight) poll();
+    }
+};
+"""
+
+
+def get_thin_dashboard_html(fragments, cursor, refresh=5):
+    """Server-rendered dashboard for e-ink and old browsers
+    
+    `fragments` maps section name to its HTML (dashboard_fragments). A small
+    ES3 script swaps in only the fragments changed after `cursor` (as returned
+    by /api/fragments); without JavaScript the page reloads itself every
+    `refresh` seconds.
+    """
+    sections = ''.join(f'<div id="fragment-{name}">{html}</div>\n'
+                       for name, html in fragments.items())
+    return """<!DOCTYPE html>
+<html>
+<head>
+    <title>Elite Dangerous Dashboard</title>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <noscript><meta http-equiv="refresh" content="%(refresh)d"></noscript>
+    <style>
+        body { font-family: sans-serif; background: #fff; color: #000; margin: 8px; }
+        h1 { font-size: 1.3em; margin: 0 0 8px 0; }
+        h2 { font-size: 1.1em; margin: 12px 0 4px 0; border-bottom: 2px solid #000; }
+        .info-grid, .station-list, .body-list { overflow: hidden; }
+        .info-item, .vehicle-item, .coord-item, .station-card, .body-card {
+            float: left; width: 48%%; margin: 0 2%% 6px 0; }
+        .info-label { font-size: 0.8em; text-transform: uppercase; }
+        .info-value, .vehicle-value, .coord-value, .station-name, .body-name { font-weight: bold; }
+        .status-box, .warning { border: 2px solid #000; padding: 4px; margin-bottom: 6px; }
+        .module-table { width: 100%%; border-collapse: collapse; }
+        .module-table th, .module-table td { border-bottom: 1px solid #000; text-align: left; padding: 2px; }
+        .module-table .hlth { color: #000 !important; }
+    </style>
+</head>
+<body>
+    <h1>Elite Dangerous Dashboard</h1>
+%(sections)s
+    <script>
+        // Busca só os fragmentos alterados desde a versão exibida (XHR/ES3 para navegadores antigos)
+        var cursor = '%(cursor)s';
+        var refresh = %(refresh)d * 1000;
+        function poll() {
+            var xhr = new XMLHttpRequest();
+            xhr.open('GET', '/api/fragments?since=' + cursor + '&_=' + new Date().getTime(), true);
+            xhr.onreadystatechange = function () {
+                if (xhr.readyState !== 4) return;
+                if (xhr.status === 200) {
+                    var payload = JSON.parse(xhr.responseText);
+                    for (var name in payload.fragments) {
+                        if (!payload.fragments.hasOwnProperty(name)) continue;
+                        var element = document.getElementById('fragment-' + name);
+                        if (element) element.innerHTML = payload.fragments[name].html;
+                    }
+                    cursor = payload.cursor;
+                }
+                setTimeout(poll, refresh);
+            };
+            xhr.send(null);
+        }
+        setTimeout(poll, refresh);
+    </script>
+</body>
+</html>
+""" % {'sections': sections, 'cursor': cursor, 'refresh': refresh}
@@ -4,13 +4,26 @@ Elite Dangerous Data Storage
 Stores current game state with thread-safe updates
 """
 
+import itertools
 import threading
+import time
 from datetime import datetime
 
+import config
+from binary_encoding import ENCODINGS
+from profiling import profiler
+
 
 class EDData:
     """Stores current Elite Dangerous game state"""
     
+    # Coleções guardadas como mapas ordenados por inserção (id -> entrada)
+    # e expostas como listas em get_all()
+    INDEXED_KEYS = ('system_bodies', 'system_stations', 'cargo', 'materials')
+    
+    # Intervalo mínimo (s) entre avisos de limite excedido para a mesma coleção
+    LIMIT_WARNING_INTERVAL = 60.0
+    
     def __init__(self):
         self.data = {
             'commander': 'Unknown',
@@ -20,7 +33,8 @@ class EDData:
             'credits': 0,
             'location': {},
             'fuel': {},
-            'cargo': [],
+            'cargo': {},
+            'materials': {},
             'last_update': None,
             'status': 'Aguardando arquivos do Elite Dangerous...',
             'journal_file': None,
@@ -43,19 +57,258 @@ class EDData:
                 'shields_up': True,
                 'in_flight': True
             },
-            'system_bodies': [],
-            'system_stations': [],
+            'system_bodies': {},
+            'system_stations': {},
             'modules': []  # Garantido para o dashboard
         }
         self.lock = threading.Lock()
+        self.version = 0
+        # Versão da última mudança de cada chave (fragmentos HTML por seção)
+        self.key_versions = {}
+        
+        # Tamanho máximo por coleção: mapas perdem as entradas mais antigas,
+        # listas são truncadas
+        self.limits = {
+            'system_bodies': config.MAX_BODIES,
+            'system_stations': config.MAX_STATIONS,
+            'modules': config.MAX_MODULES,
+            'cargo': config.MAX_CARGO,
+            'materials': config.MAX_CARGO,
+        }
+        self.dropped = dict.fromkeys(self.limits, 0)
+        self._warned_at = {}
+        
+        # Corpo codificado por formato ('json', 'msgpack'), válido até a próxima mudança
+        self._encoded = {}
+        self._encode_lock = threading.Lock()
+        
+        # Notificação de mudanças: alterações pendentes são acumuladas e
+        # entregues por uma thread própria, fora do lock dos dados
+        self.subscribers = {}
+        self._next_token = 0
+        self._pending = {}
+        self._pending_version = 0
+        self._notify = threading.Condition(threading.Lock())
+        self._dispatcher = None
+    
+    def _locked(self):
+        """The data lock, timed for contention when profiling is enabled"""
+        if profiler.enabled:
+            return profiler.timed_lock(self.lock, 'EDData')
+        return self.lock
+    
+    def _commit(self, key, item_id=None):
+        """Bump the version and queue a change notification (call with the lock held)"""
+        self.version += 1
+        self.key_versions[key] = self.version
+        self.data['last_update'] = datetime.now().isoformat()
+        if not self.subscribers:
+            return
+        with self._notify:
+            if item_id is None:
+                self._pending[key] = None
+            elif key not in self._pending:
+                self._pending[key] = {item_id}
+            elif self._pending[key] is not None:
+                self._pending[key].add(item_id)
+            self._pending_version = self.version
+            self._notify.notify()
+    
+    def _over_limit(self, key, dropped):
+        """Count entries dropped by a collection limit, warning at most once per interval (lock held)"""
+        self.dropped[key] += dropped
+        now = time.monotonic()
+        if now - self._warned_at.get(key, -self.LIMIT_WARNING_INTERVAL) >= self.LIMIT_WARNING_INTERVAL:
+            self._warned_at[key] = now
+            print(f"Aviso: '{key}' excedeu o limite de {self.limits[key]} entradas "
+                  f"({self.dropped[key]} descartadas até agora)")
+    
+    def _evict(self, key, items):
+        """Drop the oldest entries of an indexed collection above its limit (lock held)"""
+        excess = len(items) - self.limits[key]
+        if excess <= 0:
+            return
+        for item_id in list(itertools.islice(items, excess)):
+            del items[item_id]
+            self._commit(key, item_id)
+        self._over_limit(key, excess)
     
     def update(self, key, value):
         """Thread-safe update of a data key"""
-        with self.lock:
+        limit = self.limits.get(key)
+        excess = len(value) - limit if limit is not None and isinstance(value, list) else 0
+        with self._locked():
+            if excess > 0:
+                self._over_limit(key, excess)
+                value = value[:limit]
             self.data[key] = value
-            self.data['last_update'] = datetime.now().isoformat()
+            self._commit(key)
+    
+    def merge_item(self, key, item_id, fields):
+        """Thread-safe insert or merge of one entry; returns True if the entry is new"""
+        with self._locked():
+            items = self.data[key]
+            existing = items.get(item_id)
+            if existing is None:
+                items[item_id] = dict(fields)
+                self._evict(key, items)
+            else:
+                # Nova entrada em vez de mutar a antiga: snapshots já
+                # entregues por get_all() continuam consistentes
+                merged = dict(existing)
+                merged.update((k, v) for k, v in fields.items() if v is not None)
+                items[item_id] = merged
+            self._commit(key, item_id)
+            return existing is None
+    
+    def adjust_item(self, key, item_id, deltas, fields):
+        """Thread-safe add of numeric deltas to one entry, creating it from fields
+        
+        An entry whose 'Count' drops to zero or below is removed. Returns the
+        resulting entry, or None if it was removed.
+        """
+        with self._locked():
+            items = self.data[key]
+            existing = items.get(item_id)
+            entry = dict(existing) if existing is not None else dict(fields)
+            for field, delta in deltas.items():
+                entry[field] = max(0, (entry.get(field) or 0) + delta)
+            for field, value in fields.items():
+                if entry.get(field) is None and value is not None:
+                    entry[field] = value
+            
+            if entry.get('Count', 0) <= 0:
+                if existing is None:
+                    return None
+                del items[item_id]
+                entry = None
+            else:
+                items[item_id] = entry
+            self._commit(key, item_id)
+            if existing is None:
+                self._evict(key, items)
+            return entry
+    
+    def set_items(self, key, items):
+        """Thread-safe replacement of an indexed collection from (id, entry) pairs"""
+        items = dict(items)
+        excess = len(items) - self.limits.get(key, len(items))
+        with self._locked():
+            if excess > 0:
+                # Mantém as entradas mais recentes
+                self._over_limit(key, excess)
+                items = dict(itertools.islice(items.items(), excess, None))
+            self.data[key] = items
+            self._commit(key)
+    
+    def get_items(self, key):
+        """Thread-safe retrieval of the (id, entry) pairs of an indexed collection"""
+        with self._locked():
+            return list(self.data[key].items())
+    
+    def collection_sizes(self):
+        """Entry count, limit and dropped entries of each size-limited collection"""
+        with self._locked():
+            return {key: {'count': len(self.data[key]), 'limit': limit, 'dropped': self.dropped[key]}
+                    for key, limit in self.limits.items()}
+    
+    def get_key_versions(self):
+        """Thread-safe retrieval of ({key: version of its last change}, current version)"""
+        with self._locked():
+            return dict(self.key_versions), self.version
     
     def get_all(self):
         """Thread-safe retrieval of all data"""
-        with self.lock:
-            return self.data.copy()
+        return self.get_snapshot()[0]
+    
+    def get_snapshot(self):
+        """Thread-safe retrieval of (all data, version)"""
+        with self._locked():
+            data = self.data.copy()
+            for key in self.INDEXED_KEYS:
+                data[key] = list(data[key].values())
+            return data, self.version
+    
+    def get_changes(self, changes):
+        """Thread-safe retrieval of the values behind a subscribe() changes map
+        
+        Returns ([(key, item_id, value), ...], version). item_id is None when
+        the whole key changed; value is None for an entry that no longer exists.
+        """
+        with self._locked():
+            values = []
+            for key, item_ids in changes.items():
+                current = self.data.get(key)
+                if item_ids is None:
+                    if key in self.INDEXED_KEYS:
+                        current = list(current.values())
+                    values.append((key, None, current))
+                else:
+                    values.extend((key, item_id, current.get(item_id)) for item_id in item_ids)
+            return values, self.version
+    
+    def get_encoded(self, fmt='json'):
+        """Encoded snapshot as (body, version) in one of binary_encoding.ENCODINGS, cached per version"""
+        cached = self._encoded.get(fmt)
+        if cached is not None and cached[1] == self.version:
+            return cached
+        
+        with self._encode_lock:
+            cached = self._encoded.get(fmt)
+            if cached is not None and cached[1] == self.version:
+                return cached
+            data, version = self.get_snapshot()
+            encode = ENCODINGS[fmt][1]
+            if profiler.enabled:
+                started = time.perf_counter()
+                body = encode(data)
+                profiler.record('encode', fmt, time.perf_counter() - started)
+            else:
+                body = encode(data)
+            cached = self._encoded[fmt] = (body, version)
+            return cached
+    
+    def subscribe(self, keys, callback):
+        """Call callback(changes, version) after committed changes to any of keys
+        
+        keys=None subscribes to every key. `changes` maps each changed key to
+        None (whole value replaced) or to the set of changed entry ids of an
+        indexed collection. Callbacks run on a dispatcher thread; changes made
+        while a callback runs are coalesced into the next call. Returns a token
+        for unsubscribe().
+        """
+        with self._notify:
+            self._next_token += 1
+            token = self._next_token
+            self.subscribers[token] = (frozenset(keys) if keys is not None else None, callback)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name='EDData-dispatcher',
+                                                    daemon=True)
+                self._dispatcher.start()
+        return token
+    
+    def unsubscribe(self, token):
+        """Remove a subscription created by subscribe()"""
+        with self._notify:
+            self.subscribers.pop(token, None)
+    
+    def _dispatch(self):
+        while True:
+            with self._notify:
+                while not self._pending:
+                    self._notify.wait()
+                changes, version = self._pending, self._pending_version
+                self._pending = {}
+                subscribers = list(self.subscribers.values())
+            
+            for keys, callback in subscribers:
+                if keys is None:
+                    relevant = changes
+                else:
+                    relevant = {k: v for k, v in changes.items() if k in keys}
+                if not relevant:
+                    continue
+                try:
+                    callback(relevant, version)
+                except Exception as e:
+                    print(f"Erro em assinante do EDData: {e}")
@@ -4,6 +4,7 @@ Elite Dangerous Real-time Information Server
 Monitors the game journal and serves data via HTTP with GUI
 """
 
+import argparse
 import socket
 import threading
 import tkinter as tk
@@ -11,9 +12,15 @@ from tkinter import ttk, filedialog, messagebox
 import webbrowser
 from pathlib import Path
 
+import config
 from ed_data import EDData
-from journal_monitor import JournalMonitor
+from journal_monitor import JournalMonitor, detect_journal_directory
+from plugins import PluginManager
+from socket_feed import UnixSocketFeed
 from http_server import ThreadedHTTPServer, EDRequestHandler  # CORRETO: http_server.py (com underscore), NÃO httpserver
+from ingest_process import SHARED_MEMORY_AVAILABLE, IngestProcess
+from memory_usage import start_tracing
+from profiling import profiler
 
 
 class EDGUI:
@@ -26,9 +33,14 @@ class EDGUI:
         
         self.ed_data = EDData()
         self.monitor = None
+        self.plugins = None
+        self.feed = None
+        self.ingest = None
         self.server = None
         self.server_thread = None
         self.monitor_thread = None
+        self.detect_thread = None
+        self.detected_dir = None
         
         self.setup_gui()
     
@@ -97,7 +109,8 @@ class EDGUI:
                                         command=self.open_browser, state="disabled")
         self.browser_button.pack(pady=10)
         
-        self.auto_detect()
+        # Detecção em segundo plano: a janela fica interativa imediatamente
+        self.auto_detect(startup=True)
     
     def browse_directory(self):
         """Browse for journal directory"""
@@ -108,13 +121,39 @@ class EDGUI:
             if self.monitor:
                 self.monitor.set_journal_directory(directory)
     
-    def auto_detect(self):
-        """Auto-detect journal directory"""
-        temp_monitor = JournalMonitor(self.ed_data)
-        if temp_monitor.journal_dir:
+    def auto_detect(self, startup=False):
+        """Auto-detect journal directory on a background thread"""
+        if self.detect_thread and self.detect_thread.is_alive():
+            return
+        
+        # Na inicialização vale o diretório lembrado; o botão força nova busca
+        def detect():
+            self.detected_dir = detect_journal_directory(use_cache=startup)
+        
+        self.detected_dir = None
+        self.detect_thread = threading.Thread(target=detect, daemon=True)
+        self.detect_thread.start()
+        self.root.after(50, self.finish_auto_detect, startup)
+    
+    def finish_auto_detect(self, startup):
+        """Apply the auto-detect result once the background thread is done"""
+        if self.detect_thread.is_alive():
+            self.root.after(50, self.finish_auto_detect, startup)
+            return
+        
+        path = self.detected_dir
+        if startup:
+            # Sem diálogos na inicialização e sem sobrescrever o que o usuário digitou
+            if path and not self.dir_entry.get():
+                self.dir_entry.insert(0, str(path))
+                self.info_text.insert(tk.END, f"Diretório de journals: {path}\n")
+            elif not path:
+                self.info_text.insert(tk.END, "Diretório não encontrado automaticamente. "
+                                              "O servidor aguardará os arquivos do jogo.\n")
+        elif path:
             self.dir_entry.delete(0, tk.END)
-            self.dir_entry.insert(0, str(temp_monitor.journal_dir))
-            messagebox.showinfo("Sucesso", f"Diretório encontrado:\n{temp_monitor.journal_dir}")
+            self.dir_entry.insert(0, str(path))
+            messagebox.showinfo("Sucesso", f"Diretório encontrado:\n{path}")
         else:
             messagebox.showwarning("Aviso", 
                                   "Diretório não encontrado automaticamente.\n"
@@ -135,15 +174,31 @@ class EDGUI:
                         "Deseja iniciar mesmo assim e aguardar os arquivos?"):
                         return
                     journal_dir = None
+                else:
+                    config.save_settings(journal_dir=str(journal_path))
             
-            self.monitor = JournalMonitor(self.ed_data, journal_dir, allow_start_without_files=True)
-            self.monitor_thread = threading.Thread(target=self.monitor.monitor, daemon=True)
-            self.monitor_thread.start()
+            if config.INGEST_PROCESS:
+                # Monitor, plugins e feed rodam no processo filho; o HTTP lê a memória compartilhada
+                self.ingest = IngestProcess(journal_dir)
+                self.ingest.start()
+                data_source = self.ingest.view
+            else:
+                self.plugins = PluginManager.load(self.ed_data)
+                self.monitor = JournalMonitor(self.ed_data, journal_dir, allow_start_without_files=True,
+                                              plugins=self.plugins)
+                self.monitor_thread = threading.Thread(target=self.monitor.monitor, daemon=True)
+                self.monitor_thread.start()
+                data_source = self.ed_data
             
-            self.server = ThreadedHTTPServer(('', port), EDRequestHandler, ed_data=self.ed_data)
+            self.server = ThreadedHTTPServer(('', port), EDRequestHandler,
+                                             ed_data=data_source, monitor=self.monitor)
             self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             self.server_thread.start()
             
+            if config.UNIX_SOCKET and hasattr(socket, 'AF_UNIX') and not self.ingest:
+                self.feed = UnixSocketFeed(self.ed_data, config.UNIX_SOCKET)
+                self.feed.start()
+            
             ip = self.get_local_ip()
             url = f"http://{ip}:{port}"
             
@@ -152,6 +207,8 @@ class EDGUI:
             self.info_text.insert(tk.END, f"Servidor HTTP iniciado\n")
             self.info_text.insert(tk.END, f"URL Local: http://localhost:{port}\n")
             self.info_text.insert(tk.END, f"URL Rede: {url}\n")
+            if self.feed:
+                self.info_text.insert(tk.END, f"Feed NDJSON: {self.feed.path}\n")
             
             if not journal_dir:
                 self.info_text.insert(tk.END, f"\n⏳ Aguardando arquivos do Elite Dangerous...\n")
@@ -164,7 +221,7 @@ class EDGUI:
             self.start_button.config(state="disabled")
             self.stop_button.config(state="normal")
             self.browser_button.config(state="normal")
-            
+        
         except ValueError:
             messagebox.showerror("Erro", "Porta inválida")
         except Exception as e:
@@ -174,11 +231,29 @@ class EDGUI:
         """Stop the server and monitor"""
         if self.monitor:
             self.monitor.running = False
+            # A thread é daemon: sem esperar, o fechamento da janela a mata antes de
+            # gravar o sistema atual e os caches
+            if self.monitor_thread:
+                self.monitor_thread.join(timeout=5)
+                self.monitor_thread = None
+            self.monitor = None
+        
+        if self.plugins:
+            self.plugins.shutdown()
+            self.plugins = None
+        
+        if self.feed:
+            self.feed.stop()
+            self.feed = None
         
         if self.server:
             self.server.shutdown()
             self.server = None
         
+        if self.ingest:
+            self.ingest.stop()
+            self.ingest = None
+        
         self.status_label.config(text="Servidor parado")
         self.info_text.delete(1.0, tk.END)
         self.info_text.insert(tk.END, "Servidor parado.\n")
@@ -217,6 +292,32 @@ class EDGUI:
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Elite Dangerous Local Server')
+    parser.add_argument('--profile', action='store_true',
+                        help='habilita tempos por evento/rota e /debug/profile (ou ED_PROFILE=1)')
+    parser.add_argument('--unix-socket', nargs='?', const=str(config.CACHE_DIR / 'feed.sock'),
+                        metavar='PATH',
+                        help='transmite mudanças do estado em NDJSON por socket Unix (ou ED_UNIX_SOCKET)')
+    parser.add_argument('--ingest-process', action='store_true',
+                        help='lê os journals em um processo separado (ou ED_INGEST_PROCESS=1)')
+    parser.add_argument('--tracemalloc', nargs='?', type=int, const=1, metavar='FRAMES',
+                        help='rastreia alocações para /debug/memory (ou ED_TRACEMALLOC=N)')
+    args = parser.parse_args()
+    
+    if args.profile:
+        profiler.enabled = True
+    if args.unix_socket:
+        config.UNIX_SOCKET = args.unix_socket
+    if args.ingest_process:
+        config.INGEST_PROCESS = True
+    if config.INGEST_PROCESS and not SHARED_MEMORY_AVAILABLE:
+        print("Aviso: --ingest-process requer Python 3.8+ (multiprocessing.shared_memory); "
+              "os journals serão lidos no processo do servidor")
+        config.INGEST_PROCESS = False
+    if args.tracemalloc:
+        config.TRACEMALLOC = args.tracemalloc
+    start_tracing()
+    
     app = EDGUI()
     app.run()
 
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Recent Events Buffer
+Fixed-capacity ring buffer of compact event records with sequence cursors
+"""
+
+import sys
+import threading
+
+import config
+
+
+class EventRecord:
+    """Compact, reusable record of one journal event"""
+    
+    __slots__ = ('seq', 'timestamp', 'event', 'details')
+    
+    def __init__(self):
+        self.seq = 0
+        self.timestamp = None
+        self.event = None
+        self.details = None
+    
+    def as_dict(self):
+        result = {'seq': self.seq, 'timestamp': self.timestamp, 'event': self.event}
+        if self.details is not None:
+            result['data'] = self.details.fields()
+        return result
+
+
+class RecentEvents:
+    """Ring buffer of the last N events, addressed by a monotonic sequence number"""
+    
+    def __init__(self, capacity=None):
+        self.capacity = capacity or config.RECENT_EVENTS_SIZE
+        # Registros pré-alocados e reutilizados: memória constante
+        self.records = [EventRecord() for _ in range(self.capacity)]
+        self.seq = 0
+        self.lock = threading.Lock()
+    
+    def append(self, timestamp, event, details=None):
+        """Record an event and its optional typed details, overwriting the oldest slot when full"""
+        if event is None:
+            return
+        with self.lock:
+            self.seq += 1
+            record = self.records[self.seq % self.capacity]
+            record.seq = self.seq
+            record.timestamp = timestamp
+            record.event = sys.intern(event)
+            record.details = details
+    
+    def since(self, after=0):
+        """Return (records newer than the cursor as dicts, last seq, events lost)"""
+        with self.lock:
+            oldest = max(1, self.seq - self.capacity + 1)
+            first = max(after + 1, oldest)
+            events = [self.records[seq % self.capacity].as_dict()
+                      for seq in range(first, self.seq + 1)]
+            return events, self.seq, first > after + 1
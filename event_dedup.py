@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Event Deduplication
+Bounded sliding window of recently ingested journal lines
+"""
+
+from collections import deque
+
+import config
+
+
+class DedupWindow:
+    """Drops journal lines that were already ingested, in O(1) time and fixed memory
+    
+    Lines are keyed by (timestamp, event, file offset). The last `capacity`
+    keys are kept in a FIFO window; evicting a key advances the horizon to its
+    timestamp. Since journals are written in time order, a line not newer than
+    the horizon was ingested before it fell out of the window and is dropped
+    too (this assumes fewer than `capacity` lines share one timestamp second).
+    """
+    
+    def __init__(self, capacity=None):
+        self.capacity = capacity or config.DEDUP_WINDOW
+        self.order = deque()
+        self.keys = set()
+        self.horizon = ''
+        self.checked = 0
+        self.duplicates = 0
+        self.expired = 0
+    
+    def seen(self, timestamp, event, offset):
+        """Record a line; True if it was already ingested and should be skipped"""
+        self.checked += 1
+        if timestamp <= self.horizon:
+            self.expired += 1
+            return True
+        key = (timestamp, event, offset)
+        if key in self.keys:
+            self.duplicates += 1
+            return True
+        
+        self.keys.add(key)
+        self.order.append(key)
+        if len(self.order) > self.capacity:
+            evicted = self.order.popleft()
+            self.keys.discard(evicted)
+            if evicted[0] > self.horizon:
+                self.horizon = evicted[0]
+        return False
+    
+    def reset(self):
+        """Forget everything (e.g. when switching to another journal directory)"""
+        self.order.clear()
+        self.keys.clear()
+        self.horizon = ''
+    
+    def snapshot(self):
+        return {
+            'checked': self.checked,
+            'dropped': self.duplicates + self.expired,
+            'duplicates': self.duplicates,
+            'older_than_window': self.expired,
+            'window': len(self.order),
+            'capacity': self.capacity,
+            'horizon': self.horizon or None,
+        }
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Event Records
+Compact __slots__ records for the journal events the server handles
+"""
+
+import sys
+
+
+class Record:
+    """Fixed set of journal fields stored in slots
+    
+    FIELDS are the journal keys kept (also the slot names); anything else in
+    the parsed event is dropped. Strings are interned, so repeated names
+    (systems, ship types, modules) share one object across records.
+    """
+    
+    __slots__ = ()
+    FIELDS = ()
+    CONVERTERS = {}
+    
+    @classmethod
+    def from_dict(cls, source):
+        record = cls.__new__(cls)
+        converters = cls.CONVERTERS
+        for name in cls.FIELDS:
+            value = source.get(name)
+            if value is not None:
+                if name in converters:
+                    value = converters[name](value)
+                elif isinstance(value, str):
+                    value = sys.intern(value)
+            setattr(record, name, value)
+        return record
+    
+    def as_dict(self):
+        return self.fields()
+    
+    def fields(self):
+        """Journal-shaped dict with the kept, non-empty fields"""
+        result = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if isinstance(value, tuple):
+                value = [item.as_dict() if isinstance(item, Record) else item for item in value]
+            result[name] = value
+        return result
+    
+    def __repr__(self):
+        return f'{type(self).__name__}({self.as_dict()!r})'
+
+
+class JournalRecord(Record):
+    """Record of one journal event; the event name is a class attribute"""
+    
+    __slots__ = ('timestamp',)
+    event = None
+    
+    @classmethod
+    def from_event(cls, event):
+        record = cls.from_dict(event)
+        record.timestamp = event.get('timestamp')
+        return record
+    
+    def as_dict(self):
+        result = {'timestamp': self.timestamp, 'event': self.event}
+        result.update(self.fields())
+        return result
+
+
+def _record_type(name, fields, converters=None, base=JournalRecord):
+    attrs = {'__slots__': fields, 'FIELDS': fields, 'CONVERTERS': converters or {}}
+    if base is JournalRecord:
+        attrs['event'] = name
+    return type(f'{name}Record', (base,), attrs)
+
+
+def _parts(record_type):
+    """Converter for a list of nested objects (modules, rings, stations...)"""
+    def convert(items):
+        return tuple(record_type.from_dict(item) for item in items if isinstance(item, dict))
+    return convert
+
+
+def _coords(value):
+    return tuple(value)
+
+
+ModuleRecord = _record_type('Module', ('Slot', 'Item', 'On', 'Priority', 'Health', 'Value'),
+                            base=Record)
+RingRecord = _record_type('Ring', ('Name', 'RingClass', 'MassMT', 'InnerRad', 'OuterRad'),
+                          base=Record)
+StationRecord = _record_type('Station', ('Name', 'MarketID', 'StationType', 'DistFromStarLS'),
+                             base=Record)
+CargoRecord = _record_type('CargoItem', ('Name', 'Name_Localised', 'Count', 'Stolen'), base=Record)
+
+_SYSTEM = ('StarSystem', 'SystemAddress')
+_SURFACE = ('Latitude', 'Longitude', 'Body', 'BodyID')
+
+# Campos mantidos por evento tratado em JournalMonitor.process_event
+RECORD_TYPES = {record_type.event: record_type for record_type in (
+    _record_type('LoadGame', ('Commander', 'Ship', 'ShipID', 'ShipName', 'ShipIdent', 'FuelLevel',
+                              'FuelCapacity', 'GameMode', 'Credits', 'Loan')),
+    _record_type('Location', _SYSTEM + ('StarPos', 'Body', 'BodyID', 'BodyType', 'Docked',
+                                        'StationName', 'StationType', 'MarketID', 'Latitude',
+                                        'Longitude', 'Stations'),
+                 {'StarPos': _coords, 'Stations': _parts(StationRecord)}),
+    _record_type('FSDJump', _SYSTEM + ('StarPos', 'Body', 'BodyID', 'JumpDist', 'FuelUsed',
+                                       'FuelLevel', 'Stations'),
+                 {'StarPos': _coords, 'Stations': _parts(StationRecord)}),
+    _record_type('Scan', _SYSTEM + ('ScanType', 'BodyName', 'BodyID', 'DistanceFromArrivalLS',
+                                    'StarType', 'PlanetClass', 'Landable', 'TerraformState',
+                                    'Atmosphere', 'Volcanism', 'MassEM', 'Radius', 'SurfaceGravity',
+                                    'SurfaceTemperature', 'Rings', 'WasDiscovered', 'WasMapped'),
+                 {'Rings': _parts(RingRecord)}),
+    _record_type('FSSDiscoveryScan', ('SystemName', 'SystemAddress', 'BodyCount', 'NonBodyCount',
+                                      'Progress')),
+    _record_type('SAAScanComplete', ('BodyName', 'BodyID', 'SystemAddress', 'ProbesUsed',
+                                     'EfficiencyTarget')),
+    _record_type('Docked', _SYSTEM + ('StationName', 'StationType', 'MarketID', 'DistFromStarLS')),
+    _record_type('Undocked', ('StationName', 'StationType', 'MarketID')),
+    _record_type('Touchdown', _SYSTEM + _SURFACE + ('NearestDestination', 'PlayerControlled',
+                                                    'OnStation', 'OnPlanet')),
+    _record_type('Liftoff', _SYSTEM + _SURFACE + ('NearestDestination', 'PlayerControlled',
+                                                  'OnStation', 'OnPlanet')),
+    _record_type('ApproachSettlement', ('Name', 'MarketID', 'SystemAddress', 'BodyID', 'BodyName',
+                                        'Latitude', 'Longitude')),
+    _record_type('LaunchSRV', ('SRVType', 'Loadout', 'ID', 'PlayerControlled')),
+    _record_type('DockSRV', ('SRVType', 'ID')),
+    _record_type('LaunchFighter', ('Loadout', 'ID', 'PlayerControlled')),
+    _record_type('SupercruiseEntry', _SYSTEM),
+    _record_type('SupercruiseExit', _SYSTEM + ('Body', 'BodyID', 'BodyType')),
+    _record_type('StartJump', _SYSTEM + ('JumpType', 'StarClass')),
+    _record_type('LandingGear', ('Deployed',)),
+    _record_type('Shields', ('Up',)),
+    _record_type('Loadout', ('Ship', 'ShipID', 'ShipName', 'ShipIdent', 'HullValue', 'ModulesValue',
+                             'HullHealth', 'UnladenMass', 'CargoCapacity', 'MaxJumpRange', 'Rebuy',
+                             'Modules'),
+                 {'Modules': _parts(ModuleRecord)}),
+    _record_type('ModuleInfo', ('Modules',), {'Modules': _parts(ModuleRecord)}),
+    _record_type('FuelScoop', ('Scooped', 'Total')),
+    _record_type('Cargo', ('Vessel', 'Count', 'Inventory'), {'Inventory': _parts(CargoRecord)}),
+    _record_type('HullDamage', ('Health', 'PlayerPilot', 'Fighter')),
+    _record_type('MarketBuy', ('MarketID', 'Type', 'Type_Localised', 'Count', 'BuyPrice', 'TotalCost')),
+    _record_type('MarketSell', ('MarketID', 'Type', 'Type_Localised', 'Count', 'SellPrice', 'TotalSale',
+                                'StolenGoods')),
+    _record_type('CollectCargo', ('Type', 'Type_Localised', 'Stolen')),
+    _record_type('EjectCargo', ('Type', 'Type_Localised', 'Count', 'Abandoned')),
+    _record_type('MiningRefined', ('Type', 'Type_Localised')),
+    _record_type('MaterialCollected', ('Category', 'Name', 'Name_Localised', 'Count')),
+    _record_type('MaterialDiscarded', ('Category', 'Name', 'Name_Localised', 'Count')),
+    _record_type('ShipyardSwap', ('ShipType', 'ShipID', 'StoreOldShip', 'StoreShipID', 'MarketID')),
+    _record_type('ShipyardBuy', ('ShipType', 'ShipPrice', 'StoreOldShip', 'StoreShipID', 'SellOldShip',
+                                 'SellShipID', 'MarketID')),
+    _record_type('ShipyardSell', ('ShipType', 'SellShipID', 'ShipPrice', 'MarketID')),
+    _record_type('ShipyardTransfer', ('ShipType', 'ShipID', 'System', 'Distance', 'TransferPrice')),
+    _record_type('SellShipOnRebuy', ('ShipType', 'System', 'SellShipId', 'ShipPrice')),
+)}
+
+
+def make_record(event):
+    """Typed record for a parsed event, or None for event types without one"""
+    record_type = RECORD_TYPES.get(event.get('event'))
+    if record_type is None:
+        return None
+    return record_type.from_event(event)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Fleet Cache
+Last known loadout of every ship, keyed by commander and ShipID and persisted between runs
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import config
+
+
+def module_list(event):
+    """The dashboard 'modules' list from a Loadout/ModuleInfo event"""
+    return [{
+        "slot": mod.get("Slot"),
+        "item": mod.get("Item"),
+        "on": mod.get("On"),
+        "priority": mod.get("Priority"),
+        "health": mod.get("Health")
+    } for mod in event.get("Modules", [])]
+
+
+def commander_key(event):
+    """Key of the commander of a LoadGame/Commander event: the FID, or the name in older journals"""
+    return event.get('FID') or event.get('Commander') or event.get('Name')
+
+
+def read_modules_file(journal_dir, timestamp):
+    """Modules from ModulesInfo.json, if it was written for this ModuleInfo event"""
+    if journal_dir is None:
+        return None
+    try:
+        with open(Path(journal_dir) / 'ModulesInfo.json', 'r', encoding='utf-8') as f:
+            content = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if content.get('timestamp') != timestamp:
+        return None
+    return content.get('Modules')
+
+
+class FleetCache:
+    """Per-ship loadouts from Loadout events plus ownership/location from shipyard events
+    
+    ShipIDs are only unique per commander, so ships are kept per commander
+    and `ships` is the fleet of the current one (set_commander).
+    """
+    
+    # Eventos de estaleiro aplicados por apply()
+    EVENTS = frozenset({
+        'ShipyardSwap', 'ShipyardBuy', 'ShipyardSell', 'SellShipOnRebuy',
+        'ShipyardTransfer', 'StoredShips',
+    })
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else config.CACHE_DIR / 'fleet.json'
+        self.commanders = {}       # comandante -> {ShipID: entrada}
+        self.commander = None
+        self.ships = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self._load()
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                ships = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Erro ao ler cache da frota: {e}")
+            return
+        if 'commanders' not in ships:
+            # Formato antigo, sem comandante: não há como saber de quem são as naves
+            print("Cache da frota sem comandantes descartado; será refeito pelos próximos eventos")
+            return
+        commanders = ships['commanders']
+        # Chaves JSON são strings; ShipID é inteiro no journal
+        self.commanders = {commander: {int(ship_id): entry for ship_id, entry in fleet.items()}
+                           for commander, fleet in commanders.items()}
+        self.ships = self.commanders.setdefault(self.commander or '', {})
+    
+    def set_commander(self, commander):
+        """Make `commander` (see commander_key) the owner of the ships read and written next"""
+        with self.lock:
+            self.commander = commander
+            self.ships = self.commanders.setdefault(commander or '', {})
+    
+    def get(self, ship_id):
+        """Cached entry of a ship, or None"""
+        with self.lock:
+            return self.ships.get(ship_id)
+    
+    def _update(self, ship_id, clear=(), **fields):
+        """Merge non-None fields into a ship's entry and reset the fields named in clear"""
+        if ship_id is None:
+            return None
+        if fields.get('ship'):
+            # Loadout usa 'krait_mkii', StoreOldShip usa 'Krait_MkII'
+            fields['ship'] = fields['ship'].lower()
+        with self.lock:
+            entry = dict(self.ships.get(ship_id) or {'ship_id': ship_id, 'modules': None})
+            entry.update((k, v) for k, v in fields.items() if v is not None)
+            for field in clear:
+                entry[field] = None
+            self.ships[ship_id] = entry
+            self.dirty = True
+            return entry
+    
+    def _remove(self, ship_id):
+        with self.lock:
+            if self.ships.pop(ship_id, None) is not None:
+                self.dirty = True
+    
+    def put_loadout(self, event):
+        """Store a Loadout event as the ship's current loadout; returns the entry"""
+        return self._update(
+            event.get('ShipID'),
+            ship=event.get('Ship'),
+            ship_name=event.get('ShipName'),
+            ship_ident=event.get('ShipIdent'),
+            hull_health=event.get('HullHealth'),
+            hull_value=event.get('HullValue'),
+            modules_value=event.get('ModulesValue'),
+            rebuy=event.get('Rebuy'),
+            cargo_capacity=event.get('CargoCapacity'),
+            max_jump_range=event.get('MaxJumpRange'),
+            modules=module_list(event),
+            updated=event.get('timestamp'),
+            clear=('stored_at',))
+    
+    def put_modules(self, ship_id, modules):
+        """Replace the cached module list of a ship"""
+        return self._update(ship_id, modules=modules)
+    
+    def apply(self, event, system=None, station=None):
+        """Apply a shipyard event; system/station locate a ship being stored"""
+        event_type = event.get('event')
+        
+        if event_type in ('ShipyardSwap', 'ShipyardBuy'):
+            if event.get('StoreShipID') is not None:
+                self._update(event['StoreShipID'], ship=event.get('StoreOldShip'),
+                             stored_at={'system': system, 'station': station})
+            if event.get('SellShipID') is not None:
+                self._remove(event['SellShipID'])
+            if event_type == 'ShipyardSwap':
+                self._update(event.get('ShipID'), ship=event.get('ShipType'), clear=('stored_at',))
+        
+        elif event_type == 'ShipyardSell':
+            self._remove(event.get('SellShipID'))
+        
+        elif event_type == 'SellShipOnRebuy':
+            self._remove(event.get('SellShipId'))
+        
+        elif event_type == 'ShipyardTransfer':
+            self._update(event.get('ShipID'), ship=event.get('ShipType'),
+                         stored_at={'system': system, 'station': station})
+        
+        elif event_type == 'StoredShips':
+            here = {'system': event.get('StarSystem'), 'station': event.get('StationName')}
+            for stored in event.get('ShipsHere', []):
+                self._update(stored.get('ShipID'), ship=stored.get('ShipType'),
+                             ship_name=stored.get('Name'), stored_at=here)
+            for stored in event.get('ShipsRemote', []):
+                if stored.get('InTransit'):
+                    continue
+                self._update(stored.get('ShipID'), ship=stored.get('ShipType'),
+                             ship_name=stored.get('Name'),
+                             stored_at={'system': stored.get('StarSystem'), 'station': None})
+    
+    def snapshot(self, current_ship_id=None):
+        """Every known ship as a list, the current one flagged"""
+        with self.lock:
+            ships = [dict(entry, current=ship_id == current_ship_id)
+                     for ship_id, entry in sorted(self.ships.items())]
+        return ships
+    
+    def flush(self):
+        """Write the cache to disk if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+            ships = {'commanders': {commander: {str(ship_id): entry for ship_id, entry in fleet.items()}
+                                    for commander, fleet in self.commanders.items() if fleet}}
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(ships, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Erro ao gravar cache da frota: {e}")
@@ -5,9 +5,23 @@ Serves game data via HTTP with REST API and dashboard
 """
 
 import json
+import math
+import time
+import tracemalloc
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from socketserver import ThreadingMixIn
-from dashboard_html import get_dashboard_html
+from urllib.parse import urlsplit, parse_qs
+from binary_encoding import ENCODINGS, negotiate
+from dashboard_fragments import SECTIONS, FragmentCache
+from dashboard_html import get_dashboard_html, get_dashboard_worker_js, get_thin_dashboard_html
+from journal_reader import parse_event_time
+from memory_usage import memory_report
+from profiling import profiler, sample_stacks, format_collapsed, format_pstats
+from timeseries import METRICS
+
+
+# Maior número de pontos aceito em /api/series/<metric>?points=
+MAX_SERIES_POINTS = 10000
 
 
 class EDRequestHandler(BaseHTTPRequestHandler):
@@ -17,22 +31,233 @@ class EDRequestHandler(BaseHTTPRequestHandler):
         """Suppress default logging"""
         pass
     
+    def send_body(self, body, content_type='application/json', status=200, headers=()):
+        """Send an already encoded response body"""
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_json(self, payload, status=200):
+        """Send a JSON response"""
+        self.send_body(json.dumps(payload).encode(), status=status)
+    
+    def send_nearby(self, query):
+        """Answer /api/nearby from the visited-systems spatial index"""
+        index = self.server.monitor.visited_systems
+        try:
+            if 'system' in query:
+                center = index.position(query['system'][0])
+                if center is None:
+                    self.send_json({'error': 'sistema não visitado'}, 404)
+                    return
+            else:
+                center = tuple(float(query[axis][0]) for axis in ('x', 'y', 'z'))
+            radius = float(query['r'][0]) if 'r' in query else None
+            k = int(query['k'][0]) if 'k' in query else None
+            if (not all(math.isfinite(axis) for axis in center)
+                    or (radius is not None and not 0 <= radius < math.inf)
+                    or (k is not None and k <= 0)):
+                raise ValueError('nearby')
+        except (KeyError, ValueError):
+            self.send_json({'error': 'use ?x=&y=&z= ou ?system=, com r= e/ou k='}, 400)
+            return
+        
+        if radius is not None:
+            systems = index.within(center, radius, limit=k)
+        else:
+            systems = index.nearest(center, k or 10)
+        self.send_json({'center': list(center), 'count': len(systems), 'systems': systems})
+    
+    def send_series(self, metric, query):
+        """Answer /api/series/<metric> with an LTTB-downsampled series"""
+        if metric not in METRICS:
+            self.send_json({'error': f'métricas disponíveis: {", ".join(METRICS)}'}, 404)
+            return
+        
+        def bound(name):
+            value = query.get(name, [None])[0]
+            if value is None:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                parsed = parse_event_time(value)
+                if parsed is None:
+                    raise
+                return parsed
+        
+        try:
+            start, end = bound('from'), bound('to')
+            points = int(query.get('points', ['500'])[0])
+            if not 1 <= points <= MAX_SERIES_POINTS:
+                raise ValueError(points)
+        except ValueError:
+            self.send_json({'error': 'from/to em segundos epoch ou ISO-8601, '
+                                     f'points inteiro entre 1 e {MAX_SERIES_POINTS}'}, 400)
+            return
+        
+        total, samples = self.server.monitor.series.query(metric, start, end, points)
+        self.send_json({'metric': metric, 'total': total,
+                        'points': [[t, v] for t, v in samples]})
+    
+    def send_profile(self, query):
+        """Sample all threads for ?seconds=N and return collapsed stacks or pstats text"""
+        try:
+            seconds = min(max(float(query.get('seconds', ['5'])[0]), 0.1), 60)
+        except ValueError:
+            self.send_json({'error': 'seconds deve ser numérico'}, 400)
+            return
+        
+        samples, period = sample_stacks(seconds)
+        if query.get('format', ['collapsed'])[0] == 'pstats':
+            body = format_pstats(samples, period)
+        else:
+            body = format_collapsed(samples)
+        self.send_body(body.encode(), 'text/plain; charset=utf-8')
+    
+    def send_fragment(self, name):
+        """Answer /fragment/<name> with one pre-rendered section, 304 if unchanged"""
+        if name not in SECTIONS:
+            self.send_json({'error': f'seções disponíveis: {", ".join(SECTIONS)}'}, 404)
+            return
+        _, fragments = self.server.fragments.get([name])
+        version, html = fragments[name]
+        etag = f'"{self.server.instance}-{name}-{version}"'
+        headers = [('ETag', etag), ('Cache-Control', 'no-cache'), ('X-Fragment-Version', str(version))]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            for header, value in headers:
+                self.send_header(header, value)
+            self.end_headers()
+            return
+        self.send_body(html.encode(), 'text/html; charset=utf-8', headers=headers)
+    
+    def send_memory(self, query):
+        """Answer /debug/memory with RSS, top allocation sites and collection sizes"""
+        try:
+            limit = min(max(int(query.get('limit', ['20'])[0]), 1), 200)
+        except ValueError:
+            self.send_json({'error': 'limit deve ser um inteiro'}, 400)
+            return
+        group_by = query.get('group', ['lineno'])[0]
+        if group_by not in ('lineno', 'filename', 'traceback'):
+            self.send_json({'error': 'group deve ser lineno, filename ou traceback'}, 400)
+            return
+        self.send_json(memory_report(self.server.ed_data, self.server.monitor, limit, group_by,
+                                     compare='compare' in query))
+    
     def do_GET(self):
-        if self.path == '/':
+        url = urlsplit(self.path)
+        path = url.path
+        query = parse_qs(url.query)
+        
+        if not profiler.enabled:
+            self.route_get(path, query)
+            return
+        
+        self.route_label = path
+        started = time.perf_counter()
+        self.route_get(path, query)
+        profiler.record('route', self.route_label, time.perf_counter() - started)
+    
+    def route_get(self, path, query):
+        """Dispatch a GET request to its handler"""
+        if path == '/':
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
             self.end_headers()
             self.wfile.write(get_dashboard_html().encode())
-            
-        elif self.path.split('?')[0] == '/api/data':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            data = self.server.ed_data.get_all()
-            self.wfile.write(json.dumps(data, indent=2).encode())
+        
+        elif path == '/dashboard-worker.js':
+            self.send_body(get_dashboard_worker_js().encode(), 'application/javascript; charset=utf-8')
+        
+        elif path == '/thin':
+            try:
+                refresh = min(max(int(query.get('refresh', ['5'])[0]), 1), 3600)
+            except ValueError:
+                refresh = 5
+            version, fragments = self.server.fragments.get()
+            page = get_thin_dashboard_html({name: html for name, (_, html) in fragments.items()},
+                                           f'{self.server.instance}-{version}', refresh)
+            self.send_body(page.encode(), 'text/html; charset=utf-8')
+        
+        elif path == '/api/fragments':
+            # O cursor leva a instância: após um reinício a versão recomeça e tudo é reenviado
+            instance, _, since = query.get('since', [''])[0].rpartition('-')
+            try:
+                since = int(since) if instance == self.server.instance else -1
+            except ValueError:
+                self.send_json({'error': 'since deve ser o cursor da resposta anterior'}, 400)
+                return
+            version, fragments = self.server.fragments.get(since=since)
+            self.send_json({'version': version, 'cursor': f'{self.server.instance}-{version}',
+                            'fragments': {name: {'version': v, 'html': html}
+                                          for name, (v, html) in fragments.items()}})
+        
+        elif path.startswith('/fragment/'):
+            self.route_label = '/fragment/*'
+            self.send_fragment(path[len('/fragment/'):])
+        
+        elif path == '/api/data':
+            fmt = negotiate(self.headers.get('Accept'), query.get('format', [None])[0])
+            body, version = self.server.ed_data.get_encoded(fmt)
+            # Versão do estado como ETag: clientes sem mudanças recebem 304 sem corpo
+            etag = f'"{self.server.instance}-{fmt}-{version}"'
+            headers = [('Vary', 'Accept'), ('ETag', etag), ('Cache-Control', 'no-cache')]
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                return
+            self.send_body(body, ENCODINGS[fmt][0], headers=headers)
+        
+        elif path == '/api/events/recent' and self.server.monitor:
+            try:
+                after = int(query.get('after', ['0'])[0])
+            except ValueError:
+                self.send_json({'error': 'after deve ser um inteiro'}, 400)
+                return
+            events, last_seq, missed = self.server.monitor.recent_events.since(after)
+            self.send_json({'events': events, 'last_seq': last_seq, 'missed': missed})
+        
+        elif path == '/api/stats' and self.server.monitor:
+            self.send_body(self.server.monitor.stats.to_json())
+        
+        elif path == '/api/nearby' and self.server.monitor:
+            self.send_nearby(query)
+        
+        elif path.startswith('/api/series/') and self.server.monitor:
+            self.route_label = '/api/series/*'
+            self.send_series(path[len('/api/series/'):], query)
+        
+        elif path == '/api/fleet' and self.server.monitor:
+            monitor = self.server.monitor
+            self.send_json({'current': monitor.ship_id, 'ships': monitor.fleet.snapshot(monitor.ship_id)})
+        
+        elif path == '/api/ingest' and self.server.monitor:
+            self.send_json({'dedup': self.server.monitor.dedup.snapshot()})
+        
+        elif path == '/api/plugins' and self.server.monitor and self.server.monitor.plugins:
+            self.send_json(self.server.monitor.plugins.metrics())
+        
+        elif path == '/debug/timings' and profiler.enabled:
+            self.send_json(profiler.snapshot(reset='reset' in query))
+        
+        elif path == '/debug/profile' and profiler.enabled:
+            self.send_profile(query)
+        
+        elif path == '/debug/memory' and (profiler.enabled or tracemalloc.is_tracing()):
+            self.send_memory(query)
         
         else:
+            self.route_label = 'not_found'
             self.send_response(404)
             self.end_headers()
 
@@ -41,4 +266,8 @@ class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
     """Handle requests in a separate thread"""
     def __init__(self, *args, **kwargs):
         self.ed_data = kwargs.pop('ed_data', None)
+        self.monitor = kwargs.pop('monitor', None)
+        # Distingue ETags de execuções diferentes (a versão do EDData recomeça do zero)
+        self.instance = format(time.time_ns(), 'x')
+        self.fragments = FragmentCache(self.ed_data)
         super().__init__(*args, **kwargs)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Ingest Process
+Runs journal ingestion in a child process that publishes snapshots through shared memory
+"""
+
+import json
+import multiprocessing
+import socket
+import struct
+import threading
+
+import config
+from binary_encoding import ENCODINGS
+from ed_data import EDData
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None  # Python 3.7: modo --ingest-process indisponível
+
+# Se o modo de ingestão em processo separado pode ser usado neste Python
+SHARED_MEMORY_AVAILABLE = shared_memory is not None
+
+
+# Cabeçalho do segmento: seq, versão do estado, bytes do JSON, bytes do MessagePack.
+# seq ímpar = escrita em andamento (seqlock); os corpos vêm logo após o cabeçalho.
+HEADER = struct.Struct('<QQQQ')
+SEQ = struct.Struct('<Q')
+
+
+def _attach(name):
+    """Open an existing segment without registering it for cleanup in this process"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)  # Python < 3.13
+
+
+class SnapshotPublisher:
+    """Single writer: encodes EDData snapshots and stores them under a seqlock"""
+    
+    def __init__(self, shm, ed_data):
+        self.shm = shm
+        self.ed_data = ed_data
+        self.seq = SEQ.unpack_from(shm.buf, 0)[0]
+        self.token = None
+        self.oversize_warned = False
+    
+    def start(self):
+        """Publish now and after every committed change"""
+        self.publish()
+        self.token = self.ed_data.subscribe(None, self.publish)
+    
+    def stop(self):
+        if self.token is not None:
+            self.ed_data.unsubscribe(self.token)
+            self.token = None
+    
+    def publish(self, changes=None, version=None):
+        data, version = self.ed_data.get_snapshot()
+        bodies = [ENCODINGS[fmt][1](data) for fmt in ('json', 'msgpack')]
+        size = sum(len(body) for body in bodies)
+        
+        buf = self.shm.buf
+        if HEADER.size + size > len(buf):
+            if not self.oversize_warned:
+                self.oversize_warned = True
+                print(f"Estado ({size} bytes) excede ED_INGEST_SHM_SIZE; snapshot não publicado")
+            return
+        self.oversize_warned = False
+        
+        SEQ.pack_into(buf, 0, self.seq + 1)
+        HEADER.pack_into(buf, 0, self.seq + 1, version, len(bodies[0]), len(bodies[1]))
+        offset = HEADER.size
+        for body in bodies:
+            buf[offset:offset + len(body)] = body
+            offset += len(body)
+        self.seq += 2
+        SEQ.pack_into(buf, 0, self.seq)
+
+
+class SharedStateView:
+    """Read-only EDData stand-in for the HTTP server, backed by the shared segment
+    
+    Readers check the seqlock counter on every call and copy the bodies only
+    when a new snapshot was published; there is no IPC round trip.
+    """
+    
+    def __init__(self, name):
+        self.shm = _attach(name)
+        self._cached = (None, {})
+    
+    def _read(self):
+        buf = self.shm.buf
+        while True:
+            seq, version, json_len, msgpack_len = HEADER.unpack_from(buf, 0)
+            if seq & 1:
+                continue
+            cached_seq, encoded = self._cached
+            if seq == cached_seq:
+                return encoded
+            payload = bytes(buf[HEADER.size:HEADER.size + json_len + msgpack_len])
+            if SEQ.unpack_from(buf, 0)[0] != seq:
+                continue  # escrito durante a cópia: tenta de novo
+            encoded = {
+                'json': (payload[:json_len], version),
+                'msgpack': (payload[json_len:], version),
+            }
+            self._cached = (seq, encoded)
+            return encoded
+    
+    def get_encoded(self, fmt='json'):
+        """Latest published body as (body, version)"""
+        return self._read()[fmt]
+    
+    def get_snapshot(self):
+        body, version = self.get_encoded('json')
+        return json.loads(body), version
+    
+    def get_all(self):
+        return self.get_snapshot()[0]
+    
+    def close(self):
+        self._cached = (None, {})
+        self.shm.close()
+
+
+def run_ingest(shm_name, journal_dir, stop_event, unix_socket=None):
+    """Child process: EDData, JournalMonitor, plugins and socket feed, publishing into shm_name"""
+    from journal_monitor import JournalMonitor
+    from plugins import PluginManager
+    
+    shm = _attach(shm_name)
+    ed_data = EDData()
+    publisher = SnapshotPublisher(shm, ed_data)
+    publisher.start()
+    
+    plugins = PluginManager.load(ed_data)
+    monitor = JournalMonitor(ed_data, journal_dir, allow_start_without_files=True, plugins=plugins)
+    feed = None
+    if unix_socket:
+        from socket_feed import UnixSocketFeed
+        feed = UnixSocketFeed(ed_data, unix_socket)
+        feed.start()
+    
+    monitor_thread = threading.Thread(target=monitor.monitor, daemon=True)
+    monitor_thread.start()
+    try:
+        stop_event.wait()
+    except KeyboardInterrupt:
+        pass
+    
+    monitor.running = False
+    monitor_thread.join(timeout=5)
+    if feed:
+        feed.stop()
+    plugins.shutdown()
+    publisher.stop()
+    shm.close()
+
+
+class IngestProcess:
+    """Owns the shared segment and the child ingest process"""
+    
+    def __init__(self, journal_dir=None, size=None):
+        self.journal_dir = str(journal_dir) if journal_dir else None
+        self.size = size or config.INGEST_SHM_SIZE
+        self.shm = None
+        self.process = None
+        self.stop_event = None
+        self.view = None
+    
+    def start(self):
+        """Create the segment, publish the initial state and start the child"""
+        self.shm = shared_memory.SharedMemory(create=True, size=self.size)
+        SnapshotPublisher(self.shm, EDData()).publish()
+        self.view = SharedStateView(self.shm.name)
+        
+        self.stop_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=run_ingest, name='ed-ingest', daemon=True,
+            args=(self.shm.name, self.journal_dir, self.stop_event,
+                  config.UNIX_SOCKET if hasattr(socket, 'AF_UNIX') else None))
+        self.process.start()
+        print(f"Processo de ingestão iniciado (pid {self.process.pid})")
+    
+    def stop(self):
+        """Stop the child and release the segment"""
+        if self.process:
+            self.stop_event.set()
+            self.process.join(timeout=10)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.view:
+            self.view.close()
+            self.view = None
+        if self.shm:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
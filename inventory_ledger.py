@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Inventory Ledger
+Keeps cargo and materials current from delta events, reconciled by full snapshots
+"""
+
+import json
+
+
+def item_key(name):
+    """Canonical commodity/material id: '$Gold_Name;' and 'Gold' both become 'gold'"""
+    name = name.lower()
+    if name.startswith('$') and name.endswith('_name;'):
+        name = name[1:-6]
+    return name
+
+
+class InventoryLedger:
+    """Applies inventory events to the indexed 'cargo' and 'materials' EDData keys
+    
+    Delta events touch only the entries they name (one EDData commit each), so
+    subscribers see just the changed ids. Cargo and Materials events replace
+    the whole collection and correct any drift.
+    """
+    
+    EVENTS = frozenset({
+        'Cargo', 'Materials',
+        'MarketBuy', 'MarketSell', 'CollectCargo', 'EjectCargo', 'MiningRefined',
+        'CargoDepot', 'BuyDrones', 'SellDrones', 'LaunchDrone', 'MissionCompleted',
+        'MaterialCollected', 'MaterialDiscarded', 'MaterialTrade', 'EngineerCraft',
+        'Synthesis', 'TechnologyBroker',
+    })
+    
+    def __init__(self, ed_data):
+        self.ed_data = ed_data
+    
+    def cargo(self, name, delta, localised=None, stolen=0):
+        """Add delta units of a commodity (negative removes)"""
+        if not name or not delta:
+            return
+        deltas = {'Count': delta}
+        if stolen:
+            deltas['Stolen'] = stolen
+        self.ed_data.adjust_item('cargo', item_key(name), deltas, {
+            'Name': item_key(name), 'Name_Localised': localised, 'Count': 0, 'Stolen': 0,
+        })
+    
+    def material(self, name, delta, category=None, localised=None):
+        """Add delta units of a material (negative removes)"""
+        if not name or not delta:
+            return
+        self.ed_data.adjust_item('materials', item_key(name), {'Count': delta}, {
+            'Name': item_key(name), 'Name_Localised': localised, 'Category': category, 'Count': 0,
+        })
+    
+    def reconcile_cargo(self, inventory):
+        """Replace the cargo collection with a full inventory list"""
+        items = {}
+        for entry in inventory:
+            if not entry.get('Name'):
+                continue
+            key = item_key(entry['Name'])
+            item = items.setdefault(key, {'Name': key, 'Name_Localised': entry.get('Name_Localised'),
+                                          'Count': 0, 'Stolen': 0})
+            # Carga de missão vem em entradas separadas do mesmo item
+            item['Count'] += entry.get('Count', 0)
+            item['Stolen'] += entry.get('Stolen', 0)
+        self.ed_data.set_items('cargo', items.items())
+    
+    def reconcile_materials(self, event):
+        """Replace the materials collection from a Materials event"""
+        items = []
+        for category in ('Raw', 'Manufactured', 'Encoded'):
+            for entry in event.get(category, []):
+                if entry.get('Name'):
+                    key = item_key(entry['Name'])
+                    items.append((key, {'Name': key, 'Name_Localised': entry.get('Name_Localised'),
+                                        'Category': category, 'Count': entry.get('Count', 0)}))
+        self.ed_data.set_items('materials', items)
+    
+    def apply(self, event, journal_dir=None):
+        """Apply one inventory event"""
+        event_type = event.get('event')
+        
+        if event_type == 'Cargo':
+            if event.get('Vessel', 'Ship') != 'Ship':
+                return  # carga do SRV não é o porão da nave
+            inventory = event.get('Inventory')
+            if inventory is None and journal_dir:
+                inventory = self.read_cargo_file(journal_dir, event.get('timestamp'))
+            if inventory is not None:
+                self.reconcile_cargo(inventory)
+        
+        elif event_type == 'Materials':
+            self.reconcile_materials(event)
+        
+        elif event_type == 'MarketBuy':
+            self.cargo(event.get('Type'), event.get('Count', 0), event.get('Type_Localised'))
+        
+        elif event_type == 'MarketSell':
+            self.cargo(event.get('Type'), -event.get('Count', 0),
+                       stolen=-event.get('Count', 0) if event.get('StolenGoods') else 0)
+        
+        elif event_type == 'CollectCargo':
+            self.cargo(event.get('Type'), 1, event.get('Type_Localised'),
+                       stolen=1 if event.get('Stolen') else 0)
+        
+        elif event_type == 'EjectCargo':
+            self.cargo(event.get('Type'), -event.get('Count', 0))
+        
+        elif event_type == 'MiningRefined':
+            self.cargo(event.get('Type'), 1, event.get('Type_Localised'))
+        
+        elif event_type == 'CargoDepot':
+            count = event.get('Count', 0)
+            if event.get('UpdateType') == 'Collect':
+                self.cargo(event.get('CargoType'), count, event.get('CargoType_Localised'))
+            elif event.get('UpdateType') == 'Deliver':
+                self.cargo(event.get('CargoType'), -count)
+        
+        elif event_type == 'BuyDrones':
+            self.cargo('drones', event.get('Count', 0), 'Limpet')
+        
+        elif event_type == 'SellDrones':
+            self.cargo('drones', -event.get('Count', 0))
+        
+        elif event_type == 'LaunchDrone':
+            self.cargo('drones', -1)
+        
+        elif event_type == 'MissionCompleted':
+            # Missão de entrega: a carga sai do porão
+            if event.get('Commodity') and event.get('Count'):
+                self.cargo(event['Commodity'], -event['Count'])
+            for reward in event.get('CommodityReward', []):
+                self.cargo(reward.get('Name'), reward.get('Count', 0), reward.get('Name_Localised'))
+            for reward in event.get('MaterialsReward', []):
+                self.material(reward.get('Name'), reward.get('Count', 0), reward.get('Category'),
+                              reward.get('Name_Localised'))
+        
+        elif event_type == 'MaterialCollected':
+            self.material(event.get('Name'), event.get('Count', 0), event.get('Category'),
+                          event.get('Name_Localised'))
+        
+        elif event_type == 'MaterialDiscarded':
+            self.material(event.get('Name'), -event.get('Count', 0))
+        
+        elif event_type == 'MaterialTrade':
+            paid = event.get('Paid') or {}
+            received = event.get('Received') or {}
+            self.material(paid.get('Material'), -paid.get('Quantity', 0))
+            self.material(received.get('Material'), received.get('Quantity', 0),
+                          received.get('Category'), received.get('Material_Localised'))
+        
+        elif event_type in ('EngineerCraft', 'TechnologyBroker', 'Synthesis'):
+            ingredients = event.get('Ingredients') or event.get('Materials') or []
+            if isinstance(ingredients, dict):
+                ingredients = [{'Name': name, 'Count': count} for name, count in ingredients.items()]
+            for ingredient in ingredients:
+                self.material(ingredient.get('Name'), -ingredient.get('Count', 0))
+            for commodity in event.get('Commodities', []):
+                self.cargo(commodity.get('Name'), -commodity.get('Count', 0))
+    
+    def read_cargo_file(self, journal_dir, timestamp):
+        """Inventory from Cargo.json, if it was written for this Cargo event"""
+        try:
+            with open(journal_dir / 'Cargo.json', 'r', encoding='utf-8') as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if content.get('timestamp') != timestamp or content.get('Vessel', 'Ship') != 'Ship':
+            return None
+        return content.get('Inventory')
@@ -1,32 +1,78 @@
-
-elif event_type == 'ModuleInfo':
-    modules = []
-    for mod in event.get("Modules", []):
-        modules.append({
-            "slot": mod.get("Slot"),
-            "item": mod.get("Item"),
-            "on": mod.get("On"),
-            "priority": mod.get("Priority"),
-            "health": mod.get("Health")
-        })
-    self.ed_data.update("modules", modules)
 #!/usr/bin/env python3
 """
 Elite Dangerous Journal Monitor
 Monitors journal files for game events and updates game state
 """
 
-import json
 import time
 from pathlib import Path
 import os
 
+import config
+from event_buffer import RecentEvents
+from event_dedup import DedupWindow
+from event_records import make_record
+from fleet_cache import FleetCache, commander_key, module_list, read_modules_file
+from inventory_ledger import InventoryLedger
+from journal_reader import (MappedJournalReader, LIVE_PATTERN, decode_line, has_journals,
+                            is_archive, iter_archive_lines, journal_sort_key, list_journals, peek_event)
+from profiling import profiler
+from session_stats import CREDIT_EVENTS, SessionStats, credit_change
+from spatial_index import SpatialIndex
+from system_cache import SystemCache
+from timeseries import TimeSeriesStore
+
+
+def journal_directory_candidates():
+    """Default journal locations per platform"""
+    return [
+        # Windows
+        Path.home() / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
+        Path(os.getenv('USERPROFILE', '')) / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
+        # Linux (Steam)
+        Path.home() / '.local' / 'share' / 'Steam' / 'steamapps' / 'compatdata' / '359320' / 'pfx' / 'drive_c' / 'users' / 'steamuser' / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
+        # Linux (Proton)
+        Path.home() / '.steam' / 'steam' / 'steamapps' / 'compatdata' / '359320' / 'pfx' / 'drive_c' / 'users' / 'steamuser' / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
+        # macOS
+        Path.home() / 'Library' / 'Application Support' / 'Frontier Developments' / 'Elite Dangerous',
+    ]
+
+
+def detect_journal_directory(use_cache=True):
+    """Find the journal directory, trying the one remembered from the last run first
+    
+    The remembered directory is revalidated with a single stat; otherwise the
+    candidates are probed until the first one holding a journal.
+    """
+    if use_cache:
+        cached = config.load_settings().get('journal_dir')
+        if cached and os.path.isdir(cached):
+            return Path(cached)
+    
+    for path in journal_directory_candidates():
+        if path.is_dir() and has_journals(path):
+            config.save_settings(journal_dir=str(path))
+            return path
+    
+    return None
+
 
 class JournalMonitor:
     """Monitors Elite Dangerous journal files for updates"""
     
-    def __init__(self, ed_data, journal_dir=None, allow_start_without_files=True):
+    # Eventos tratados por process_event; as demais linhas não são decodificadas
+    HANDLED_EVENTS = frozenset({
+        'LoadGame', 'Commander', 'Location', 'FSDJump', 'Scan', 'FSSDiscoveryScan',
+        'Docked', 'Undocked', 'Touchdown', 'Liftoff', 'ApproachSettlement',
+        'LaunchSRV', 'DockSRV', 'LaunchFighter', 'SupercruiseEntry',
+        'SupercruiseExit', 'StartJump', 'LandingGear', 'Shields',
+        'Loadout', 'ModuleInfo', 'FuelScoop', 'SAAScanComplete',
+        'HullDamage',
+    }) | InventoryLedger.EVENTS | FleetCache.EVENTS | CREDIT_EVENTS
+    
+    def __init__(self, ed_data, journal_dir=None, allow_start_without_files=True, plugins=None):
         self.ed_data = ed_data
+        self.plugins = plugins
         
         # Garante que journal_dir seja Path ou None
         if journal_dir:
@@ -37,7 +83,20 @@ class JournalMonitor:
         self.running = True
         self.last_file = None
         self.last_position = 0
+        self.backfilled = False
         self.status_callback = None
+        self.system_cache = SystemCache()
+        self.recent_events = RecentEvents()
+        self.stats = SessionStats()
+        self.visited_systems = SpatialIndex()
+        self.backfill_visits = None
+        self.series = TimeSeriesStore()
+        self.inventory = InventoryLedger(ed_data)
+        self.dedup = DedupWindow()
+        self.fleet = FleetCache()
+        self.ship_id = None
+        self.credits = None
+        self.system_address = None
         self.allow_start_without_files = allow_start_without_files
         
         if not self.journal_dir:
@@ -48,33 +107,24 @@ class JournalMonitor:
     
     def find_journal_directory(self):
         """Find the Elite Dangerous journal directory"""
-        possible_paths = [
-            # Windows
-            Path.home() / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
-            Path(os.getenv('USERPROFILE', '')) / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
-            # Linux (Steam)
-            Path.home() / '.local' / 'share' / 'Steam' / 'steamapps' / 'compatdata' / '359320' / 'pfx' / 'drive_c' / 'users' / 'steamuser' / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
-            # Linux (Proton)
-            Path.home() / '.steam' / 'steam' / 'steamapps' / 'compatdata' / '359320' / 'pfx' / 'drive_c' / 'users' / 'steamuser' / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
-            # macOS
-            Path.home() / 'Library' / 'Application Support' / 'Frontier Developments' / 'Elite Dangerous',
-        ]
-        
-        for path in possible_paths:
-            if path.exists() and list(path.glob('Journal.*.log')):
-                return path
-        
-        return None
+        return detect_journal_directory()
     
     def set_journal_directory(self, path):
         """Manually set the journal directory"""
+        previous = self.journal_dir
         if path:
             self.journal_dir = Path(path) if not isinstance(path, Path) else path
         else:
             self.journal_dir = None
         
+        # Reabrir o mesmo diretório relê linhas já processadas: a janela de
+        # deduplicação as descarta. Outro diretório tem outro histórico.
+        if self.journal_dir != previous:
+            self.dedup.reset()
+        
         self.last_file = None
         self.last_position = 0
+        self.backfilled = False
         
         if self.journal_dir and self.journal_dir.exists():
             self.ed_data.update('waiting_for_files', False)
@@ -88,20 +138,164 @@ class JournalMonitor:
         if not self.journal_dir or not self.journal_dir.exists():
             return None
         
-        journals = list(self.journal_dir.glob('Journal.*.log'))
+        # Apenas o journal descompactado é acompanhado; arquivos .gz/.zst são histórico
+        journals = list(self.journal_dir.glob(LIVE_PATTERN))
         if not journals:
             return None
         
-        return max(journals, key=lambda p: p.stat().st_mtime)
+        # Ordem pela data/parte no nome (nos dois formatos), não pelo mtime
+        return max(journals, key=journal_sort_key)
+    
+    def read_journal(self, path, position=0):
+        """Process every complete line of a journal from position, returning the new position"""
+        if is_archive(path):
+            offset = 0
+            for line in iter_archive_lines(path):
+                self.handle_line(line, offset)
+                offset += len(line)
+            return position
+        
+        started = time.perf_counter() if profiler.enabled else None
+        reader = MappedJournalReader(path, position)
+        for line in reader:
+            self.handle_line(line, reader.position - len(line) - 1)
+        if started is not None and reader.position != position:
+            profiler.record('monitor', 'read_journal', time.perf_counter() - started)
+        return reader.position
+    
+    def rotate_to(self, new_journal):
+        """Drain the previous journal and any skipped parts before switching to a new one"""
+        if self.last_file is not None:
+            last, new = journal_sort_key(self.last_file), journal_sort_key(new_journal)
+            pending = [self.last_file]
+            pending += sorted((p for p in self.journal_dir.glob(LIVE_PATTERN)
+                               if last < journal_sort_key(p) < new),
+                              key=journal_sort_key)
+            position = self.last_position
+            for path in pending:
+                try:
+                    self.read_journal(path, position)
+                except OSError as e:
+                    print(f"Erro ao ler {path.name}: {e}")
+                position = 0
+        
+        self.last_file = new_journal
+        self.last_position = 0
+    
+    def backfill(self, current_journal):
+        """Process all journals older than the current one, oldest first"""
+        current = journal_sort_key(current_journal)
+        older = [p for p in list_journals(self.journal_dir)
+                 if journal_sort_key(p) < current]
+        if not older:
+            return
+        
+        print(f"Backfill: processando {len(older)} journals antigos...")
+        self.ed_data.update('status', f'Processando histórico ({len(older)} journals)...')
+        self.backfill_visits = []
+        try:
+            for path in older:
+                if not self.running:
+                    break
+                self.read_journal(path)
+        finally:
+            self.visited_systems.bulk_add(self.backfill_visits)
+            self.backfill_visits = None
+    
+    def handle_line(self, line, offset=None):
+        """Prefilter a raw journal line and process it if its event is handled
+        
+        offset is the line's position in its journal; lines read with an
+        offset are checked against the deduplication window.
+        """
+        timestamp, event_type = peek_event(line)
+        if event_type is None:
+            return
+        if offset is not None and timestamp is not None and self.dedup.seen(timestamp, event_type, offset):
+            return
+        
+        handled = event_type in self.HANDLED_EVENTS
+        # Plugins só recebem eventos ao vivo, não o histórico do backfill
+        publish = (self.plugins is not None and self.backfill_visits is None
+                   and self.plugins.wants(event_type))
+        
+        details = None
+        if handled or publish:
+            if profiler.enabled:
+                started = time.perf_counter()
+                try:
+                    event = decode_line(line)
+                except ValueError:
+                    return
+                decoded = time.perf_counter()
+                profiler.record('decode', event_type, decoded - started)
+                if handled:
+                    self.process_event(event)
+                    profiler.record('event', event_type, time.perf_counter() - decoded)
+            else:
+                try:
+                    event = decode_line(line)
+                except ValueError:
+                    return
+                if handled:
+                    self.process_event(event)
+            
+            if publish:
+                self.plugins.publish_event(event_type, event)
+            if handled:
+                # Registro compacto no lugar do dict decodificado
+                details = make_record(event)
+        
+        self.recent_events.append(timestamp, event_type, details)
+    
+    def remember_current_system(self):
+        """Store the current system's bodies and stations in the system cache"""
+        if self.system_address is None:
+            return
+        bodies = self.ed_data.get_items('system_bodies')
+        stations = self.ed_data.get_items('system_stations')
+        if bodies or stations:
+            self.system_cache.put(self.system_address, bodies, stations)
+    
+    def switch_ship(self, ship_id, clear=False):
+        """Make ship_id current, showing its cached modules (or none if clear and unknown)"""
+        if ship_id is None:
+            return
+        self.ship_id = ship_id
+        entry = self.fleet.get(ship_id)
+        if entry is not None and entry.get('modules') is not None:
+            self.ed_data.update('modules', entry['modules'])
+        elif clear:
+            self.ed_data.update('modules', [])
+    
+    def set_commander(self, event):
+        """Switch the fleet cache to the commander of a LoadGame/Commander event"""
+        commander = commander_key(event)
+        if commander != self.fleet.commander:
+            self.fleet.set_commander(commander)
+            # Os módulos exibidos são de uma nave de outro comandante
+            if self.ship_id is not None:
+                self.ed_data.update('modules', [])
+            self.ship_id = None
     
     def process_event(self, event):
         """Process a journal event and update game state"""
         event_type = event.get('event')
         
-        if event_type == 'LoadGame':
+        if event_type == 'Commander':
+            self.set_commander(event)
+            self.ed_data.update('commander', event.get('Name', 'Unknown'))
+        
+        elif event_type == 'LoadGame':
+            self.set_commander(event)
             self.ed_data.update('commander', event.get('Commander', 'Unknown'))
             self.ed_data.update('ship', event.get('Ship', 'Unknown'))
-            self.ed_data.update('credits', event.get('Credits', 0))
+            self.credits = event.get('Credits', 0)
+            self.ed_data.update('credits', self.credits)
+            self.stats.start_session(event.get('timestamp'), event.get('Credits', 0))
+            self.series.record('credits', event.get('timestamp'), event.get('Credits'))
+            self.series.record('fuel', event.get('timestamp'), event.get('FuelLevel'))
+            self.switch_ship(event.get('ShipID'))
         
         elif event_type == 'Location' or event_type == 'FSDJump':
             self.ed_data.update('system', event.get('StarSystem', 'Unknown'))
@@ -112,23 +306,41 @@ class JournalMonitor:
             }
             self.ed_data.update('location', location)
             
-            # Limpa listas ao mudar de sistema
-            self.ed_data.update('system_bodies', [])
-            self.ed_data.update('system_stations', [])
+            if event_type == 'FSDJump':
+                self.stats.record_jump(event.get('StarPos'), event.get('FuelUsed'))
+                self.series.record('fuel', event.get('timestamp'), event.get('FuelLevel'))
+            else:
+                self.stats.record_position(event.get('StarPos'))
+            
+            # Durante o backfill o índice espacial é construído em lote no final
+            if self.backfill_visits is not None:
+                self.backfill_visits.append((event.get('StarSystem'), event.get('StarPos')))
+            else:
+                self.visited_systems.add(event.get('StarSystem'), event.get('StarPos'))
+            
+            # Guarda o sistema anterior e restaura o novo do cache (ou limpa)
+            self.remember_current_system()
+            self.system_address = event.get('SystemAddress')
+            cached = None
+            if self.system_address is not None:
+                cached = self.system_cache.get(self.system_address)
+            self.ed_data.set_items('system_bodies', cached['bodies'] if cached else ())
+            self.ed_data.set_items('system_stations', cached['stations'] if cached else ())
             
             # Captura estações do sistema no evento FSDJump
-            if 'Stations' in event:
-                stations = []
-                for station in event.get('Stations', []):
-                    stations.append({
+            for station in event.get('Stations', []):
+                self.ed_data.merge_item(
+                    'system_stations',
+                    station.get('MarketID') or station.get('Name'),
+                    {
                         'name': station.get('Name'),
                         'type': station.get('StationType'),
                         'services': station.get('StationServices', []),
                         'distance': station.get('DistFromStarLS')
                     })
-                self.ed_data.update('system_stations', stations)
             
-                # Captura coordenadas planetárias se disponíveis (inclui SRV)            if 'Latitude' in event and 'Longitude' in event:
+            # Captura coordenadas planetárias se disponíveis (inclui SRV)
+            if 'Latitude' in event and 'Longitude' in event:
                 coords = {
                     'latitude': event.get('Latitude'),
                     'longitude': event.get('Longitude'),
@@ -138,6 +350,7 @@ class JournalMonitor:
                     'on_surface': True
                 }
                 self.ed_data.update('planetary_coordinates', coords)
+                self.series.record('altitude', event.get('timestamp'), event.get('Altitude'))
         
         elif event_type == 'Scan':
             body_info = {
@@ -155,13 +368,16 @@ class JournalMonitor:
                 'rings': event.get('Rings', [])
             }
             
-            # Cria nova lista ao invés de modificar cópia
-            current_bodies = self.ed_data.get_all().get('system_bodies', [])
-            body_names = [b['name'] for b in current_bodies if b.get('name')]
-            
-            if body_info['name'] and body_info['name'] not in body_names:
-                updated_bodies = current_bodies + [body_info]
-                self.ed_data.update('system_bodies', updated_bodies)
+            # Re-scans mesclam dados mais completos na entrada existente
+            body_id = event.get('BodyID')
+            if body_id is None:
+                body_id = body_info['name']
+            if body_id is not None and body_info['name']:
+                if self.ed_data.merge_item('system_bodies', body_id, body_info):
+                    self.stats.record_scan()
+        
+        elif event_type == 'SAAScanComplete':
+            self.stats.record_mapped()
         
         elif event_type == 'FSSDiscoveryScan':
             bodies_count = event.get('BodyCount', 0)
@@ -202,6 +418,7 @@ class JournalMonitor:
             })
         
         elif event_type == 'Touchdown':
+            self.series.record('altitude', event.get('timestamp'), 0)
             coords = {
                 'latitude': event.get('Latitude'),
                 'longitude': event.get('Longitude'),
@@ -342,24 +559,57 @@ class JournalMonitor:
         
         elif event_type == 'Loadout':
             self.ed_data.update('ship', event.get('Ship', 'Unknown'))
-            modules = []
-            for mod in event.get("Modules", []):
-                modules.append({
-                    "slot": mod.get("Slot"),
-                    "item": mod.get("Item"),
-                    "on": mod.get("On"),
-                    "priority": mod.get("Priority"),
-                    "health": mod.get("Health")
-                })
-            self.ed_data.update("modules", modules)
+            self.series.record('hull', event.get('timestamp'), event.get('HullHealth'))
+            entry = self.fleet.put_loadout(event)
+            self.ship_id = event.get('ShipID')
+            self.ed_data.update("modules", entry['modules'] if entry else module_list(event))
+        
+        elif event_type == 'ModuleInfo':
+            # O jogo grava a lista em ModulesInfo.json; o evento em si não traz 'Modules'
+            modules = event.get('Modules')
+            if modules is None:
+                modules = read_modules_file(self.journal_dir, event.get('timestamp'))
+            if modules is not None:
+                # ModulesInfo não tem integridade nem estado: mantém os do último Loadout
+                previous = {m.get('slot'): m for m in self.ed_data.get_all().get('modules') or []}
+                merged = module_list({'Modules': modules})
+                for module in merged:
+                    old = previous.get(module['slot']) or {}
+                    for field in ('on', 'health'):
+                        if module[field] is None:
+                            module[field] = old.get(field)
+                self.ed_data.update('modules', merged)
+                self.fleet.put_modules(self.ship_id, merged)
+        
+        elif event_type in FleetCache.EVENTS:
+            data = self.ed_data.get_all()
+            self.fleet.apply(event, data.get('system'), data.get('station'))
+            if event_type == 'ShipyardSwap':
+                # Troca imediata a partir do cache, sem esperar o próximo Loadout
+                self.ed_data.update('ship', event.get('ShipType', 'Unknown'))
+                self.switch_ship(event.get('ShipID'), clear=True)
         
         elif event_type == 'FuelScoop':
             fuel = event.get('Total', 0)
             self.ed_data.update('fuel', {'current': fuel})
+            self.series.record('fuel', event.get('timestamp'), fuel)
+        
+        elif event_type == 'HullDamage':
+            if event.get('PlayerPilot', True):
+                self.series.record('hull', event.get('timestamp'), event.get('Health'))
+        
+        elif event_type in InventoryLedger.EVENTS:
+            self.inventory.apply(event, self.journal_dir)
+        
+        # Saldo mantido por deltas entre um LoadGame e outro
+        change = credit_change(event)
+        if change and self.credits is not None:
+            self.credits += change
+            self.ed_data.update('credits', self.credits)
+            self.stats.record_credits(self.credits)
+            self.series.record('credits', event.get('timestamp'), self.credits)
         
-        elif event_type == 'Cargo':
-            inventory = event.get('Inventory', [])
-            self.ed_data.update('cargo', inventory)
+        self.stats.observe(event.get('timestamp'))
     
     def monitor(self):
         """Main monitoring loop"""
@@ -396,28 +646,27 @@ class JournalMonitor:
                     self.ed_data.update('waiting_for_files', False)
                     print(f"Journal file found: {current_journal.name}")
                 
+                if config.BACKFILL and not self.backfilled:
+                    self.backfilled = True
+                    self.backfill(current_journal)
+                
                 if current_journal != self.last_file:
-                    self.last_file = current_journal
-                    self.last_position = 0
+                    self.rotate_to(current_journal)
                     self.ed_data.update('status', f'Monitorando: {current_journal.name}')
                     self.ed_data.update('journal_file', current_journal.name)
                     print(f"Reading journal: {current_journal.name}")
                 
-                with open(current_journal, 'r', encoding='utf-8') as f:
-                    f.seek(self.last_position)
-                    lines = f.readlines()
-                    self.last_position = f.tell()
-                    
-                    for line in lines:
-                        try:
-                            event = json.loads(line)
-                            self.process_event(event)
-                        except json.JSONDecodeError:
-                            pass
+                self.last_position = self.read_journal(current_journal, self.last_position)
+                self.system_cache.flush()
+                self.fleet.flush()
                 
                 time.sleep(1)
-                
+            
             except Exception as e:
                 print(f"Error monitoring journal: {e}")
                 self.ed_data.update('status', f'Erro: {str(e)}')
                 time.sleep(5)
+        
+        self.remember_current_system()
+        self.system_cache.flush()
+        self.fleet.flush()
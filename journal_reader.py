@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Journal Reader
+Memory-mapped line scanner with a byte-level event prefilter
+"""
+
+import gzip
+import io
+import json
+import mmap
+import os
+import re
+from datetime import datetime
+
+import config
+
+try:
+    # Python 3.14+
+    from compression import zstd as _stdlib_zstd
+except ImportError:
+    _stdlib_zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Journal atual (acompanhado em tempo real) e arquivos históricos compactados
+LIVE_PATTERN = 'Journal.*.log'
+ARCHIVE_SUFFIXES = ('.gz', '.zst')
+JOURNAL_PATTERNS = (LIVE_PATTERN,) + tuple(LIVE_PATTERN + suffix for suffix in ARCHIVE_SUFFIXES)
+
+# Journal.YYYY-MM-DDTHHMMSS.NN.log (atual) e Journal.YYMMDDHHMMSS.NN.log (formato antigo)
+JOURNAL_NAME_RE = re.compile(r'^Journal\.(?:(\d{4})-(\d\d)-(\d\d)T(\d{6})|(\d{12}))\.(\d+)\.log$')
+
+EVENT_RE = re.compile(rb'"event"\s*:\s*"([^"]*)"')
+TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*"([^"]*)"')
+
+
+def peek_event(line):
+    """Return (timestamp, event) of a raw journal line without decoding all of it"""
+    event = EVENT_RE.search(line)
+    if not event:
+        return None, None
+    timestamp = TIMESTAMP_RE.search(line)
+    return (timestamp.group(1).decode('ascii', 'replace') if timestamp else None,
+            event.group(1).decode('utf-8', 'replace'))
+
+
+def is_archive(path):
+    """Whether a journal path is a compressed, read-only archive"""
+    return path.suffix in ARCHIVE_SUFFIXES
+
+
+def journal_name(path):
+    """Journal file name without any compression suffix, used for ordering"""
+    return path.stem if is_archive(path) else path.name
+
+
+def journal_sort_key(path):
+    """Chronological ordering key of a journal: (start time as YYYYMMDDHHMMSS, part, name)
+    
+    Both filename formats are parsed; names that match neither fall back to
+    the file's mtime.
+    """
+    name = journal_name(path)
+    match = JOURNAL_NAME_RE.match(name)
+    if match:
+        year, month, day, clock, short, part = match.groups()
+        stamp = f"{year}{month}{day}{clock}" if year else f"20{short}"
+        return stamp, int(part), name
+    try:
+        stamp = datetime.fromtimestamp(path.stat().st_mtime).strftime('%Y%m%d%H%M%S')
+    except OSError:
+        stamp = ''
+    return stamp, 0, name
+
+
+def list_journals(directory):
+    """All journals in a directory, live and archived, oldest first
+    
+    When a journal exists both plain and compressed, the plain file wins.
+    """
+    journals = {}
+    for pattern in JOURNAL_PATTERNS:
+        for path in directory.glob(pattern):
+            name = journal_name(path)
+            if name not in journals or is_archive(journals[name]):
+                journals[name] = path
+    return sorted(journals.values(), key=journal_sort_key)
+
+
+def has_journals(directory):
+    """Whether a directory holds any journal, stopping at the first match"""
+    return any(next(directory.glob(pattern), None) is not None for pattern in JOURNAL_PATTERNS)
+
+
+def _open_archive(path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rb')
+    if _stdlib_zstd is not None:
+        return _stdlib_zstd.open(path, 'rb')
+    if zstandard is not None:
+        raw = open(path, 'rb')
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True, closefd=True))
+    return None
+
+
+def iter_archive_lines(path):
+    """Stream the lines of a compressed journal, decompressing incrementally"""
+    stream = _open_archive(path)
+    if stream is None:
+        print(f"Ignorando {path.name}: instale 'zstandard' para ler journals .zst")
+        return
+    with stream:
+        for line in stream:
+            yield line
+
+
+def parse_event_time(timestamp):
+    """Convert a journal ISO-8601 timestamp to epoch seconds (None if invalid)"""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def decode_line(line):
+    """Decode a raw journal line (bytes or memoryview) into an event dict"""
+    return json.loads(str(line, 'utf-8'))
+
+
+class MappedJournalReader:
+    """Iterates the complete lines of a journal file through a sliding mmap window
+    
+    Each line is yielded as a zero-copy memoryview that is only valid until the
+    next iteration. `position` always points just past the last line yielded,
+    so an incomplete trailing line is left for the next read.
+    """
+    
+    def __init__(self, path, position=0, window_size=None):
+        self.path = path
+        self.position = position
+        self.window_size = window_size or config.READ_WINDOW_SIZE
+    
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            window = self.window_size
+            
+            while self.position < size:
+                base = self.position - self.position % mmap.ALLOCATIONGRANULARITY
+                length = min(size - base, self.position - base + window)
+                start = cur = self.position - base
+                
+                with mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ, offset=base) as mm:
+                    view = memoryview(mm)
+                    try:
+                        while True:
+                            end = mm.find(b'\n', cur)
+                            if end == -1:
+                                break
+                            line = view[cur:end]
+                            cur = end + 1
+                            self.position = base + cur
+                            try:
+                                yield line
+                            finally:
+                                line.release()
+                    finally:
+                        view.release()
+                
+                if cur == start:
+                    # Nenhuma linha completa na janela
+                    if base + length >= size:
+                        break
+                    window *= 2
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Journal Replay
+Replays a recorded journal directory into another directory in (scaled) real time
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from journal_reader import (is_archive, iter_archive_lines, journal_name, list_journals,
+                            parse_event_time, peek_event)
+
+
+# Segundos sem progresso do monitor após o fim do replay antes de desistir da medição
+DRAIN_TIMEOUT = 10.0
+
+# Eventos que acompanham a regravação de um arquivo companheiro pelo jogo
+COMPANION_FILES = {
+    'Cargo': 'Cargo.json',
+    'Market': 'Market.json',
+    'Outfitting': 'Outfitting.json',
+    'Shipyard': 'Shipyard.json',
+    'ModuleInfo': 'ModulesInfo.json',
+    'NavRoute': 'NavRoute.json',
+    'NavRouteClear': 'NavRoute.json',
+    'ShipLocker': 'ShipLocker.json',
+    'Backpack': 'Backpack.json',
+    'FCMaterials': 'FCMaterials.json',
+}
+
+
+def iter_source_lines(path):
+    """Raw lines of a recorded journal, plain or compressed"""
+    if is_archive(path):
+        yield from iter_archive_lines(path)
+        return
+    with open(path, 'rb') as f:
+        yield from f
+
+
+class JournalReplay:
+    """Writes the lines of recorded journals into an output directory"""
+    
+    def __init__(self, source, output, speed=1.0, max_gap=60.0):
+        self.source = Path(source)
+        self.output = Path(output)
+        self.speed = speed
+        self.max_gap = max_gap
+        self.running = True
+        self.lines_written = 0
+        self.write_times = {}      # (journal, offset da linha) -> instante da escrita
+    
+    def rewrite_companion(self, event_type, timestamp):
+        """Copy a companion file from the source, stamped with the event time"""
+        name = COMPANION_FILES.get(event_type)
+        if not name or not (self.source / name).exists():
+            return
+        try:
+            with open(self.source / name, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            content['timestamp'] = timestamp
+        except (OSError, ValueError):
+            return
+        tmp_path = self.output / (name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(content, f)
+        tmp_path.replace(self.output / name)
+    
+    def run(self):
+        """Replay every journal of the source directory, oldest first"""
+        self.output.mkdir(parents=True, exist_ok=True)
+        if (self.source / 'Status.json').exists():
+            shutil.copyfile(self.source / 'Status.json', self.output / 'Status.json')
+        
+        previous = None
+        for path in list_journals(self.source):
+            if not self.running:
+                break
+            print(f"Replay: {path.name}")
+            name = journal_name(path)
+            with open(self.output / name, 'ab') as out:
+                for line in iter_source_lines(path):
+                    if not self.running:
+                        break
+                    timestamp, event_type = peek_event(line)
+                    if event_type is None:
+                        continue
+                    
+                    event_time = parse_event_time(timestamp)
+                    if self.speed and previous is not None and event_time is not None:
+                        gap = min(max(event_time - previous, 0.0), self.max_gap)
+                        if gap:
+                            time.sleep(gap / self.speed)
+                    if event_time is not None:
+                        previous = event_time
+                    
+                    offset = out.tell()
+                    out.write(line.rstrip(b'\r\n') + b'\r\n')
+                    out.flush()
+                    self.write_times[(name, offset)] = time.perf_counter()
+                    self.lines_written += 1
+                    self.rewrite_companion(event_type, timestamp)
+
+
+def measure_latency(replay, cache_dir, timeout=DRAIN_TIMEOUT):
+    """Tail the replay output with the real JournalMonitor and collect write-to-state latencies
+    
+    Lines are matched by (journal, offset), so lines the monitor skips or
+    drops do not shift the latencies of the others. The monitor backfills the
+    journals written before it started and keeps its caches (fleet.json,
+    systems/) in `cache_dir`, so the measurement never touches the user's
+    ED_CACHE_DIR. Returns (latencies, lines never processed).
+    """
+    import config
+    from ed_data import EDData
+    from journal_monitor import JournalMonitor
+    
+    config.CACHE_DIR = Path(cache_dir)
+    config.SETTINGS_FILE = config.CACHE_DIR / 'settings.json'
+    # Com vários journals o monitor começaria no mais novo: o backfill lê os anteriores
+    config.BACKFILL = True
+    
+    class TimedMonitor(JournalMonitor):
+        """JournalMonitor that records when it finished handling each (journal, offset)"""
+        
+        def __init__(self, *args, **kwargs):
+            self.handled = {}
+            self.path = None
+            super().__init__(*args, **kwargs)
+        
+        def read_journal(self, path, position=0):
+            self.path = path
+            return super().read_journal(path, position)
+        
+        def handle_line(self, line, offset=None):
+            super().handle_line(line, offset)
+            self.handled[(journal_name(self.path), offset)] = time.perf_counter()
+    
+    while replay.running and not replay.lines_written:
+        time.sleep(0.01)
+    
+    monitor = TimedMonitor(EDData(), replay.output)
+    threading.Thread(target=monitor.monitor, daemon=True).start()
+    
+    # Espera o monitor alcançar a escrita; sem progresso por `timeout` segundos, desiste
+    progress, last_change = 0, time.perf_counter()
+    while replay.running or len(monitor.handled) < replay.lines_written:
+        time.sleep(0.05)
+        if len(monitor.handled) != progress:
+            progress, last_change = len(monitor.handled), time.perf_counter()
+        elif not replay.running and time.perf_counter() - last_change > timeout:
+            break
+    monitor.running = False
+    
+    latencies = []
+    handled = dict(monitor.handled)
+    for key, written in list(replay.write_times.items()):
+        if key in handled:
+            latencies.append(handled[key] - written)
+    return latencies, len(replay.write_times) - len(latencies)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay de journals do Elite Dangerous')
+    parser.add_argument('source', help='diretório com os journals gravados')
+    parser.add_argument('--output', help='diretório de saída (padrão: diretório temporário)')
+    parser.add_argument('--speed', default='1',
+                        help='fator de velocidade (1, 10, ...) ou "max" para sem espera')
+    parser.add_argument('--max-gap', type=float, default=60.0,
+                        help='maior pausa entre eventos, em segundos de jogo (padrão 60)')
+    parser.add_argument('--measure', action='store_true',
+                        help='acompanha a saída com o JournalMonitor e mede a latência')
+    args = parser.parse_args()
+    
+    speed = 0 if args.speed == 'max' else float(args.speed)
+    output = args.output or tempfile.mkdtemp(prefix='ed_replay_')
+    print(f"Gravando journals em: {output}")
+    
+    replay = JournalReplay(args.source, output, speed, args.max_gap)
+    results = {}
+    measurer = None
+    if args.measure:
+        cache_dir = tempfile.mkdtemp(prefix='ed_replay_cache_')
+        measurer = threading.Thread(
+            target=lambda: results.update(latencies=measure_latency(replay, cache_dir)))
+        measurer.start()
+    
+    try:
+        replay.run()
+    except KeyboardInterrupt:
+        print("Replay interrompido")
+    finally:
+        replay.running = False
+    
+    print(f"{replay.lines_written} eventos gravados")
+    if measurer:
+        measurer.join()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        latencies, missing = results.get('latencies', ([], 0))
+        latencies = [t * 1000 for t in latencies]
+        if missing:
+            print(f"Aviso: {missing} linhas não foram processadas pelo monitor "
+                  f"em {DRAIN_TIMEOUT:.0f} s após o fim do replay")
+        if latencies:
+            print(f"Latência escrita -> estado ({len(latencies)} eventos): "
+                  f"p50 {statistics.median(latencies):.1f} ms, "
+                  f"p95 {percentile(latencies, 0.95):.1f} ms, "
+                  f"p99 {percentile(latencies, 0.99):.1f} ms, "
+                  f"máx {max(latencies):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Server Load Test
+Simulates many dashboard clients against a local server fed by a synthetic journal
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+POLL_INTERVAL = 0.5  # Mesmo intervalo do dashboard
+STREAM_INTERVAL = 0.1
+
+
+def serve(port, journal_dir):
+    """Run EDData, JournalMonitor and ThreadedHTTPServer without the GUI"""
+    from ed_data import EDData
+    from http_server import ThreadedHTTPServer, EDRequestHandler
+    from journal_monitor import JournalMonitor
+    from memory_usage import start_tracing
+    
+    start_tracing()
+    ed_data = EDData()
+    monitor = JournalMonitor(ed_data, journal_dir)
+    threading.Thread(target=monitor.monitor, daemon=True).start()
+    server = ThreadedHTTPServer(('127.0.0.1', port), EDRequestHandler,
+                                ed_data=ed_data, monitor=monitor)
+    server.serve_forever()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentiles(values):
+    if not values:
+        return 'sem amostras'
+    ordered = sorted(values)
+    pick = lambda f: ordered[min(len(ordered) - 1, int(f * len(ordered)))]
+    return (f"p50 {statistics.median(ordered):.1f} ms, p95 {pick(0.95):.1f} ms, "
+            f"p99 {pick(0.99):.1f} ms, máx {ordered[-1]:.1f} ms ({len(ordered)} amostras)")
+
+
+class ProcessSampler:
+    """Samples CPU time and RSS of a process from /proc (Linux) or psutil"""
+    
+    def __init__(self, pid):
+        self.pid = pid
+        self.rss = []
+        try:
+            import psutil
+            self.process = psutil.Process(pid)
+        except ImportError:
+            self.process = None
+    
+    def cpu_seconds(self):
+        if self.process is not None:
+            times = self.process.cpu_times()
+            return times.user + times.system
+        try:
+            with open(f'/proc/{self.pid}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        except (OSError, ValueError, IndexError):
+            return None
+    
+    def sample_rss(self):
+        if self.process is not None:
+            self.rss.append(self.process.memory_info().rss)
+            return
+        try:
+            with open(f'/proc/{self.pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        self.rss.append(int(line.split()[1]) * 1024)
+        except OSError:
+            pass
+
+
+class LoadTest:
+    """Synthetic journal writer plus polling and cursor-following clients"""
+    
+    def __init__(self, base_url, journal_path, clients, stream_clients, rate):
+        self.base_url = base_url
+        self.journal_path = journal_path
+        self.clients = clients
+        self.stream_clients = stream_clients
+        self.rate = rate
+        self.running = True
+        self.lock = threading.Lock()
+        self.write_times = []      # instante de escrita da linha N (seq N + 1)
+        self.marker_times = {}     # valor do marcador FuelScoop -> instante de escrita
+        self.response_ms = {'data': [], 'stream': []}
+        self.event_ms = {'data': [], 'stream': []}
+        self.requests = 0
+        self.bytes = 0
+        self.errors = 0
+    
+    def write_event(self, f, event):
+        event['timestamp'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        f.write(json.dumps(event) + '\r\n')
+        f.flush()
+        self.write_times.append(time.perf_counter())
+    
+    def writer(self):
+        """Append a FuelScoop marker (and a Scan every few events) at the target rate"""
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            marker = 0
+            while self.running:
+                marker += 1
+                self.write_event(f, {'event': 'FuelScoop', 'Scooped': 1.0, 'Total': marker})
+                self.marker_times[marker] = self.write_times[-1]
+                if marker % 5 == 0:
+                    self.write_event(f, {'event': 'Scan', 'BodyName': f'Loadtest {marker}',
+                                         'BodyID': marker, 'PlanetClass': 'Icy body'})
+                time.sleep(1 / self.rate)
+    
+    def fetch(self, path):
+        started = time.perf_counter()
+        with urllib.request.urlopen(self.base_url + path, timeout=10) as response:
+            body = response.read()
+        return body, (time.perf_counter() - started) * 1000
+    
+    def record(self, kind, elapsed, size):
+        with self.lock:
+            self.requests += 1
+            self.bytes += size
+            self.response_ms[kind].append(elapsed)
+    
+    def dashboard_client(self):
+        """Poll /api/data every 500 ms like the dashboard"""
+        last_marker = 0
+        next_poll = time.perf_counter()
+        while self.running:
+            try:
+                body, elapsed = self.fetch('/api/data')
+                self.record('data', elapsed, len(body))
+                marker = int((json.loads(body).get('fuel') or {}).get('current') or 0)
+                if marker > last_marker and marker in self.marker_times:
+                    with self.lock:
+                        self.event_ms['data'].append(
+                            (time.perf_counter() - self.marker_times[marker]) * 1000)
+                    last_marker = marker
+            except (OSError, ValueError):
+                with self.lock:
+                    self.errors += 1
+            next_poll += POLL_INTERVAL
+            time.sleep(max(0.0, next_poll - time.perf_counter()))
+    
+    def stream_client(self):
+        """Follow /api/events/recent with a cursor"""
+        cursor = None
+        while self.running:
+            try:
+                path = '/api/events/recent' + (f'?after={cursor}' if cursor is not None else '')
+                body, elapsed = self.fetch(path)
+                self.record('stream', elapsed, len(body))
+                payload = json.loads(body)
+                now = time.perf_counter()
+                if cursor is not None:
+                    for event in payload['events']:
+                        index = event['seq'] - 1
+                        if index < len(self.write_times):
+                            with self.lock:
+                                self.event_ms['stream'].append((now - self.write_times[index]) * 1000)
+                cursor = payload['last_seq']
+            except (OSError, ValueError, KeyError):
+                with self.lock:
+                    self.errors += 1
+            time.sleep(STREAM_INTERVAL)
+    
+    def start(self):
+        threads = [threading.Thread(target=self.writer, daemon=True)]
+        threads += [threading.Thread(target=self.dashboard_client, daemon=True)
+                    for _ in range(self.clients)]
+        threads += [threading.Thread(target=self.stream_client, daemon=True)
+                    for _ in range(self.stream_clients)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga do servidor Elite Dangerous')
+    parser.add_argument('--clients', type=int, default=20, help='clientes do dashboard (500 ms)')
+    parser.add_argument('--stream-clients', type=int, default=0,
+                        help='clientes acompanhando /api/events/recent')
+    parser.add_argument('--rate', type=float, default=5.0, help='eventos por segundo no journal')
+    parser.add_argument('--bodies', type=int, default=50, help='corpos escaneados no estado inicial')
+    parser.add_argument('--duration', type=float, default=30.0, help='duração em segundos')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--journal-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.port, args.journal_dir)
+        return
+    
+    workdir = Path(tempfile.mkdtemp(prefix='ed_loadtest_'))
+    journal_path = workdir / 'Journal.2025-01-01T000000.01.log'
+    with open(journal_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'timestamp': '2025-01-01T00:00:00Z', 'event': 'LoadGame',
+                            'Commander': 'Loadtest', 'Ship': 'Anaconda', 'Credits': 1}) + '\r\n')
+        for i in range(args.bodies):
+            f.write(json.dumps({'timestamp': '2025-01-01T00:00:00Z', 'event': 'Scan',
+                                'BodyName': f'Body {i}', 'BodyID': -1 - i,
+                                'PlanetClass': 'Rocky body', 'Landable': True}) + '\r\n')
+    initial_lines = 1 + args.bodies
+    
+    port = free_port()
+    env = dict(os.environ, ED_CACHE_DIR=str(workdir / 'cache'))
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve',
+                               '--port', str(port), '--journal-dir', str(workdir)],
+                              env=env, stdout=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(base_url + '/api/data', timeout=1).read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            print("Servidor não respondeu")
+            return
+        
+        test = LoadTest(base_url, journal_path, args.clients, args.stream_clients, args.rate)
+        test.write_times = [0.0] * initial_lines  # linhas iniciais (fora da medição)
+        sampler = ProcessSampler(server.pid)
+        cpu_start, wall_start = sampler.cpu_seconds(), time.perf_counter()
+        
+        print(f"Servidor em {base_url} (pid {server.pid}); {args.clients} clientes, "
+              f"{args.stream_clients} clientes de stream, {args.rate} eventos/s, {args.duration:.0f} s")
+        test.start()
+        deadline = time.perf_counter() + args.duration
+        while time.perf_counter() < deadline:
+            sampler.sample_rss()
+            time.sleep(1)
+        test.running = False
+        
+        wall = time.perf_counter() - wall_start
+        cpu_end = sampler.cpu_seconds()
+        sampler.sample_rss()
+        time.sleep(POLL_INTERVAL)
+        
+        print(f"\nRequisições: {test.requests} ({test.requests / wall:.1f}/s), "
+              f"{test.bytes / wall / 1024:.1f} KiB/s, erros: {test.errors}")
+        print(f"Latência /api/data:           {percentiles(test.response_ms['data'])}")
+        print(f"Evento -> cliente /api/data:  {percentiles(test.event_ms['data'])}")
+        if args.stream_clients:
+            print(f"Latência /api/events/recent:  {percentiles(test.response_ms['stream'])}")
+            print(f"Evento -> cliente stream:     {percentiles(test.event_ms['stream'])}")
+        if cpu_start is not None and cpu_end is not None:
+            print(f"CPU do servidor: {100 * (cpu_end - cpu_start) / wall:.1f}%")
+        if sampler.rss:
+            print(f"RSS do servidor: {sampler.rss[-1] / 2 ** 20:.1f} MiB "
+                  f"(pico {max(sampler.rss) / 2 ** 20:.1f} MiB)")
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
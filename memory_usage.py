@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Server Memory Usage
+Process RSS, tracemalloc allocation sites and container sizes for /debug/memory
+"""
+
+import gc
+import os
+import threading
+import tracemalloc
+
+import config
+
+
+# Quadros ignorados nas estatísticas (o próprio tracemalloc e o import de módulos)
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_previous = None
+_previous_lock = threading.Lock()
+
+
+def start_tracing(frames=None):
+    """Start tracemalloc with config.TRACEMALLOC frames per trace; returns whether it is tracing"""
+    frames = config.TRACEMALLOC if frames is None else frames
+    if frames and not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    return tracemalloc.is_tracing()
+
+
+def rss_bytes():
+    """Resident set size of this process, or None where it cannot be read"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _site(frame):
+    filename = frame.filename
+    if filename.startswith(_BASE_DIR):
+        filename = os.path.relpath(filename, _BASE_DIR)
+    return f"{filename}:{frame.lineno}"
+
+
+def top_allocations(limit=20, group_by='lineno', compare=False):
+    """Largest live allocation sites from a tracemalloc snapshot
+    
+    With compare=True sites are ordered by growth since the previous call
+    instead of by current size. Returns None when tracemalloc is not tracing.
+    """
+    global _previous
+    if not tracemalloc.is_tracing():
+        return None
+    
+    snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+    with _previous_lock:
+        previous, _previous = _previous, snapshot
+    
+    if compare and previous is not None:
+        stats = snapshot.compare_to(previous, group_by)
+    else:
+        stats = snapshot.statistics(group_by)
+    
+    sites = []
+    for stat in stats[:limit]:
+        site = {
+            'site': _site(stat.traceback[0]),
+            'size_kb': round(stat.size / 1024, 1),
+            'count': stat.count,
+        }
+        if hasattr(stat, 'size_diff'):
+            site['size_diff_kb'] = round(stat.size_diff / 1024, 1)
+            site['count_diff'] = stat.count_diff
+        if len(stat.traceback) > 1:
+            site['traceback'] = [_site(frame) for frame in stat.traceback]
+        sites.append(site)
+    return sites
+
+
+def monitor_sizes(monitor):
+    """Entry counts of the JournalMonitor's in-memory containers"""
+    return {
+        'system_cache': {'count': len(monitor.system_cache.entries), 'limit': monitor.system_cache.capacity},
+        'recent_events': {'count': min(monitor.recent_events.seq, monitor.recent_events.capacity),
+                          'limit': monitor.recent_events.capacity},
+        'visited_systems': {'count': len(monitor.visited_systems),
+                            'limit': monitor.visited_systems.capacity,
+                            'dropped': monitor.visited_systems.dropped},
+        'series': {metric: {'count': series.size, 'limit': series.capacity}
+                   for metric, series in monitor.series.series.items()},
+        'dedup': {'count': len(monitor.dedup.order), 'limit': monitor.dedup.capacity},
+        'fleet': {'count': len(monitor.fleet.ships), 'limit': None},
+    }
+
+
+def memory_report(ed_data, monitor=None, limit=20, group_by='lineno', compare=False):
+    """Everything served by /debug/memory"""
+    report = {
+        'rss_bytes': rss_bytes(),
+        'gc_objects': len(gc.get_objects()),
+    }
+    
+    sites = top_allocations(limit, group_by, compare)
+    if sites is None:
+        report['tracemalloc'] = {'tracing': False, 'hint': 'defina ED_TRACEMALLOC=1 para ver alocações'}
+    else:
+        current, peak = tracemalloc.get_traced_memory()
+        report['tracemalloc'] = {
+            'tracing': True,
+            'frames': tracemalloc.get_traceback_limit(),
+            'current_kb': round(current / 1024, 1),
+            'peak_kb': round(peak / 1024, 1),
+            'overhead_kb': round(tracemalloc.get_tracemalloc_memory() / 1024, 1),
+            'compare': compare,
+            'top': sites,
+        }
+    
+    if hasattr(ed_data, 'collection_sizes'):
+        report['collections'] = ed_data.collection_sizes()
+    if monitor is not None:
+        report['monitor'] = monitor_sizes(monitor)
+    return report
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Server Plugins
+Plugin interface, discovery and a bounded worker pool that keeps plugins off the ingest path
+"""
+
+import importlib.util
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+
+try:
+    import importlib.metadata as importlib_metadata
+except ImportError:
+    importlib_metadata = None  # Python 3.7: sem descoberta por entry points
+
+
+ENTRY_POINT_GROUP = 'ed_journal_server.plugins'
+
+
+class Plugin:
+    """Base class for plugins
+    
+    Subclasses override on_event() and/or on_state_change(). `events` limits
+    which journal events are delivered (None = all) and `state_keys` which
+    EDData keys trigger on_state_change() (None = all, () = none). Both run
+    on a worker thread, never on the journal monitor thread.
+    """
+    
+    name = None
+    events = None
+    state_keys = ()
+    
+    def start(self, ed_data):
+        """Called once before any event is delivered"""
+        self.ed_data = ed_data
+    
+    def stop(self):
+        """Called when the server stops"""
+    
+    def on_event(self, event):
+        """Receives a parsed journal event (dict)"""
+    
+    def on_state_change(self, changes, version):
+        """Receives EDData changes as delivered by EDData.subscribe()"""
+
+
+class PluginRunner:
+    """Per-plugin bounded queue, scheduling state and metrics"""
+    
+    def __init__(self, plugin, queue_size):
+        self.plugin = plugin
+        self.name = plugin.name or type(plugin).__name__
+        self.queue = deque(maxlen=queue_size)
+        self.lock = threading.Lock()
+        self.scheduled = False
+        self.busy_since = None
+        self.stalled = False
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+    
+    def metrics(self):
+        with self.lock:
+            return {
+                'received': self.received,
+                'processed': self.processed,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'timeouts': self.timeouts,
+                'queued': len(self.queue),
+                'stalled': self.stalled,
+                'avg_lag_ms': round(self.lag_total * 1000 / self.processed, 3) if self.processed else 0.0,
+                'max_lag_ms': round(self.lag_max * 1000, 3),
+            }
+
+
+class PluginManager:
+    """Fans events and state changes out to plugins on a bounded thread pool"""
+    
+    BATCH = 32
+    
+    def __init__(self, ed_data, plugins, workers=None, queue_size=None, timeout=None):
+        self.ed_data = ed_data
+        self.timeout = timeout or config.PLUGIN_TIMEOUT
+        queue_size = queue_size or config.PLUGIN_QUEUE_SIZE
+        self.runners = []
+        self.tokens = []
+        self.all_events = False
+        self.wanted_events = set()
+        
+        for plugin in plugins:
+            try:
+                plugin.start(ed_data)
+            except Exception as e:
+                print(f"Erro ao iniciar plugin {type(plugin).__name__}: {e}")
+                continue
+            runner = PluginRunner(plugin, queue_size)
+            self.runners.append(runner)
+            if plugin.events is None:
+                self.all_events = True
+            else:
+                self.wanted_events.update(plugin.events)
+            if plugin.state_keys is None or plugin.state_keys:
+                self.tokens.append(ed_data.subscribe(
+                    plugin.state_keys,
+                    lambda changes, version, runner=runner: self.enqueue(
+                        runner, 'on_state_change', (changes, version))))
+        
+        self.executor = ThreadPoolExecutor(max_workers=workers or config.PLUGIN_WORKERS,
+                                           thread_name_prefix='plugin')
+        for runner in self.runners:
+            print(f"Plugin carregado: {runner.name}")
+    
+    @classmethod
+    def load(cls, ed_data, plugins_dir=None):
+        """Discover plugins from entry points and the plugins directory"""
+        return cls(ed_data, discover_plugins(plugins_dir))
+    
+    def wants(self, event_type):
+        """Whether any plugin needs this event decoded"""
+        return self.all_events or event_type in self.wanted_events
+    
+    def publish_event(self, event_type, event):
+        """Queue a parsed event for every interested plugin without blocking"""
+        for runner in self.runners:
+            events = runner.plugin.events
+            if events is None or event_type in events:
+                self.enqueue(runner, 'on_event', (event,))
+    
+    def enqueue(self, runner, method, args):
+        now = time.perf_counter()
+        with runner.lock:
+            runner.received += 1
+            if runner.busy_since is not None and now - runner.busy_since > self.timeout:
+                # Chamada atual excedeu o limite: descarta até o plugin voltar
+                if not runner.stalled:
+                    runner.stalled = True
+                    runner.timeouts += 1
+                    print(f"Plugin {runner.name} excedeu {self.timeout}s; descartando eventos")
+                runner.dropped += 1
+                return
+            if len(runner.queue) == runner.queue.maxlen:
+                runner.dropped += 1
+            runner.queue.append((now, method, args))
+            if runner.scheduled:
+                return
+            runner.scheduled = True
+        try:
+            self.executor.submit(self._drain, runner)
+        except RuntimeError:
+            pass  # pool já encerrado
+    
+    def _drain(self, runner):
+        for _ in range(self.BATCH):
+            with runner.lock:
+                if not runner.queue:
+                    runner.scheduled = False
+                    return
+                queued_at, method, args = runner.queue.popleft()
+                started = time.perf_counter()
+                runner.busy_since = started
+                lag = started - queued_at
+                runner.lag_total += lag
+                runner.lag_max = max(runner.lag_max, lag)
+            try:
+                getattr(runner.plugin, method)(*args)
+            except Exception as e:
+                with runner.lock:
+                    runner.errors += 1
+                print(f"Erro no plugin {runner.name}: {e}")
+            with runner.lock:
+                if not runner.stalled and time.perf_counter() - started > self.timeout:
+                    runner.timeouts += 1
+                runner.busy_since = None
+                runner.stalled = False
+                runner.processed += 1
+        
+        # Lote cheio: devolve a vez aos outros plugins
+        try:
+            self.executor.submit(self._drain, runner)
+        except RuntimeError:
+            with runner.lock:
+                runner.scheduled = False
+    
+    def metrics(self):
+        """Per-plugin delivery, drop, timeout and lag counters"""
+        return {runner.name: runner.metrics() for runner in self.runners}
+    
+    def shutdown(self):
+        """Stop delivering and let plugins clean up"""
+        for token in self.tokens:
+            self.ed_data.unsubscribe(token)
+        self.executor.shutdown(wait=False)
+        for runner in self.runners:
+            try:
+                runner.plugin.stop()
+            except Exception as e:
+                print(f"Erro ao encerrar plugin {runner.name}: {e}")
+
+
+def _instantiate(obj, origin):
+    """Turn a discovered object (Plugin subclass, instance or factory) into instances"""
+    try:
+        if isinstance(obj, Plugin):
+            return [obj]
+        if isinstance(obj, type) and issubclass(obj, Plugin):
+            return [obj()]
+        if callable(obj):
+            plugin = obj()
+            if isinstance(plugin, Plugin):
+                return [plugin]
+    except Exception as e:
+        print(f"Erro ao criar plugin de {origin}: {e}")
+    return []
+
+
+def discover_plugins(plugins_dir=None):
+    """Instantiate plugins from entry points and from *.py files in the plugins directory"""
+    plugins = []
+    
+    try:
+        entry_points = importlib_metadata.entry_points() if importlib_metadata else {}
+        if hasattr(entry_points, 'select'):
+            group = entry_points.select(group=ENTRY_POINT_GROUP)
+        else:
+            group = entry_points.get(ENTRY_POINT_GROUP, [])
+        for entry_point in group:
+            try:
+                plugins += _instantiate(entry_point.load(), entry_point.name)
+            except Exception as e:
+                print(f"Erro ao carregar plugin {entry_point.name}: {e}")
+    except Exception as e:
+        print(f"Erro ao listar entry points de plugins: {e}")
+    
+    plugins_dir = plugins_dir or config.PLUGINS_DIR
+    if plugins_dir.is_dir():
+        for path in sorted(plugins_dir.glob('*.py')):
+            try:
+                spec = importlib.util.spec_from_file_location(f'ed_plugin_{path.stem}', path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except Exception as e:
+                print(f"Erro ao carregar plugin {path.name}: {e}")
+                continue
+            for obj in vars(module).values():
+                if (isinstance(obj, type) and issubclass(obj, Plugin) and obj is not Plugin
+                        and obj.__module__ == module.__name__):
+                    plugins += _instantiate(obj, path.name)
+    
+    return plugins
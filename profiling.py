@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Server Profiling
+Opt-in timing of event handlers and HTTP routes plus on-demand stack sampling
+"""
+
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import config
+
+
+class Profiler:
+    """Accumulates call counts and durations per (category, name)"""
+    
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.timings = {}
+    
+    def record(self, category, name, seconds):
+        """Add one measured duration"""
+        with self.lock:
+            entry = self.timings.setdefault((category, name), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+    
+    @contextmanager
+    def timed_lock(self, lock, name):
+        """Acquire a lock, recording how long the acquisition waited"""
+        started = time.perf_counter()
+        with lock:
+            self.record('lock_wait', name, time.perf_counter() - started)
+            yield
+    
+    def snapshot(self, reset=False):
+        """Timings grouped by category, slowest total first"""
+        with self.lock:
+            items = list(self.timings.items())
+            if reset:
+                self.timings = {}
+        
+        result = {}
+        for (category, name), (count, total, worst) in sorted(items, key=lambda i: -i[1][1]):
+            result.setdefault(category, {})[name] = {
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'avg_ms': round(total * 1000 / count, 3),
+                'max_ms': round(worst * 1000, 3),
+            }
+        return result
+
+
+profiler = Profiler(config.PROFILE)
+
+
+def _frame_key(frame):
+    code = frame.f_code
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def sample_stacks(seconds, interval=0.005):
+    """Sample the stacks of all other threads; returns (Counter of stacks, sample period)"""
+    own = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    samples = Counter()
+    rounds = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        rounds += 1
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_key(frame))
+                frame = frame.f_back
+            stack.append(('<thread>', 0, names.get(ident, str(ident))))
+            samples[tuple(reversed(stack))] += 1
+        time.sleep(interval)
+    return samples, (time.perf_counter() - started) / max(rounds, 1)
+
+
+def format_collapsed(samples):
+    """Collapsed-stack text (flamegraph.pl / speedscope input)"""
+    lines = []
+    for stack, count in samples.most_common():
+        frames = [stack[0][2]] + [f'{name} ({filename.rsplit("/", 1)[-1]}:{line})'
+                                  for filename, line, name in stack[1:]]
+        lines.append(f'{";".join(frames)} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+class _SampledProfile:
+    """Adapter exposing stack samples through the interface pstats.Stats loads"""
+    
+    def __init__(self, samples, interval):
+        self.samples = samples
+        self.interval = interval
+    
+    def create_stats(self):
+        stats = {}
+        for stack, count in self.samples.items():
+            frames = stack[1:]
+            seconds = count * self.interval
+            seen = set()
+            for depth, key in enumerate(frames):
+                cc, nc, tt, ct, callers = stats.get(key, (0, 0, 0.0, 0.0, {}))
+                if depth == len(frames) - 1:
+                    tt += seconds
+                if key not in seen:
+                    ct += seconds
+                    seen.add(key)
+                if depth:
+                    caller = frames[depth - 1]
+                    c_cc, c_nc, c_tt, c_ct = callers.get(caller, (0, 0, 0.0, 0.0))
+                    callers[caller] = (c_cc + count, c_nc + count, c_tt, c_ct + seconds)
+                stats[key] = (cc + count, nc + count, tt, ct, callers)
+        self.stats = stats
+
+
+def format_pstats(samples, interval, limit=40):
+    """pstats report built from the samples (call counts are sample counts)"""
+    out = io.StringIO()
+    if samples:
+        stats = pstats.Stats(_SampledProfile(samples, interval), stream=out)
+        stats.sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Session Statistics
+Incremental per-session and lifetime aggregates fed by journal events
+"""
+
+import json
+import math
+import threading
+from datetime import datetime, timezone
+
+from journal_reader import parse_event_time
+
+
+# Variação do saldo de créditos causada por cada evento do journal
+_CREDIT_CHANGES = {
+    'MarketBuy': lambda e: -e.get('TotalCost', 0),
+    'MarketSell': lambda e: e.get('TotalSale', 0),
+    'BuyDrones': lambda e: -e.get('TotalCost', 0),
+    'SellDrones': lambda e: e.get('TotalSale', 0),
+    'BuyAmmo': lambda e: -e.get('Cost', 0),
+    'RefuelAll': lambda e: -e.get('Cost', 0),
+    'RefuelPartial': lambda e: -e.get('Cost', 0),
+    'Repair': lambda e: -e.get('Cost', 0),
+    'RepairAll': lambda e: -e.get('Cost', 0),
+    'RestockVehicle': lambda e: -e.get('Cost', 0),
+    'BuyExplorationData': lambda e: -e.get('Cost', 0),
+    'BuyTradeData': lambda e: -e.get('Cost', 0),
+    'SellExplorationData': lambda e: e.get('TotalEarnings', 0),
+    'MultiSellExplorationData': lambda e: e.get('TotalEarnings', 0),
+    'SellOrganicData': lambda e: sum(b.get('Value', 0) + b.get('Bonus', 0)
+                                     for b in e.get('BioData', [])),
+    'RedeemVoucher': lambda e: e.get('Amount', 0),
+    'MissionCompleted': lambda e: e.get('Reward', 0) - e.get('Donated', 0),
+    'CommunityGoalReward': lambda e: e.get('Reward', 0),
+    'SearchAndRescue': lambda e: e.get('Reward', 0),
+    'PowerplaySalary': lambda e: e.get('Amount', 0),
+    'PayFines': lambda e: -e.get('Amount', 0),
+    'PayBounties': lambda e: -e.get('Amount', 0),
+    'Resurrect': lambda e: -e.get('Cost', 0),
+    'ModuleBuy': lambda e: e.get('SellPrice', 0) - e.get('BuyPrice', 0),
+    'ModuleSell': lambda e: e.get('SellPrice', 0),
+    'ModuleSellRemote': lambda e: e.get('SellPrice', 0),
+    'FetchRemoteModule': lambda e: -e.get('TransferCost', 0),
+    'ShipyardBuy': lambda e: e.get('SellPrice', 0) - e.get('ShipPrice', 0),
+    'ShipyardSell': lambda e: e.get('ShipPrice', 0),
+    'ShipyardTransfer': lambda e: -e.get('TransferPrice', 0),
+    'CrewHire': lambda e: -e.get('Cost', 0),
+    'NpcCrewPaidWage': lambda e: -e.get('Amount', 0),
+}
+
+CREDIT_EVENTS = frozenset(_CREDIT_CHANGES)
+
+
+def credit_change(event):
+    """Credits gained (positive) or spent (negative) by a journal event"""
+    change = _CREDIT_CHANGES.get(event.get('event'))
+    if change is None:
+        return 0
+    try:
+        return int(change(event) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _empty_totals():
+    return {
+        'jumps': 0,
+        'distance_ly': 0.0,
+        'fuel_used': 0.0,
+        'bodies_scanned': 0,
+        'bodies_mapped': 0,
+    }
+
+
+class SessionStats:
+    """O(1)-per-event statistics with a JSON body cached per version"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = 0
+        self.session = _empty_totals()
+        self.lifetime = _empty_totals()
+        self.session_start = None
+        self.last_event_time = None
+        self.closed_hours = 0.0
+        self.first_credits = None
+        self.session_credits = None
+        self.credits = None
+        self.last_pos = None
+        self._cached_version = None
+        self._cached_body = None
+    
+    def _add(self, key, amount):
+        self.session[key] += amount
+        self.lifetime[key] += amount
+        self.version += 1
+    
+    def observe(self, timestamp):
+        """Advance the clock used for rates and durations"""
+        event_time = parse_event_time(timestamp)
+        if event_time is None:
+            return
+        with self.lock:
+            if self.session_start is None:
+                self.session_start = event_time
+                self.version += 1
+            if self.last_event_time is None or event_time > self.last_event_time:
+                # Nova versão só quando as horas exibidas (3 casas) mudam
+                shown = round(self._session_hours(), 3)
+                self.last_event_time = event_time
+                if round(self._session_hours(), 3) != shown:
+                    self.version += 1
+    
+    def start_session(self, timestamp, credits):
+        """Begin a new game session (LoadGame)"""
+        event_time = parse_event_time(timestamp)
+        with self.lock:
+            if self.session_start is not None and self.last_event_time is not None:
+                self.closed_hours += max(0.0, self.last_event_time - self.session_start) / 3600
+            self.session = _empty_totals()
+            self.session_start = event_time
+            self.last_event_time = event_time
+            self.session_credits = credits
+            self.credits = credits
+            if self.first_credits is None:
+                self.first_credits = credits
+            self.version += 1
+    
+    def record_credits(self, credits):
+        """Update the current credit balance"""
+        with self.lock:
+            if self.first_credits is None:
+                self.first_credits = credits
+            if self.session_credits is None:
+                self.session_credits = credits
+            if credits != self.credits:
+                self.credits = credits
+                self.version += 1
+    
+    def record_position(self, star_pos):
+        """Set the current star position without counting a jump (Location)"""
+        if star_pos and len(star_pos) == 3:
+            with self.lock:
+                self.last_pos = tuple(star_pos)
+    
+    def record_jump(self, star_pos, fuel_used):
+        """Count a hyperspace jump, its distance and fuel (FSDJump)"""
+        with self.lock:
+            self._add('jumps', 1)
+            if fuel_used:
+                self._add('fuel_used', fuel_used)
+            if star_pos and len(star_pos) == 3:
+                star_pos = tuple(star_pos)
+                if self.last_pos is not None:
+                    self._add('distance_ly', math.sqrt(
+                        sum((a - b) ** 2 for a, b in zip(self.last_pos, star_pos))))
+                self.last_pos = star_pos
+    
+    def record_scan(self):
+        """Count a newly scanned body"""
+        with self.lock:
+            self._add('bodies_scanned', 1)
+    
+    def record_mapped(self):
+        """Count a surface-mapped body (SAAScanComplete)"""
+        with self.lock:
+            self._add('bodies_mapped', 1)
+    
+    def _session_hours(self):
+        if self.session_start is None or self.last_event_time is None:
+            return 0.0
+        return max(0.0, self.last_event_time - self.session_start) / 3600
+    
+    def _summary(self, totals, hours, start_credits):
+        summary = dict(totals)
+        summary['distance_ly'] = round(summary['distance_ly'], 2)
+        summary['fuel_used'] = round(summary['fuel_used'], 2)
+        summary['hours'] = round(hours, 3)
+        summary['jumps_per_hour'] = round(totals['jumps'] / hours, 2) if hours > 0 else None
+        summary['credits_delta'] = (self.credits - start_credits
+                                    if self.credits is not None and start_credits is not None
+                                    else 0)
+        return summary
+    
+    def snapshot(self):
+        """Return session and lifetime aggregates as a dict"""
+        with self.lock:
+            return self._snapshot()
+    
+    def _snapshot(self):
+        session_hours = self._session_hours()
+        started = None
+        if self.session_start is not None:
+            started = datetime.fromtimestamp(self.session_start, timezone.utc).isoformat()
+        session = self._summary(self.session, session_hours, self.session_credits)
+        session['started'] = started
+        return {
+            'version': self.version,
+            'session': session,
+            'lifetime': self._summary(self.lifetime, self.closed_hours + session_hours,
+                                      self.first_credits),
+        }
+    
+    def to_json(self):
+        """Serialized snapshot, re-encoded only when the version changed"""
+        with self.lock:
+            if self._cached_version != self.version:
+                self._cached_body = json.dumps(self._snapshot()).encode()
+                self._cached_version = self.version
+            return self._cached_body
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Server Soak Test
+Replays a long journal into a local server and checks that its RSS stays flat
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from journal_reader import list_journals
+from journal_replay import iter_source_lines
+from load_test import ProcessSampler, free_port
+
+
+LOAD_TEST = Path(__file__).with_name('load_test.py')
+SESSION_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def synthetic_session(seed=0):
+    """Endless synthetic gameplay: jumps, scans, docking, trading, materials, loadouts and chatter"""
+    rng = random.Random(seed)
+    ships = {ship_id: rng.choice(['Anaconda', 'Python', 'Krait_MkII', 'Type9', 'DiamondBackXL'])
+             for ship_id in range(1, 6)}
+    yield {'event': 'LoadGame', 'Commander': 'Soak', 'ShipID': 1, 'Ship': ships[1],
+           'Credits': 1000000, 'FuelLevel': 32.0}
+    position = [0.0, 0.0, 0.0]
+    
+    for system in itertools.count(1):
+        position = [axis + rng.uniform(-40, 40) for axis in position]
+        yield {'event': 'FSDJump', 'StarSystem': f'Soak {system}', 'SystemAddress': system,
+               'StarPos': position, 'FuelUsed': 4.2, 'FuelLevel': 28.0}
+        for body_id in range(rng.randint(3, 40)):
+            yield {'event': 'Scan', 'BodyName': f'Soak {system} {body_id}', 'BodyID': body_id,
+                   'PlanetClass': rng.choice(['Icy body', 'Rocky body', 'High metal content body']),
+                   'DistanceFromArrivalLS': rng.uniform(10, 5000), 'Landable': rng.random() < 0.3,
+                   'MassEM': rng.random(), 'Radius': rng.uniform(1e5, 1e7)}
+        yield {'event': 'FuelScoop', 'Scooped': 4.0, 'Total': 32.0}
+        
+        # Eventos que o servidor ignora, na proporção de uma sessão real
+        for _ in range(rng.randint(20, 80)):
+            yield rng.choice([
+                {'event': 'Music', 'MusicTrack': 'Exploration'},
+                {'event': 'ReceiveText', 'From': 'Soak', 'Message': 'o7', 'Channel': 'npc'},
+                {'event': 'NavBeaconScan', 'NumBodies': 12},
+                {'event': 'Friends', 'Status': 'Online', 'Name': 'Soak Wing'},
+            ])
+        
+        for _ in range(rng.randint(0, 3)):
+            yield {'event': 'MaterialCollected', 'Category': 'Raw',
+                   'Name': f'element{rng.randint(1, 60)}', 'Count': rng.randint(1, 3)}
+        
+        if system % 5 == 0:
+            station = f'Soak Port {system}'
+            yield {'event': 'Docked', 'StationName': station, 'MarketID': system}
+            # Commodities novas a cada estação: compradas e vendidas logo depois
+            commodity = f'commodity{system % 400}'
+            yield {'event': 'MarketBuy', 'Type': commodity, 'Count': 64, 'BuyPrice': 1000}
+            yield {'event': 'MarketSell', 'Type': commodity, 'Count': 64, 'SellPrice': 1100}
+            if system % 20 == 0:
+                ship_id = rng.choice(list(ships))
+                yield {'event': 'ShipyardSwap', 'ShipID': ship_id, 'ShipType': ships[ship_id]}
+                yield {'event': 'Loadout', 'ShipID': ship_id, 'Ship': ships[ship_id],
+                       'Modules': [{'Slot': f'Slot{slot:02d}', 'Item': f'int_module_size{slot % 8}'}
+                                   for slot in range(rng.randint(20, 40))]}
+            yield {'event': 'Undocked', 'StationName': station}
+
+
+def replayed_session(source):
+    """Endless replay of the journals in a directory (or of a single journal file)"""
+    source = Path(source)
+    paths = list_journals(source) if source.is_dir() else [source]
+    if not paths:
+        raise SystemExit(f"Nenhum journal em {source}")
+    for path in itertools.cycle(paths):
+        for line in iter_source_lines(path):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def journal_path(journal_dir, index):
+    """Name of the index-th journal of the session, one game day apart"""
+    day = SESSION_START + timedelta(days=index)
+    return journal_dir / f"Journal.{day:%Y-%m-%dT%H%M%S}.01.log"
+
+
+class SoakTest:
+    """Writes events into rotating journals while sampling the server"""
+    
+    def __init__(self, base_url, journal_dir, events, events_per_file, rate, sampler):
+        self.base_url = base_url
+        self.journal_dir = journal_dir
+        self.events = events
+        self.events_per_file = events_per_file
+        self.rate = rate
+        self.sampler = sampler
+        self.written = 0
+        self.samples = []          # (eventos escritos, RSS)
+        self.running = True
+    
+    def write(self, session):
+        """Write `events` events with increasing timestamps, one file per `events_per_file`"""
+        clock = SESSION_START
+        started = time.perf_counter()
+        f = None
+        try:
+            for event in itertools.islice(session, self.events):
+                if self.written % self.events_per_file == 0:
+                    if f:
+                        f.close()
+                    f = open(journal_path(self.journal_dir, self.written // self.events_per_file),
+                             'a', encoding='utf-8')
+                # Um evento a cada 2 s de jogo: timestamps sempre crescentes
+                clock += timedelta(seconds=2)
+                event['timestamp'] = clock.strftime('%Y-%m-%dT%H:%M:%SZ')
+                f.write(json.dumps(event) + '\r\n')
+                self.written += 1
+                if self.written % 100 == 0:
+                    f.flush()
+                    if self.rate:
+                        time.sleep(max(0.0, started + self.written / self.rate - time.perf_counter()))
+        finally:
+            if f:
+                f.close()
+    
+    def sample(self, interval):
+        while self.running:
+            self.sampler.sample_rss()
+            if self.sampler.rss:
+                self.samples.append((self.written, self.sampler.rss[-1]))
+            time.sleep(interval)
+    
+    def wait_idle(self, quiet=3.0, timeout=600.0):
+        """Wait until the server stops consuming events (its event sequence stops moving)"""
+        last, since = None, time.perf_counter()
+        deadline = since + timeout
+        while time.perf_counter() < deadline:
+            try:
+                with urllib.request.urlopen(self.base_url + '/api/events/recent?after=0',
+                                            timeout=30) as response:
+                    seq = json.loads(response.read())['last_seq']
+            except (OSError, ValueError, KeyError):
+                seq = None
+            now = time.perf_counter()
+            if seq != last:
+                last, since = seq, now
+            elif now - since >= quiet:
+                return
+            time.sleep(0.5)
+    
+    def memory(self, query=''):
+        try:
+            with urllib.request.urlopen(self.base_url + '/debug/memory' + query, timeout=30) as response:
+                return json.loads(response.read())
+        except (OSError, ValueError):
+            return None
+
+
+def mib(value):
+    return f"{value / (1 << 20):.1f} MiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de longa duração (RSS) do servidor Elite Dangerous')
+    parser.add_argument('--events', type=int, default=200000, help='eventos escritos no total')
+    parser.add_argument('--events-per-file', type=int, default=50000,
+                        help='eventos por arquivo de journal (rotação)')
+    parser.add_argument('--rate', type=float, default=5000.0,
+                        help='eventos por segundo (0 = o mais rápido possível)')
+    parser.add_argument('--source', help='diretório ou arquivo de journals reais a repetir '
+                                         '(padrão: sessão sintética)')
+    parser.add_argument('--interval', type=float, default=0.5, help='intervalo entre amostras de RSS (s)')
+    parser.add_argument('--tolerance', type=float, default=10.0,
+                        help='crescimento máximo de RSS (%%) após o aquecimento')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='rastreia alocações no servidor e mostra os locais que mais cresceram')
+    args = parser.parse_args()
+    
+    workdir = Path(tempfile.mkdtemp(prefix='ed_soaktest_'))
+    journal_path(workdir, 0).touch()  # sem journal o monitor só volta a procurar após 5 s
+    port = free_port()
+    env = dict(os.environ, ED_CACHE_DIR=str(workdir / 'cache'), ED_PROFILE='1')
+    if args.tracemalloc:
+        env['ED_TRACEMALLOC'] = '1'
+    server = subprocess.Popen([sys.executable, str(LOAD_TEST), '--serve', '--port', str(port),
+                               '--journal-dir', str(workdir)], env=env, stdout=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(base_url + '/api/data', timeout=1).read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            print("Servidor não respondeu")
+            return 1
+        
+        session = replayed_session(args.source) if args.source else synthetic_session()
+        test = SoakTest(base_url, workdir, args.events, max(1, args.events_per_file), args.rate,
+                        ProcessSampler(server.pid))
+        sampler = threading.Thread(target=test.sample, args=(args.interval,), daemon=True)
+        sampler.start()
+        if args.tracemalloc:
+            test.memory()  # snapshot de referência para ?compare
+        
+        print(f"Escrevendo {args.events} eventos em {workdir}...")
+        started = time.perf_counter()
+        test.write(session)
+        test.wait_idle()
+        elapsed = time.perf_counter() - started
+        report = test.memory('?compare=1&limit=10' if args.tracemalloc else '')
+        test.running = False
+        sampler.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    samples = test.samples
+    if len(samples) < 8:
+        print("Amostras de RSS insuficientes (aumente --events ou reduza --interval)")
+        return 1
+    
+    # Aquecimento: o primeiro quarto enche caches, buffers e séries até os limites
+    warm = samples[len(samples) // 4:]
+    baseline = min(rss for _, rss in warm[:max(1, len(warm) // 4)])
+    final = max(rss for _, rss in warm[-max(1, len(warm) // 4):])
+    growth = (final - baseline) / baseline * 100
+    
+    print(f"\n{test.written} eventos em {elapsed:.1f} s ({test.written / elapsed:.0f}/s)")
+    print(f"RSS: início {mib(samples[0][1])}, após aquecimento {mib(baseline)}, "
+          f"final {mib(final)}, pico {mib(max(rss for _, rss in samples))}")
+    print(f"Crescimento após aquecimento: {growth:+.1f}% (tolerância {args.tolerance:.0f}%)")
+    for written, rss in samples[::max(1, len(samples) // 10)]:
+        print(f"  {written:>9} eventos  {mib(rss)}")
+    
+    if report:
+        print("\nColeções:")
+        for name, size in {**report.get('collections', {}), **report.get('monitor', {})}.items():
+            if 'count' in size:
+                print(f"  {name:<18} {size['count']:>7}  limite {size['limit']}")
+        for site in report['tracemalloc'].get('top', []):
+            print(f"  {site.get('size_diff_kb', 0):>+10.1f} KiB  {site['site']}")
+    
+    return 0 if growth <= args.tolerance else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
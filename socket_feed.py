@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Unix Socket Feed
+Streams EDData changes as newline-delimited JSON (or MessagePack) to local subscribers
+"""
+
+import json
+import os
+import selectors
+import socket
+import stat
+import threading
+from collections import deque
+
+import config
+from binary_encoding import packb
+
+
+# Serialização de uma mensagem por formato do feed
+FRAMERS = {
+    'json': lambda message: json.dumps(message, default=str).encode() + b'\n',
+    'msgpack': packb,
+}
+
+
+class FeedClient:
+    """Connected subscriber with its pending output
+    
+    `frames` holds the length of each message in `buffer`; the first one may
+    already be partly sent (`sent` bytes), so a resync can keep its tail and
+    drop only whole unsent messages.
+    """
+    
+    __slots__ = ('sock', 'buffer', 'frames', 'sent', 'limit', 'version', 'resyncs', 'format')
+    
+    def __init__(self, sock, limit):
+        self.sock = sock
+        self.buffer = bytearray()
+        self.frames = deque()
+        self.sent = 0
+        self.limit = limit
+        self.version = 0
+        self.resyncs = 0
+        self.format = 'json'
+    
+    def append(self, frame):
+        self.buffer += frame
+        self.frames.append(len(frame))
+    
+    def consume(self, count):
+        """Drop `count` bytes that were written to the socket"""
+        del self.buffer[:count]
+        self.sent += count
+        while self.frames and self.sent >= self.frames[0]:
+            self.sent -= self.frames.popleft()
+    
+    def discard_pending(self):
+        """Drop every unsent message, keeping the rest of one already partly sent"""
+        if self.sent:
+            del self.buffer[self.frames[0] - self.sent:]
+            self.frames = deque([self.frames[0]])
+        else:
+            self.buffer.clear()
+            self.frames.clear()
+
+
+class UnixSocketFeed:
+    """Unix domain socket server pushing a snapshot on connect, then change lines
+    
+    Each line is a JSON object:
+      {"type": "snapshot", "value": {...}, "version": V}
+      {"type": "change", "key": "credits", "value": 123, "version": V}
+      {"type": "change", "key": "system_bodies", "id": 5, "value": {...}, "version": V}
+    A client that falls more than max_buffer bytes behind has its pending
+    changes dropped and receives a fresh snapshot instead. A client that writes
+    "msgpack\\n" gets a new snapshot and from then on concatenated MessagePack
+    maps instead of JSON lines ("json\\n" switches back).
+    """
+    
+    def __init__(self, ed_data, path, max_buffer=None):
+        self.ed_data = ed_data
+        self.path = str(path)
+        self.max_buffer = max_buffer or config.UNIX_SOCKET_BUFFER
+        self.selector = selectors.DefaultSelector()
+        self.clients = {}
+        self.outbox = []
+        self.outbox_lock = threading.Lock()
+        self.running = False
+        self.server = None
+        self.thread = None
+        self.token = None
+        self._wake_r, self._wake_w = socket.socketpair()
+    
+    def start(self):
+        """Bind the socket and start streaming"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if not self._remove_socket_file():
+            raise FileExistsError(f"{self.path} já existe e não é um socket; "
+                                  f"escolha outro caminho para o feed")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.path)
+        self.server.listen(16)
+        self.server.setblocking(False)
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self.selector.register(self.server, selectors.EVENT_READ, self._accept)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, self._drain_wakeups)
+        
+        self.running = True
+        self.token = self.ed_data.subscribe(None, self._on_change)
+        self.thread = threading.Thread(target=self._loop, name='unix-socket-feed', daemon=True)
+        self.thread.start()
+        print(f"Feed NDJSON em {self.path}")
+    
+    def _remove_socket_file(self):
+        """Remove a socket left at the path (e.g. by a previous run); False if another file is there"""
+        try:
+            mode = os.lstat(self.path).st_mode
+        except FileNotFoundError:
+            return True
+        if not stat.S_ISSOCK(mode):
+            return False
+        os.unlink(self.path)
+        return True
+    
+    def stop(self):
+        """Disconnect clients and remove the socket file"""
+        self.running = False
+        if self.token is not None:
+            self.ed_data.unsubscribe(self.token)
+            self.token = None
+        self._wake()
+        if self.thread:
+            self.thread.join(timeout=2)
+    
+    def _wake(self):
+        try:
+            self._wake_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # já há um despertar pendente
+    
+    def _on_change(self, changes, version):
+        """EDData dispatcher callback: read the changed values, hand off to the socket thread"""
+        values, version = self.ed_data.get_changes(changes)
+        messages = []
+        for key, item_id, value in values:
+            message = {'type': 'change', 'key': key, 'value': value, 'version': version}
+            if item_id is not None:
+                message['id'] = item_id
+            messages.append(message)
+        with self.outbox_lock:
+            self.outbox.append((version, messages))
+        self._wake()
+    
+    def _snapshot(self, client):
+        data, version = self.ed_data.get_snapshot()
+        message = {'type': 'snapshot', 'value': data, 'version': version}
+        client.discard_pending()
+        client.append(FRAMERS[client.format](message))
+        client.version = version
+        # O snapshot pode passar do limite; as mudanças seguintes ainda têm max_buffer
+        client.limit = max(self.max_buffer, len(client.buffer) + self.max_buffer)
+    
+    def _accept(self, sock, mask):
+        try:
+            sock, _ = sock.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        client = FeedClient(sock, self.max_buffer)
+        self._snapshot(client)
+        self.clients[sock] = client
+        self.selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE, self._service)
+    
+    def _drain_wakeups(self, sock, mask):
+        try:
+            while sock.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        
+        with self.outbox_lock:
+            batches, self.outbox = self.outbox, []
+        for version, messages in batches:
+            # Cada lote é codificado uma vez por formato em uso
+            payloads = {}
+            for client in list(self.clients.values()):
+                # Mudanças já contidas no snapshot enviado ao cliente
+                if version <= client.version:
+                    continue
+                payload = payloads.get(client.format)
+                if payload is None:
+                    frame = FRAMERS[client.format]
+                    frames = [frame(m) for m in messages]
+                    payload = payloads[client.format] = (frames, sum(map(len, frames)))
+                frames, size = payload
+                if len(client.buffer) + size > client.limit:
+                    client.resyncs += 1
+                    self._snapshot(client)
+                else:
+                    for frame in frames:
+                        client.append(frame)
+                    client.version = version
+        
+        for client in self.clients.values():
+            if client.buffer:
+                self.selector.modify(client.sock, selectors.EVENT_READ | selectors.EVENT_WRITE,
+                                     self._service)
+    
+    def _service(self, sock, mask):
+        client = self.clients.get(sock)
+        if client is None:
+            return
+        try:
+            if mask & selectors.EVENT_READ:
+                # Leitura vazia = desconectou; a única entrada aceita é o formato
+                request = sock.recv(4096)
+                if not request:
+                    self._close(client)
+                    return
+                fmt = request.strip().decode('ascii', 'replace').lower()
+                if fmt in FRAMERS and fmt != client.format:
+                    client.format = fmt
+                    self._snapshot(client)
+            if mask & selectors.EVENT_WRITE and client.buffer:
+                client.consume(sock.send(client.buffer))
+                if len(client.buffer) <= self.max_buffer:
+                    client.limit = self.max_buffer
+        except BlockingIOError:
+            return
+        except OSError:
+            self._close(client)
+            return
+        self.selector.modify(sock, selectors.EVENT_READ | (selectors.EVENT_WRITE if client.buffer else 0),
+                             self._service)
+    
+    def _close(self, client):
+        self.clients.pop(client.sock, None)
+        try:
+            self.selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+    
+    def _loop(self):
+        try:
+            while self.running:
+                for key, mask in self.selector.select(timeout=1.0):
+                    key.data(key.fileobj, mask)
+        finally:
+            for client in list(self.clients.values()):
+                self._close(client)
+            self.selector.close()
+            self.server.close()
+            self._wake_r.close()
+            self._wake_w.close()
+            try:
+                self._remove_socket_file()
+            except OSError:
+                pass
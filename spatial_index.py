@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Spatial Index
+Coordinates of visited systems in contiguous arrays with a uniform grid index
+"""
+
+import heapq
+import math
+import threading
+from array import array
+
+import config
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SpatialIndex:
+    """Visited systems indexed for radius and k-nearest queries
+    
+    Coordinates are kept in a contiguous NumPy array (or array('d') without
+    NumPy) and bucketed into cubic grid cells, so a radius query only looks at
+    the cells overlapping the search sphere. Above `capacity` systems the
+    oldest ones are dropped, a tenth of the capacity at a time so the arrays
+    and the grid are rebuilt only once every that many new systems.
+    """
+    
+    def __init__(self, cell_size=50.0, capacity=None):
+        self.cell_size = float(cell_size)
+        self.capacity = capacity or config.MAX_VISITED
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.names = []
+        self.by_name = {}
+        self.cells = {}
+        self.count = 0
+        if np is not None:
+            self.coords = np.empty((1024, 3), dtype=np.float64)
+        else:
+            self.coords = array('d')
+    
+    def __len__(self):
+        return self.count
+    
+    def _cell(self, x, y, z):
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size), math.floor(z / size))
+    
+    def _point(self, index):
+        if np is not None:
+            return tuple(self.coords[index])
+        return tuple(self.coords[index * 3:index * 3 + 3])
+    
+    def _reserve(self, extra):
+        if np is None:
+            return
+        needed = self.count + extra
+        if needed > len(self.coords):
+            capacity = max(needed, len(self.coords) * 2)
+            grown = np.empty((capacity, 3), dtype=np.float64)
+            grown[:self.count] = self.coords[:self.count]
+            self.coords = grown
+    
+    def _append(self, name, x, y, z):
+        index = self.count
+        if np is not None:
+            self.coords[index] = (x, y, z)
+        else:
+            self.coords.extend((x, y, z))
+        self.names.append(name)
+        self.by_name[name] = index
+        self.cells.setdefault(self._cell(x, y, z), []).append(index)
+        self.count += 1
+    
+    def _trim(self):
+        """Drop the oldest systems above capacity and rebuild the grid (lock held)"""
+        excess = self.count - self.capacity
+        if excess <= 0:
+            return
+        drop = min(self.count, max(excess, self.capacity // 10))
+        keep = self.count - drop
+        if np is not None:
+            self.coords[:keep] = self.coords[drop:self.count]
+        else:
+            del self.coords[:drop * 3]
+        del self.names[:drop]
+        self.count = keep
+        self.by_name = {name: index for index, name in enumerate(self.names)}
+        self.cells = {}
+        for index in range(keep):
+            self.cells.setdefault(self._cell(*self._point(index)), []).append(index)
+        self.dropped += drop
+        print(f"Aviso: índice de sistemas visitados excedeu o limite de {self.capacity}; "
+              f"{drop} sistemas mais antigos descartados ({self.dropped} até agora)")
+    
+    def add(self, name, coords):
+        """Add one visited system; already known systems are ignored"""
+        if not name or not coords or len(coords) != 3:
+            return
+        with self.lock:
+            if name in self.by_name:
+                return
+            self._reserve(1)
+            self._append(name, *map(float, coords))
+            self._trim()
+    
+    def bulk_add(self, systems):
+        """Add many (name, coords) pairs at once, e.g. after a backfill"""
+        with self.lock:
+            new = {}
+            for name, coords in systems:
+                if name and coords and len(coords) == 3 and name not in self.by_name:
+                    new[name] = coords
+            self._reserve(len(new))
+            for name, coords in new.items():
+                self._append(name, *map(float, coords))
+            self._trim()
+    
+    def position(self, name):
+        """Coordinates of a visited system, or None"""
+        with self.lock:
+            index = self.by_name.get(name)
+            return None if index is None else self._point(index)
+    
+    def _candidates(self, center, reach):
+        """Indices in the cube of cells within reach of the center cell (None = all)"""
+        cx, cy, cz = self._cell(*center)
+        # Para regiões enormes é mais barato varrer todos os pontos
+        if (2 * reach + 1) ** 3 > len(self.cells):
+            return None
+        found = []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                for dz in range(-reach, reach + 1):
+                    bucket = self.cells.get((cx + dx, cy + dy, cz + dz))
+                    if bucket:
+                        found.extend(bucket)
+        return found
+    
+    def _distances(self, center, indices):
+        """(indices, distances) for the candidate indices, or all points if None"""
+        if np is not None:
+            points = self.coords[:self.count] if indices is None else self.coords[indices]
+            distances = np.sqrt(((points - np.asarray(center)) ** 2).sum(axis=1))
+            if indices is None:
+                indices = np.arange(self.count)
+            return np.asarray(indices), distances
+        if indices is None:
+            indices = range(self.count)
+        x, y, z = center
+        coords = self.coords
+        distances = [math.sqrt((coords[i * 3] - x) ** 2 + (coords[i * 3 + 1] - y) ** 2 +
+                               (coords[i * 3 + 2] - z) ** 2) for i in indices]
+        return list(indices), distances
+    
+    def _result(self, index, distance):
+        index = int(index)
+        return {
+            'system': self.names[index],
+            'coords': list(self._point(index)),
+            'distance': round(float(distance), 2),
+        }
+    
+    def within(self, center, radius, limit=None):
+        """Visited systems within radius ly of center, nearest first"""
+        with self.lock:
+            if not self.count:
+                return []
+            reach = int(math.ceil(radius / self.cell_size))
+            indices, distances = self._distances(center, self._candidates(center, reach))
+            if np is not None:
+                inside = distances <= radius
+                indices, distances = indices[inside], distances[inside]
+                order = np.argsort(distances, kind='stable')[:limit]
+                return [self._result(indices[i], distances[i]) for i in order]
+            hits = sorted((d, i) for i, d in zip(indices, distances) if d <= radius)
+            return [self._result(i, d) for d, i in hits[:limit]]
+    
+    def nearest(self, center, k):
+        """The k visited systems closest to center"""
+        with self.lock:
+            if not self.count or k <= 0:
+                return []
+            k = min(k, self.count)
+            reach = 1
+            while True:
+                # O cubo de células com alcance `reach` cobre a esfera de raio
+                # reach * cell_size, então o k-ésimo vizinho é exato se couber nela
+                candidates = self._candidates(center, reach)
+                indices, distances = self._distances(center, candidates)
+                if len(indices) >= k:
+                    if np is not None:
+                        best = np.argpartition(distances, k - 1)[:k]
+                        best = best[np.argsort(distances[best])]
+                        best = [(distances[i], indices[i]) for i in best]
+                    else:
+                        best = heapq.nsmallest(k, zip(distances, indices))
+                    kth = best[-1][0]
+                    if candidates is None or kth <= reach * self.cell_size:
+                        return [self._result(i, d) for d, i in best]
+                    reach = max(reach + 1, int(math.ceil(kth / self.cell_size)))
+                else:
+                    reach *= 2
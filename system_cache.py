@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous System Cache
+Bounded LRU cache of scanned bodies and stations per visited system
+"""
+
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import config
+
+
+class SystemCache:
+    """LRU cache of per-system bodies and stations, written to disk by flush() and on eviction"""
+    
+    def __init__(self, capacity=None, cache_dir=None):
+        self.capacity = capacity or config.SYSTEM_CACHE_SIZE
+        self.cache_dir = Path(cache_dir) if cache_dir else config.CACHE_DIR / 'systems'
+        self.entries = OrderedDict()
+        self.dirty = set()
+    
+    def _path(self, address):
+        return self.cache_dir / f'{int(address)}.json'
+    
+    def get(self, address):
+        """Return cached {'bodies', 'stations'} pairs for a system, or None"""
+        entry = self.entries.get(address)
+        if entry is not None:
+            self.entries.move_to_end(address)
+            return entry
+        
+        try:
+            with open(self._path(address), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        self._insert(address, entry)
+        return entry
+    
+    def put(self, address, bodies, stations):
+        """Store the (id, entry) pairs of a system as most recently used"""
+        entry = {'bodies': list(bodies), 'stations': list(stations)}
+        self.entries.pop(address, None)
+        self._insert(address, entry)
+        self.dirty.add(address)
+    
+    def _insert(self, address, entry):
+        self.entries[address] = entry
+        while len(self.entries) > self.capacity:
+            old_address, old_entry = self.entries.popitem(last=False)
+            if old_address in self.dirty:
+                self._write(old_address, old_entry)
+    
+    def _write(self, address, entry):
+        self.dirty.discard(address)
+        path = self._path(address)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Erro ao gravar cache do sistema {address}: {e}")
+    
+    def flush(self):
+        """Write every modified in-memory entry to disk"""
+        for address in list(self.dirty):
+            entry = self.entries.get(address)
+            if entry is None:
+                self.dirty.discard(address)
+            else:
+                self._write(address, entry)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Event Deduplication Tests
+Backfill of a directory mixing old and current journal names through the dedup window
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import config
+from ed_data import EDData
+from event_dedup import DedupWindow
+from journal_monitor import JournalMonitor
+
+
+# (nome do journal, início) do mais antigo ao mais novo, nos dois formatos de nome
+JOURNALS = (
+    ('Journal.201231235900.01.log', datetime(2020, 12, 31, 23, 59)),
+    ('Journal.210401120000.01.log', datetime(2021, 4, 1, 12, 0)),
+    ('Journal.210401120000.02.log', datetime(2021, 4, 1, 14, 0)),
+    ('Journal.2024-06-01T120000.01.log', datetime(2024, 6, 1, 12, 0)),
+    ('Journal.2024-06-02T120000.01.log', datetime(2024, 6, 2, 12, 0)),
+)
+EVENTS_PER_JOURNAL = 40
+CAPACITY = 16
+
+
+class MixedFormatBackfillTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = Path(tempfile.mkdtemp(prefix='ed_dedup_test_'))
+        self.journal_dir = self.workdir / 'journals'
+        self.journal_dir.mkdir()
+        # Grava do mais novo ao mais antigo: nem a ordem de criação nem o mtime ajudam
+        for name, start in reversed(JOURNALS):
+            with open(self.journal_dir / name, 'w', encoding='utf-8') as f:
+                for i in range(EVENTS_PER_JOURNAL):
+                    timestamp = (start + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+                    f.write(json.dumps({'timestamp': timestamp, 'event': 'Music',
+                                        'MusicTrack': f'Track{i}'}) + '\r\n')
+        
+        patcher = mock.patch.object(config, 'CACHE_DIR', self.workdir / 'cache')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monitor = JournalMonitor(EDData(), self.journal_dir)
+        self.monitor.dedup = DedupWindow(capacity=CAPACITY)
+    
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+    
+    def test_latest_journal_is_newest_across_formats(self):
+        self.assertEqual(self.monitor.get_latest_journal().name, JOURNALS[-1][0])
+    
+    def test_backfill_past_capacity_drops_no_events(self):
+        current = self.monitor.get_latest_journal()
+        self.monitor.backfill(current)
+        
+        older = len(JOURNALS) - 1
+        self.assertGreater(older * EVENTS_PER_JOURNAL, CAPACITY)
+        self.assertEqual(self.monitor.dedup.expired, 0)
+        self.assertEqual(self.monitor.dedup.duplicates, 0)
+        self.assertEqual(self.monitor.recent_events.seq, older * EVENTS_PER_JOURNAL)
+        
+        # O journal atual continua depois do histórico, sem perder linhas
+        self.monitor.rotate_to(current)
+        self.monitor.read_journal(current)
+        self.assertEqual(self.monitor.dedup.expired, 0)
+        self.assertEqual(self.monitor.recent_events.seq, len(JOURNALS) * EVENTS_PER_JOURNAL)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Elite Dangerous Time Series
+Fixed-capacity per-metric series with Largest-Triangle-Three-Buckets downsampling
+"""
+
+import threading
+from array import array
+
+import config
+from journal_reader import parse_event_time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+METRICS = ('credits', 'fuel', 'altitude', 'hull')
+
+
+class RingSeries:
+    """Time-ordered (time, value) samples in two preallocated array('d') rings"""
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        self.start = 0
+        self.size = 0
+    
+    def _slot(self, i):
+        return (self.start + i) % self.capacity
+    
+    def append(self, t, value):
+        if self.size and t < self.times[self._slot(self.size - 1)]:
+            return  # fora de ordem (journals são cronológicos)
+        if self.size < self.capacity:
+            slot = self._slot(self.size)
+            self.size += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.times[slot] = t
+        self.values[slot] = value
+    
+    def _bisect(self, t, right=False):
+        """First logical index with time >= t (time > t when right is true)"""
+        lo, hi = 0, self.size
+        times = self.times
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[self._slot(mid)] < t or (right and times[self._slot(mid)] == t):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def range(self, start=None, end=None):
+        """Samples with start <= time <= end as two array('d') copies"""
+        first = 0 if start is None else self._bisect(start)
+        last = self.size if end is None else self._bisect(end, right=True)
+        times, values = array('d'), array('d')
+        for lo, hi in self._physical(first, last):
+            times.extend(self.times[lo:hi])
+            values.extend(self.values[lo:hi])
+        return times, values
+    
+    def _physical(self, first, last):
+        """Split a logical [first, last) range into physical slices"""
+        if first >= last:
+            return []
+        lo, hi = self._slot(first), self._slot(last - 1) + 1
+        if lo < hi:
+            return [(lo, hi)]
+        return [(lo, self.capacity), (0, hi)]
+
+
+def lttb(times, values, threshold):
+    """Downsample to at most threshold points with Largest-Triangle-Three-Buckets"""
+    n = len(times)
+    if threshold >= n:
+        return list(zip(times, values))
+    if threshold < 3:
+        # Sem buckets intermediários: só as extremidades que cabem
+        return [(times[0], values[0]), (times[n - 1], values[n - 1])][2 - max(threshold, 0):]
+    if np is not None:
+        return _lttb_numpy(np.frombuffer(times, dtype=np.float64),
+                           np.frombuffer(values, dtype=np.float64), threshold)
+    
+    edges = _bucket_edges(n, threshold)
+    sampled = [(times[0], values[0])]
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        count = next_hi - hi
+        avg_x = sum(times[hi:next_hi]) / count
+        avg_y = sum(values[hi:next_hi]) / count
+        ax, ay = times[a], values[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - times[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append((times[best], values[best]))
+        a = best
+    sampled.append((times[n - 1], values[n - 1]))
+    return sampled
+
+
+def _bucket_edges(n, threshold):
+    """Start index of each of the threshold - 2 middle buckets, plus the last point"""
+    every = (n - 2) / (threshold - 2)
+    edges = [int(i * every) + 1 for i in range(threshold - 1)]
+    edges[-1] = n - 1
+    return edges
+
+
+def _lttb_numpy(x, y, threshold):
+    n = len(x)
+    edges = np.array(_bucket_edges(n, threshold), dtype=np.int64)
+    # Médias de todos os buckets calculadas de uma vez; o último usa o ponto final
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+    
+    picked = np.empty(threshold, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[lo:hi] - y[a]) -
+                      (x[a] - x[lo:hi]) * (avg_y[i + 1] - y[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return list(zip(x[picked].tolist(), y[picked].tolist()))
+
+
+class TimeSeriesStore:
+    """Thread-safe collection of metric series fed by journal events"""
+    
+    def __init__(self, capacity=None):
+        capacity = capacity or config.SERIES_CAPACITY
+        self.lock = threading.Lock()
+        self.series = {metric: RingSeries(capacity) for metric in METRICS}
+    
+    def record(self, metric, timestamp, value):
+        """Append a sample stamped with the event timestamp"""
+        t = parse_event_time(timestamp)
+        if t is None or value is None:
+            return
+        with self.lock:
+            self.series[metric].append(t, float(value))
+    
+    def query(self, metric, start=None, end=None, points=500):
+        """Samples of a metric in [start, end], downsampled to at most points"""
+        with self.lock:
+            times, values = self.series[metric].range(start, end)
+        return len(times), lttb(times, values, points)